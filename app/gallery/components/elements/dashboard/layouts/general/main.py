@@ -4,12 +4,21 @@ from app.gallery.components.elements.dashboard.setup import FinancialChart
 from app.gallery.ui import (DynamicInsights, KeyInsights, UIHelpers,
                             update_sidebar)
 from app.gallery.utils.data_loader import DataLoader
+from app.services.types import Units
 
 # Initialization
 data_loader = DataLoader()
 ui_helpers = UIHelpers()
 
 
+def latest_with_unit(df, column, default_unit):
+    """
+    Latest value of a column with the unit recorded by the query, or `default_unit` when the data
+    carries none (CSV files do not keep it).
+    """
+    return Units.of(df, column, default_unit).format(df[column].iloc[-1])
+
+
 def general_main():
     # Set page configuration and style
     st.markdown("""<style>.insight-box {...}</style>""",
@@ -51,11 +60,14 @@ def general_main():
     # Define the configuration for Key Insights
     insights_data = {
         'total_assets':
-        f"{df_assets_liabilities['ASSETS_CURRENT'].iloc[-1]} mil $",
+        latest_with_unit(df_assets_liabilities, 'ASSETS_CURRENT',
+                         Units.USD_MILLIONS),
         'total_liabilities':
-        f"{df_assets_liabilities['LIABILITIES_CURRENT'].iloc[-1]} mil $",
+        latest_with_unit(df_assets_liabilities, 'LIABILITIES_CURRENT',
+                         Units.USD_MILLIONS),
         'current_ratio': df_liquidity['CURRENT_RATIO'].iloc[-1],
-        'profit_margin': f"{df_profitability['PROFIT_MARGIN'].iloc[-1]}%"
+        'profit_margin':
+        latest_with_unit(df_profitability, 'PROFIT_MARGIN', Units.PERCENT)
     }
     insights_config = [{
         'title': 'Total Assets',
@@ -1,17 +1,16 @@
 import streamlit as st
 
 from app.gallery.utils.data_loader import DataLoader
-from app.services import generate_data_for_cik
+from app.services import generate_data_for_cik, resolve_cik
 
 
 def update_sidebar():
     with st.sidebar:
         st.title("Stock Scouter AI")
 
-        new_cik = st.text_input("Enter new CIK Number")
+        new_symbol = st.text_input("Enter new Ticker or CIK Number")
         if st.button("Generate Data for CIK"):
-            generate_data_for_cik(new_cik)
-            st.success(f"Data generated for CIK: {new_cik}")
+            generate_data_for_symbol(new_symbol, st)
 
 
 def update_sidebar_chat():
@@ -20,10 +19,10 @@ def update_sidebar_chat():
     st.sidebar.title("Stock Scouter AI")
 
     # Handling new CIK input and data generation
-    new_cik = st.sidebar.text_input("Enter new CIK Number", key="user_handle")
+    new_symbol = st.sidebar.text_input("Enter new Ticker or CIK Number",
+                                       key="user_handle")
     if st.sidebar.button("Generate Data for CIK", key="generate_cik_button"):
-        generate_data_for_cik(new_cik)
-        st.sidebar.success(f"Data generated for CIK: {new_cik}")
+        generate_data_for_symbol(new_symbol, st.sidebar)
 
     # Display available CIKs and allow selection
     available_ciks = data_loader.get_available_cik_numbers()
@@ -49,6 +48,16 @@ def update_sidebar_chat():
     return selected_cik, formatted_query_type
 
 
+def generate_data_for_symbol(symbol, container):
+    """Resolves a ticker or CIK number and generates its data, reporting the outcome in `container`."""
+    cik = resolve_cik(symbol) if symbol else None
+    if not cik:
+        container.error(f"Unknown ticker or CIK: {symbol}")
+        return
+    generate_data_for_cik(cik)
+    container.success(f"Data generated for CIK: {cik}")
+
+
 def format_query_type(query_type):
     """Replaces spaces with underscores in a query type string."""
     return query_type.replace(" ", "_")
@@ -1,18 +1,37 @@
 import json
 import os
 
-import markdown
 import pandas as pd
 import streamlit as st
-from bs4 import BeautifulSoup
 from llama_index import ServiceContext, SimpleDirectoryReader, VectorStoreIndex
 from llama_index.llms import OpenAI
+from llama_index.readers.base import BaseReader
+from llama_index.schema import Document
+
+from app.services.functions import DataStorageManager
+from app.services.utils import DataManifest, FileVersionManager
+
+# Extensions of stored DataFrames, in either of DataStorageManager's storage formats.
+DATA_FILE_EXTENSIONS = ('.parquet', '.csv')
+
+
+class ParquetTableReader(BaseReader):
+    """
+    Reads a Parquet file into a single document holding the table as CSV text, the same way CSV
+    files are presented to the query engine.
+    """
+
+    def load_data(self, file, extra_info=None, **kwargs):
+        df = DataStorageManager.load_data(str(file))
+        return [Document(text=df.to_csv(index=False), metadata=extra_info or {})]
 
 
 class DataLoader:
 
     def __init__(self, base_dir='data'):
         self.base_dir = base_dir
+        self.manifest = DataManifest(base_dir)
+        self.file_version_manager = FileVersionManager(base_dir)
 
     def get_available_cik_numbers(self):
         """
@@ -32,7 +51,7 @@ class DataLoader:
         # Adjust the logic if you're using a different dataset or structure.
         file_path = self.construct_csv_file_path(cik, 'Assets_Liabilities')
         if file_path:
-            df = pd.read_csv(file_path)
+            df = DataStorageManager.load_data(file_path)
             if not df.empty and 'ENTITY' in df.columns:
                 return df['ENTITY'].iloc[0]
         return "Unknown Entity"
@@ -41,24 +60,7 @@ class DataLoader:
         """
         Returns a list of available query types for a given CIK number.
         """
-        index_file_path = os.path.join(self.base_dir, cik, 'processed_data',
-                                       'index.md')
-        if os.path.exists(index_file_path):
-            with open(index_file_path, 'r') as file:
-                md_content = file.read()
-                md = markdown.Markdown()
-                html_content = md.convert(md_content)
-                return self._extract_query_types_from_markdown(html_content)
-        return []
-
-    @staticmethod
-    def _extract_query_types_from_markdown(html_content):
-        """
-        Extracts query types from the HTML content of the markdown file using BeautifulSoup.
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        query_types = [h3.get_text() for h3 in soup.find_all('h3')]
-        return query_types
+        return self.file_version_manager.categories(cik, 'processed_data')
 
     def construct_directory_path(self, cik, query_type):
         directory_path = os.path.join(self.base_dir, str(cik),
@@ -73,6 +75,10 @@ class DataLoader:
         """
         Construct path to the JSON file for a specific chart type.
         """
+        recorded_file = self.manifest.latest(cik, 'processed_json', query_type,
+                                             chart_type)
+        if recorded_file:
+            return recorded_file
         folder_path = os.path.join(self.base_dir, str(cik), 'processed_json',
                                    query_type, chart_type)
         if os.path.isdir(folder_path):
@@ -95,18 +101,21 @@ class DataLoader:
 
     def construct_csv_file_path(self, cik, query_type):
         """
-        Construct path to the latest CSV file for a specific query type.
+        Construct path to the latest data file (Parquet or CSV) for a specific query type.
         """
+        recorded_file = self.manifest.latest(cik, 'processed_data', query_type)
+        if recorded_file:
+            return recorded_file
         folder_path = os.path.join(self.base_dir, str(cik), 'processed_data',
                                    query_type)
         if os.path.isdir(folder_path):
-            csv_files = [
+            data_files = [
                 file for file in os.listdir(folder_path)
-                if file.endswith('.csv')
+                if file.endswith(DATA_FILE_EXTENSIONS)
             ]
-            if csv_files:
-                # Assuming you want the latest CSV file based on creation time
-                latest_file = max(csv_files,
+            if data_files:
+                # Assuming you want the latest data file based on creation time
+                latest_file = max(data_files,
                                   key=lambda x: os.path.getctime(
                                       os.path.join(folder_path, x)))
                 return os.path.join(folder_path, latest_file)
@@ -114,11 +123,11 @@ class DataLoader:
 
     def load_csv_data(self, cik, query_type):
         """
-        Load CSV data for a specific query type and CIK.
+        Load the processed data (Parquet or CSV) for a specific query type and CIK.
         """
         csv_file_path = self.construct_csv_file_path(cik, query_type)
         if csv_file_path and os.path.exists(csv_file_path):
-            return pd.read_csv(csv_file_path)
+            return DataStorageManager.load_data(csv_file_path)
         else:
             st.error(
                 f"No CSV data found for CIK {cik} and query type {query_type}."
@@ -136,8 +145,10 @@ class DataLoader:
                 text=
                 "Loading and indexing the docs – hang tight! This should take 1-2 minutes."
         ):
-            reader = SimpleDirectoryReader(input_dir=directory_path,
-                                           recursive=True)
+            reader = SimpleDirectoryReader(
+                input_dir=directory_path,
+                recursive=True,
+                file_extractor={'.parquet': ParquetTableReader()})
             docs = reader.load_data()
             service_context = ServiceContext.from_defaults(llm=OpenAI(
                 model="gpt-3.5-turbo",
@@ -1 +1,3 @@
-from .backend_module import generate_data_for_cik
+from .backend_module import (generate_data_for_cik, generate_data_from_archive,
+                             generate_data_for_universe, refresh_ciks,
+                             resolve_cik)
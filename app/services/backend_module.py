@@ -1,4 +1,7 @@
-from .service_manager import DataPipelineIntegration
+from .functions import CompanyFactsArchive, LoggingManager, SECAPIClient
+from .queries import QueryExecutor
+from .service_manager import DataPipelineIntegration, SECDataFetcher
+from .types import PIPELINE_METRICS
 
 
 def generate_data_for_cik(cik_number):
@@ -9,3 +12,193 @@ def generate_data_for_cik(cik_number):
     data_pipeline.process_and_store_data()
     data_pipeline.transform_and_store_json()
     # Add logic to notify user of success/failure
+
+
+def refresh_ciks(cik_numbers, force=False, local_storage_dir='data'):
+    """
+    Refresh the data of many companies, skipping those that filed nothing new since their last refresh.
+
+    Each company's submissions are checked first; the company facts are only fetched, preprocessed,
+    processed and transformed when its latest 10-K/10-Q (or amendment) differs from the stored watermark.
+
+    Args:
+        cik_numbers (Iterable[str]): CIK numbers of the companies.
+        force (bool, optional): Refresh every company regardless of its watermark. Defaults to False.
+        local_storage_dir (str, optional): Directory path for local data storage. Defaults to 'data'.
+
+    Returns:
+        dict: Maps each CIK number to 'updated', 'unchanged' or error information.
+    """
+    use_snowflake = False
+    error_handler = LoggingManager()
+    sec_client = SECAPIClient()
+    results = {}
+    for cik_number in cik_numbers:
+        data_pipeline = DataPipelineIntegration(cik_number,
+                                                use_snowflake,
+                                                local_storage_dir=local_storage_dir,
+                                                sec_client=sec_client)
+        change = data_pipeline.check_for_new_filings()
+        if 'error' in change:
+            error_handler.log_error(change['error'])
+            results[cik_number] = change
+            continue
+        if not change['changed'] and not force:
+            results[cik_number] = 'unchanged'
+            continue
+        raw_data = data_pipeline.fetch_data()
+        if isinstance(raw_data, dict):
+            error_handler.log_error(raw_data['error'])
+            results[cik_number] = raw_data
+            continue
+        for stage in (lambda: data_pipeline.preprocess_data(raw_data),
+                      data_pipeline.process_and_store_data,
+                      data_pipeline.transform_and_store_json):
+            stage_result = stage()
+            if isinstance(stage_result, dict) and 'error' in stage_result:
+                results[cik_number] = stage_result
+                break
+        else:
+            data_pipeline.update_watermark(change['filing'])
+            results[cik_number] = 'updated'
+    sec_client.close()
+    return results
+
+
+def generate_data_for_universe(cik_numbers,
+                               local_storage_dir='data',
+                               local_engine='pandas'):
+    """
+    Run the pipeline for many companies, computing each query once over all of them.
+
+    The companies are fetched concurrently and preprocessed one by one; every query then pivots and
+    computes its ratios in a single pass over the preprocessed data of all companies, and the result is
+    stored and transformed per company as `generate_data_for_cik` would.
+
+    Args:
+        cik_numbers (Iterable[str]): CIK numbers of the companies.
+        local_storage_dir (str, optional): Directory path for local data storage. Defaults to 'data'.
+        local_engine (str, optional): Engine of the local queries, 'pandas' or 'sql'. Defaults to 'pandas'.
+
+    Returns:
+        dict: Maps each CIK number to True on success or to error information.
+    """
+    use_snowflake = False
+    error_handler = LoggingManager()
+    sec_client = SECAPIClient()
+    results = {}
+    data_pipelines = {}
+    preprocessed_data = {}
+    try:
+        universe_data = SECDataFetcher(sec_client).fetch_company_data_many(
+            list(cik_numbers), metrics=PIPELINE_METRICS)
+        for cik_number, raw_data in universe_data.items():
+            if isinstance(raw_data, dict):
+                error_handler.log_error(raw_data['error'])
+                results[cik_number] = raw_data
+                continue
+            data_pipeline = DataPipelineIntegration(
+                cik_number,
+                use_snowflake,
+                local_storage_dir=local_storage_dir,
+                sec_client=sec_client,
+                local_engine=local_engine)
+            frames = data_pipeline.preprocess_data(raw_data)
+            if 'error' in frames:
+                results[cik_number] = frames
+                continue
+            data_pipelines[cik_number] = data_pipeline
+            preprocessed_data[cik_number] = frames
+        if not data_pipelines:
+            return results
+
+        categories = list(
+            next(iter(data_pipelines.values())).category_metric_map)
+        try:
+            query_results = QueryExecutor(
+                None, None, local_engine=local_engine).execute_query_batch(
+                    categories, preprocessed_data)
+        except Exception as e:
+            error_handler.log_error(e, "ERROR")
+            for cik_number, data_pipeline in data_pipelines.items():
+                data_pipeline.data_preprocessor.wait_for_writes()
+                results[cik_number] = {'error': str(e)}
+            return results
+        for cik_number, data_pipeline in data_pipelines.items():
+            for stage in (lambda: data_pipeline.store_query_results(
+                    query_results[cik_number]),
+                          data_pipeline.transform_and_store_json):
+                stage_result = stage()
+                if isinstance(stage_result, dict) and 'error' in stage_result:
+                    results[cik_number] = stage_result
+                    break
+            else:
+                results[cik_number] = True
+        return results
+    finally:
+        sec_client.close()
+
+
+def resolve_cik(symbol):
+    """
+    Resolve a ticker symbol or CIK number to a 10-digit CIK number. Tickers are looked up in the locally
+    persisted ticker index; CIK numbers are accepted whether they are listed there or not.
+
+    Args:
+        symbol (str): A ticker symbol (e.g. 'AAPL') or a CIK number with or without zero padding.
+
+    Returns:
+        str or None: The 10-digit CIK number, or None if the ticker is unknown.
+    """
+    symbol = symbol.strip()
+    if symbol.isdigit() and len(symbol) <= 10:
+        return symbol.zfill(10)
+    with SECAPIClient(use_http_cache=False) as sec_client:
+        ticker_index = sec_client.get_ticker_index()
+    if ticker_index is None:
+        return None
+    return ticker_index.resolve(symbol)
+
+
+def generate_data_from_archive(archive_path, cik_numbers=None, local_storage_dir='data'):
+    """
+    Run the pipeline for every company in a local SEC `companyfacts.zip` bulk archive.
+
+    Args:
+        archive_path (str): Path to the local `companyfacts.zip`.
+        cik_numbers (Iterable[str], optional): Only process these CIK numbers. Defaults to the whole archive.
+        local_storage_dir (str, optional): Directory path for local data storage. Defaults to 'data'.
+
+    Returns:
+        dict: Maps each processed CIK number to True on success or to error information.
+    """
+    use_snowflake = False
+    error_handler = LoggingManager()
+    sec_client = SECAPIClient(use_http_cache=False)
+    archive = CompanyFactsArchive(archive_path, sec_client)
+    results = {}
+    try:
+        for cik_number, raw_data in archive.iter_company_facts(
+                cik_numbers, PIPELINE_METRICS):
+            if isinstance(raw_data, dict):
+                error_handler.log_error(
+                    f"Skipping CIK {cik_number}: {raw_data['error']}")
+                results[cik_number] = raw_data
+                continue
+            data_pipeline = DataPipelineIntegration(
+                cik_number,
+                use_snowflake,
+                local_storage_dir=local_storage_dir,
+                sec_client=sec_client)
+            for stage in (lambda: data_pipeline.preprocess_data(raw_data),
+                          data_pipeline.process_and_store_data,
+                          data_pipeline.transform_and_store_json):
+                stage_result = stage()
+                if isinstance(stage_result, dict) and 'error' in stage_result:
+                    results[cik_number] = stage_result
+                    break
+            else:
+                results[cik_number] = True
+        return results
+    finally:
+        sec_client.close()
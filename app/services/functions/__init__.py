@@ -3,13 +3,16 @@
 from .data import (AnnualDataProcessor, DataPreprocessor, DataProcessor,
                    JSONDataTransformer, QuarterlyDataProcessor)
 from .managers import LoggingManager, NotificationManager
-from .responses import SECAPIClient
-from .storages import DataStorageManager, SnowflakeDataManager
+from .responses import (AsyncSECAPIClient, CompanyFactsArchive, SECAPIClient,
+                        TickerIndex)
+from .storages import (DataStorageManager, SnowflakeConnectionPool,
+                       SnowflakeDataManager)
 from .transformers import TransformerManager
 
 __all__ = [
-    'AnnualDataProcessor', 'DataProcessor', 'DataPreprocessor',
-    'DataStorageManager', 'JSONDataTransformer', 'LoggingManager',
-    'NotificationManager', 'QuarterlyDataProcessor', 'SECAPIClient',
-    'SnowflakeDataManager', 'TransformerManager'
+    'AnnualDataProcessor', 'AsyncSECAPIClient', 'CompanyFactsArchive',
+    'DataProcessor', 'DataPreprocessor', 'DataStorageManager',
+    'JSONDataTransformer', 'LoggingManager', 'NotificationManager',
+    'QuarterlyDataProcessor', 'SECAPIClient', 'SnowflakeConnectionPool',
+    'SnowflakeDataManager', 'TickerIndex', 'TransformerManager'
 ]
@@ -21,7 +21,8 @@ class AnnualDataProcessor(FinancialDataProcessor):
         """
         Processes annually financial data based on specified metrics.
 
-        This method filters, cleans, and sorts the financial data for annual processing based on the given metrics.
+        If `prepare` was called with these metrics, their rows are selected from the prepared data.
+        Otherwise this method filters, cleans, and sorts the financial data for annual processing based on the given metrics.
 
         Args:
             metrics (list[str] or str): Financial metrics to process.
@@ -29,7 +30,9 @@ class AnnualDataProcessor(FinancialDataProcessor):
         Returns:
             pandas.DataFrame: Processed annually data.
         """
-        filtered_df = self.filter_by_metric(self.df, metrics)
+        return self.select_prepared(metrics)
+
+    def _prepare(self, filtered_df: pd.DataFrame) -> pd.DataFrame:
         filtered_df = filtered_df[filtered_df['form'] == '10-K']
         filtered_df = filtered_df[filtered_df['frame'].notna()]
 
@@ -1,9 +1,18 @@
+import re
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from typing import Generator, List, Optional, Tuple, Union
+from typing import Generator, List, Optional, Pattern, Union
 
+import numpy as np
 import pandas as pd
 
+from app.services.utils import FACT_DTYPES, QUARTER_DTYPE
+
+# SEC frames name a calendar period: 'CY2019' (year), 'CY2019Q1' (quarter), 'CY2019Q1I' (instant)
+ANNUAL_FRAME_PATTERN = re.compile(
+    r'^.{2}(?P<year>\d{4})(?:(?P<quarter>Q[1-4]|FY)$)?')
+QUARTERLY_FRAME_PATTERN = re.compile(r'^.{2}(?P<year>\d{4})(?P<quarter>Q[1-4])')
+
 
 class FinancialDataProcessor(ABC):
     """
@@ -26,10 +35,13 @@ class FinancialDataProcessor(ABC):
             the DataFrame, streamlining the dataset for further processing.
         sort_dataframe(df: pd.DataFrame): Sorts the DataFrame based on 'year' and 'quarter', facilitating
             ordered analysis and visualization.
+        prepare(metrics: Union[str, List[str]]): Runs the metric-independent processing once for the union of
+            the metrics of several categories, so `process_data` only has to select rows from the result.
     """
 
     def __init__(self) -> None:
-        pass
+        self.prepared_df: Optional[pd.DataFrame] = None
+        self._prepared_metrics: set = set()
 
     @abstractmethod
     def process_data(self, metrics: Union[str, List[str]]) -> pd.DataFrame:
@@ -43,6 +55,58 @@ class FinancialDataProcessor(ABC):
         """
         pass
 
+    def prepare(self, metrics: Union[str, List[str]]) -> pd.DataFrame:
+        """
+        Processes the data of every given metric in a single pass and keeps the result.
+
+        Later `process_data` calls for any subset of these metrics select their rows from the prepared
+        data instead of filtering and transforming the full DataFrame again. Every processing step
+        works row by row and the final sort is stable, so the selected rows are the same, in the same
+        order, as processing the subset on its own.
+
+        Parameters:
+            metrics (Union[str, List[str]]): The union of the metrics that will be processed.
+
+        Returns:
+            pd.DataFrame: The prepared data.
+        """
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        self.prepared_df = self._prepare(self.filter_by_metric(self.df, metrics))
+        self._prepared_metrics = set(metrics)
+        return self.prepared_df
+
+    def select_prepared(
+            self, metrics: Union[str, List[str]]) -> pd.DataFrame:
+        """
+        Processes data for some metrics, reusing the prepared data when it covers them.
+
+        Parameters:
+            metrics (Union[str, List[str]]): The metrics to process the data by.
+
+        Returns:
+            pd.DataFrame: The processed data.
+        """
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        if self.prepared_df is not None and self._prepared_metrics.issuperset(
+                metrics):
+            return self.filter_by_metric(self.prepared_df, metrics)
+        return self._prepare(self.filter_by_metric(self.df, metrics))
+
+    @abstractmethod
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the metric-independent processing steps to rows already filtered by metric.
+
+        Parameters:
+            df (pd.DataFrame): The rows of the metrics to process.
+
+        Returns:
+            pd.DataFrame: The processed rows.
+        """
+        pass
+
     @contextmanager
     def processing_context(self) -> Generator[None, None, None]:
         """
@@ -99,30 +163,31 @@ class FinancialDataProcessor(ABC):
         """
         Extracts the year and quarter from a DataFrame column.
 
+        Frames without a period suffix (e.g. 'CY2019') are full fiscal years, so their quarter is 'FY'.
+
         Parameters:
             df (pd.DataFrame): The DataFrame to process.
             frame_col (str, optional): The column name containing date information. Defaults to 'frame'.
 
         Returns:
-            pd.DataFrame: The DataFrame with 'year' and 'quarter' columns added.
+            pd.DataFrame: The DataFrame with an integer 'year' and a categorical 'quarter' column added.
         """
-        df[['year', 'quarter'
-            ]] = df[frame_col].apply(self._custom_sort_key).apply(pd.Series)
-        return df.dropna(subset=['year']).drop(columns=[frame_col])
+        parsed = self._parse_frames(df[frame_col], ANNUAL_FRAME_PATTERN)
+        parsed['quarter'] = parsed['quarter'].fillna('FY')
+        return self._with_periods(df, parsed).drop(columns=[frame_col])
 
     def extract_quarter(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Extracts the quarter from a DataFrame.
+        Extracts the quarter from a DataFrame. Rows whose frame is not a quarter are dropped.
 
         Parameters:
             df (pd.DataFrame): The DataFrame to process.
 
         Returns:
-            pd.DataFrame: The DataFrame with 'year' and 'quarter' columns added.
+            pd.DataFrame: The DataFrame with an integer 'year' and a categorical 'quarter' column added.
         """
-        df[['year', 'quarter']] = df.apply(self._extract_year_quarter,
-                                           axis=1).apply(pd.Series)
-        return df.dropna(subset=['year', 'quarter'])
+        parsed = self._parse_frames(df['frame'], QUARTERLY_FRAME_PATTERN)
+        return self._with_periods(df, parsed)
 
     def sort_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -137,31 +202,39 @@ class FinancialDataProcessor(ABC):
         return df.sort_values(by=['year', 'quarter'])
 
     @staticmethod
-    def _custom_sort_key(frame_value: str) -> Tuple[str, int]:
+    def _parse_frames(frames: pd.Series,
+                      pattern: Pattern[str]) -> pd.DataFrame:
         """
-        Custom sort key for sorting records by year and quarter.
+        Parses the year and quarter out of a column of SEC frame names, such as 'CY2019Q1I'.
 
-        This static method defines a custom sort key used for sorting DataFrame records by year and quarter.
-        It extracts the year and quarter information from the 'frame_value' and returns a tuple for sorting.
+        A filing history repeats the same few dozen frames across thousands of rows, so each
+        distinct frame is parsed once and the result is broadcast back to the rows.
 
         Parameters:
-            frame_value (str): The value containing year and quarter information.
+            frames (pd.Series): The frame names; missing values are allowed.
+            pattern (Pattern[str]): A pattern with 'year' and 'quarter' groups.
 
         Returns:
-            Tuple[str, int]: A tuple of year and quarter index for sorting.
-        """
-        year = frame_value[2:6]
-        quarter_order = {'Q1': 1, 'Q2': 2, 'Q3': 3, 'Q4': 4, 'FY': 5}
-        quarter = frame_value[6:] if frame_value[6:] in quarter_order else 'FY'
-        return year, quarter_order[quarter]
+            pd.DataFrame: 'year' and 'quarter' strings aligned with `frames`, missing where the frame
+                does not match.
+        """
+        codes, uniques = pd.factorize(frames)
+        parsed = pd.Series(uniques, dtype=object).str.extract(pattern)
+        # Missing frames have code -1; point them at an all-missing row appended at the end
+        parsed = parsed.reindex(range(len(uniques) + 1))
+        codes = np.where(codes < 0, len(uniques), codes)
+        return pd.DataFrame(
+            {column: parsed[column].to_numpy()[codes]
+             for column in ('year', 'quarter')},
+            index=frames.index)
 
     @staticmethod
-    def _extract_year_quarter(row):
+    def _with_periods(df: pd.DataFrame, parsed: pd.DataFrame) -> pd.DataFrame:
         """
-        Static method to extract year and quarter from a row.
+        Adds the parsed periods to a DataFrame, dropping the rows without one.
         """
-        if pd.notna(row['frame']) and 'Q' in row['frame']:
-            year = row['frame'][2:6]  # Extract year part
-            quarter = row['frame'][6:8]  # Extract quarter part
-            return [year, quarter]
-        return [None, None]  # Exclude non-quarterly entries
+        keep = parsed['year'].notna() & parsed['quarter'].notna()
+        parsed = parsed[keep]
+        return df[keep].assign(
+            year=parsed['year'].astype(FACT_DTYPES['year']),
+            quarter=pd.Categorical(parsed['quarter'], dtype=QUARTER_DTYPE))
@@ -21,7 +21,8 @@ class QuarterlyDataProcessor(FinancialDataProcessor):
         """
         Processes quarterly financial data based on specified metrics.
 
-        This method filters, cleans, and sorts the quarterly financial data based on the given metrics.
+        If `prepare` was called with these metrics, their rows are selected from the prepared data.
+        Otherwise this method filters, cleans, and sorts the quarterly financial data based on the given metrics.
 
         Args:
             metrics (list[str] or str): Financial metrics to process.
@@ -29,8 +30,9 @@ class QuarterlyDataProcessor(FinancialDataProcessor):
         Returns:
             pandas.DataFrame: Processed quarterly data.
         """
-        filtered_df = self.filter_by_metric(self.df, metrics)
+        return self.select_prepared(metrics)
 
+    def _prepare(self, filtered_df: pd.DataFrame) -> pd.DataFrame:
         columns_to_drop = ['accn', 'form', 'filed']
         cleaned_df = self.drop_unnecessary_columns(filtered_df,
                                                    columns_to_drop)
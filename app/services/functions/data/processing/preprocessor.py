@@ -1,3 +1,6 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
 import pandas as pd
 
 from ..pre_processing import AnnualDataProcessor, QuarterlyDataProcessor
@@ -15,13 +18,17 @@ class DataPreprocessor:
         file_version_manager (FileVersionManager): Manages file versioning and indexing.
         error_handler (LoggingManager): Handles logging of errors and informational messages.
         snowflake_manager (SnowflakeDataManager, optional): Manages data upload to Snowflake. Default is None.
+        persist_in_background (bool): Whether local writes run on a background thread while the
+            preprocessed frames are handed on. Uploads to Snowflake are always synchronous, since the
+            queries read the uploaded tables.
     """
 
     def __init__(self,
                  data_storage_manager,
                  file_version_manager,
                  error_handler,
-                 snowflake_manager=None):
+                 snowflake_manager=None,
+                 persist_in_background: bool = False):
         """
         Initializes the DataPreprocessor with necessary managers and handlers.
 
@@ -30,11 +37,15 @@ class DataPreprocessor:
             file_version_manager (FileVersionManager): Manages file versioning and indexing.
             error_handler (LoggingManager): Handles logging of errors and informational messages.
             snowflake_manager (SnowflakeDataManager, optional): Manages data upload to Snowflake. Default is None.
+            persist_in_background (bool, optional): Store the preprocessed data locally on a background
+                thread; call `wait_for_writes` before relying on the files. Default is False.
         """
         self.data_storage_manager = (data_storage_manager)
         self.file_version_manager = (file_version_manager)
         self.error_handler = (error_handler)
         self.snowflake_manager = (snowflake_manager)
+        self.persist_in_background = persist_in_background
+        self._pending_writes: List[Future] = []
 
     def preprocess_data(self, raw_data: dict, category_metric_map: dict,
                         use_snowflake: bool, cik_number: str) -> dict:
@@ -48,23 +59,83 @@ class DataPreprocessor:
             cik_number (str): Central Index Key number for data categorization.
 
         Returns:
-            dict: Processed data or an error message.
+            dict: Maps each category to its preprocessed DataFrame, or an error message.
         """
+        background = self.persist_in_background and not use_snowflake
+        writer = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='preprocessed-writer') if background else None
         try:
             df = pd.DataFrame(raw_data)
             annual_processor = AnnualDataProcessor(df)
             quarterly_processor = QuarterlyDataProcessor(df)
+            self._prepare_processors(category_metric_map, annual_processor,
+                                     quarterly_processor)
 
+            preprocessed_frames = {}
             for category, metrics in category_metric_map.items():
                 preprocessed_data = self._process_data(category, metrics,
                                                        annual_processor,
                                                        quarterly_processor)
-                self._store_or_upload_data(preprocessed_data, category,
-                                           use_snowflake, cik_number)
+                preprocessed_frames[category] = preprocessed_data
+                if writer:
+                    self._pending_writes.append(
+                        writer.submit(self._store_or_upload_data,
+                                      preprocessed_data, category,
+                                      use_snowflake, cik_number))
+                else:
+                    self._store_or_upload_data(preprocessed_data, category,
+                                               use_snowflake, cik_number)
+            return preprocessed_frames
 
         except Exception as e:
             self.error_handler.log_error(e, "ERROR")
             return {"error": str(e)}
+        finally:
+            if writer:
+                # Queued writes still run; the thread exits once they are done
+                writer.shutdown(wait=False)
+
+    def wait_for_writes(self) -> Optional[Dict[str, str]]:
+        """
+        Blocks until the background writes of the preprocessed data are done.
+
+        Returns:
+            dict or None: An error message if any write failed, None otherwise.
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        wait(pending)
+        errors = [future.exception() for future in pending
+                  if future.exception() is not None]
+        for error in errors:
+            self.error_handler.log_error(error, "ERROR")
+        return {"error": "; ".join(map(str, errors))} if errors else None
+
+    def _prepare_processors(
+            self, category_metric_map: dict,
+            annual_processor: AnnualDataProcessor,
+            quarterly_processor: QuarterlyDataProcessor) -> None:
+        """
+        Runs each processor once over the union of the metrics of the categories it handles, so that
+        metrics shared by several categories are filtered and transformed only once and every
+        category is then a cheap selection from the prepared data.
+
+        Args:
+            category_metric_map (dict): A mapping of data categories to their respective metrics.
+            annual_processor (AnnualDataProcessor): Processor for annual data.
+            quarterly_processor (QuarterlyDataProcessor): Processor for quarterly data.
+        """
+        union = {annual_processor: [], quarterly_processor: []}
+        for category, metrics in category_metric_map.items():
+            processor = self._select_processor(category, annual_processor,
+                                               quarterly_processor)
+            union[processor].extend(
+                metric for metric in ([metrics] if isinstance(metrics, str)
+                                      else metrics)
+                if metric not in union[processor])
+        for processor, metrics in union.items():
+            if metrics:
+                processor.prepare(metrics)
 
     def _process_data(
             self, category: str, metrics: list,
@@ -82,10 +153,29 @@ class DataPreprocessor:
         Returns:
             DataFrame: Processed data for the given category.
         """
+        return self._select_processor(
+            category, annual_processor,
+            quarterly_processor).process_data(metrics)
+
+    @staticmethod
+    def _select_processor(category: str,
+                          annual_processor: AnnualDataProcessor,
+                          quarterly_processor: QuarterlyDataProcessor):
+        """
+        Picks the processor that handles a category.
+
+        Args:
+            category (str): The category of data to be processed.
+            annual_processor (AnnualDataProcessor): Processor for annual data.
+            quarterly_processor (QuarterlyDataProcessor): Processor for quarterly data.
+
+        Returns:
+            FinancialDataProcessor: The quarterly processor for balance-sheet style categories, the
+                annual processor otherwise.
+        """
         if category in ['Assets Liabilities', 'Liquidity', 'Profitability']:
-            return quarterly_processor.process_data(metrics)
-        else:
-            return annual_processor.process_data(metrics)
+            return quarterly_processor
+        return annual_processor
 
     def _store_or_upload_data(self, preprocessed_data: pd.DataFrame,
                               category: str, use_snowflake: bool,
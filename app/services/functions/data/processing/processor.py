@@ -32,7 +32,8 @@ class DataProcessor:
                                category_metric_map: dict,
                                use_snowflake: bool,
                                cik_number: str,
-                               specific_queries: list = None) -> dict:
+                               specific_queries: list = None,
+                               preprocessed_frames: dict = None) -> dict:
         """
         Processes and stores data based on specific queries or all available categories.
 
@@ -41,6 +42,9 @@ class DataProcessor:
             use_snowflake (bool): Flag to indicate whether to upload data to Snowflake.
             cik_number (str): Central Index Key number for data categorization.
             specific_queries (list of str, optional): Specific queries to execute. Default is None.
+            preprocessed_frames (dict, optional): Preprocessed DataFrames by category, as returned by
+                `DataPreprocessor.preprocess_data`. Local queries of these categories run on them instead
+                of reading the stored files back. Default is None.
 
         Returns:
             dict: Processed data or an error message.
@@ -56,22 +60,45 @@ class DataProcessor:
                         "WARNING")
                     continue
 
-                preprocessed_file_path = self.data_storage_manager.get_latest_file_path(
-                    category, 'preprocessed_data')
-                if not preprocessed_file_path:
+                in_memory = (not use_snowflake and bool(preprocessed_frames)
+                             and category in preprocessed_frames)
+                if not in_memory and not self.data_storage_manager.get_latest_file_path(
+                        category, 'preprocessed_data'):
                     self.error_handler.log(
                         f"No preprocessed data found for {category}",
                         "WARNING")
                     continue
 
                 query_result = self.query_executor.execute_query(
-                    category, use_snowflake)
+                    category,
+                    use_snowflake,
+                    frames=preprocessed_frames if in_memory else None)
                 self._store_and_log_data(query_result, category, cik_number)
 
         except Exception as e:
             self.error_handler.log_error(e, "ERROR")
             return {"error": str(e)}
 
+    def store_query_results(self, query_results: dict,
+                            cik_number: str) -> dict:
+        """
+        Stores query results computed elsewhere, such as one company's share of
+        `QueryExecutor.execute_query_batch`.
+
+        Args:
+            query_results (dict): Query results by category.
+            cik_number (str): Central Index Key number for data categorization.
+
+        Returns:
+            dict: An error message, or None.
+        """
+        try:
+            for category in query_results:
+                self._store_and_log_data(query_results, category, cik_number)
+        except Exception as e:
+            self.error_handler.log_error(e, "ERROR")
+            return {"error": str(e)}
+
     def _store_and_log_data(self, query_result: dict, category: str,
                             cik_number: str) -> None:
         """
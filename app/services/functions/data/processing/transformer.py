@@ -49,7 +49,7 @@ class JSONDataTransformer:
                     f"No processed data found for {category}", "WARNING")
                 continue
 
-            df = pd.read_csv(processed_file_path)
+            df = self.data_storage_manager.load_data(processed_file_path)
             transformed_json = self._transform_data(df, category, chart_types)
             self._store_json_data(transformed_json, category)
 
@@ -1,5 +1,10 @@
 # In services/functions/responses/__init__.py
 
+from .async_sec_api_client import AsyncSECAPIClient
+from .bulk_archive import CompanyFactsArchive
 from .sec_api_client import SECAPIClient
+from .ticker_index import TickerIndex
 
-__all__ = ['SECAPIClient']
+__all__ = [
+    'AsyncSECAPIClient', 'CompanyFactsArchive', 'SECAPIClient', 'TickerIndex'
+]
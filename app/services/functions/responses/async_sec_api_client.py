@@ -0,0 +1,207 @@
+import asyncio
+import json
+from typing import Any, Collection, Dict, Iterable, Optional, Union
+from urllib.parse import urlparse
+
+import aiohttp
+import pandas as pd
+
+from app.services.types import HTTP_CACHE_PATH, SECEndpoints
+from app.services.utils import (CircuitBreaker, CircuitOpenError, RetryPolicy,
+                                Roster, TokenBucket)
+
+from .cache import HTTPResponseCache
+from .sec_api_client import DEFAULT_USER_AGENT, SECAPIClient
+
+
+class AsyncSECAPIClient(SECAPIClient):
+    """
+    Asyncio variant of SECAPIClient for fetching many companies at once.
+
+    Requests run concurrently up to `max_concurrency` and every request first takes a token
+    from `rate_limiter`, so a large universe is fetched as fast as the SEC rate limit allows.
+    Parsing and caching are inherited from SECAPIClient, so results are identical to
+    calling `fetch_company_facts` once per CIK.
+
+    Example:
+        >>> client = AsyncSECAPIClient(max_concurrency=8)
+        >>> results = asyncio.run(client.fetch_company_facts_many(['0000320193', '0000789019']))
+    """
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 max_concurrency: int = 8,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 timeout: float = 30.0,
+                 use_http_cache: bool = True,
+                 http_cache_path: str = HTTP_CACHE_PATH,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None) -> None:
+        """
+        Initialize AsyncSECAPIClient.
+
+        Args:
+            base_url (str, optional): Base URL for the SEC API. Defaults to BASE_URL.
+            user_agent (str, optional): User-Agent header sent with every request. The SEC requires one.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 8.
+            rate_limiter (TokenBucket, optional): Limiter every request draws from. Defaults to the
+                host-wide limiter shared with all other SEC clients.
+            timeout (float, optional): Timeout in seconds for each request. Defaults to 30.
+            use_http_cache (bool, optional): Revalidate responses against the persistent on-disk cache.
+                Defaults to True.
+            http_cache_path (str, optional): Path to the on-disk cache. Defaults to HTTP_CACHE_PATH.
+            retry_policy (RetryPolicy, optional): Retries for connection errors and transient statuses.
+            circuit_breaker (CircuitBreaker, optional): Per-host breaker shared by every request.
+        """
+        super().__init__(base_url,
+                         user_agent,
+                         pool_maxsize=max_concurrency,
+                         timeout=timeout,
+                         rate_limiter=rate_limiter,
+                         use_http_cache=use_http_cache,
+                         http_cache_path=http_cache_path,
+                         retry_policy=retry_policy,
+                         circuit_breaker=circuit_breaker)
+        self.max_concurrency = max_concurrency
+
+    async def fetch_company_facts_many(
+        self,
+        cik_numbers: Iterable[str],
+        metrics: Optional[Collection[str]] = None
+    ) -> Dict[str, Union[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Fetch company facts for many CIK numbers concurrently.
+
+        Args:
+            cik_numbers (Iterable[str]): CIK numbers of the companies.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+
+        Returns:
+            dict: Maps each CIK number to its parsed company facts DataFrame or error information.
+        """
+        cik_numbers = list(dict.fromkeys(cik_numbers))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        async with aiohttp.ClientSession(
+                headers=dict(self.session.headers),
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            results = await asyncio.gather(*[
+                self._fetch_company_facts_async(session, semaphore, cik,
+                                                metrics)
+                for cik in cik_numbers
+            ])
+        return dict(zip(cik_numbers, results))
+
+    async def _fetch_company_facts_async(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        cik_number: str,
+        metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, Dict[str, Any]]:
+        """
+        Fetch and parse company facts for a single CIK number.
+
+        Args:
+            session (aiohttp.ClientSession): Session shared by all requests of the batch.
+            semaphore (asyncio.Semaphore): Bounds the number of requests in flight.
+            cik_number (str): CIK number of the company.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+
+        Returns:
+            pd.DataFrame or dict: Parsed company facts data or error information.
+        """
+        key = f'company_facts_{cik_number}'
+        response = self.cache.get(key)
+        if not response:
+            if not Roster._validate_cik(cik_number):
+                return {'error': f'Invalid CIK format: {cik_number}'}
+            url = SECEndpoints.COMPANY_FACTS.full_url(cik_number)
+            async with semaphore:
+                response = await self._send_get_request_async(session, url)
+            if 'error' in response:
+                return response
+            self.cache.store(key, response, expiry=3600)
+
+        parsed_data = await asyncio.to_thread(self._parse_response, response,
+                                              'company_facts', metrics)
+        if isinstance(parsed_data, pd.DataFrame):
+            return parsed_data
+        return {'error': 'Failed to parse company facts'}
+
+    async def _send_get_request_async(self, session: aiohttp.ClientSession,
+                                      url: str) -> Dict[str, Any]:
+        """
+        Send a rate-limited GET request to the SEC API, revalidating against the on-disk cache.
+
+        Connection errors and transient statuses are retried, and the circuit breaker consulted, exactly as
+        in `SECAPIClient._get`.
+
+        Args:
+            session (aiohttp.ClientSession): Session used to send the request.
+            url (str): The URL of the API endpoint.
+
+        Returns:
+            dict: The response from the API as a JSON object, or error information.
+        """
+        host = urlparse(url).netloc
+        try:
+            cached_entry = await asyncio.to_thread(
+                self.http_cache.get, url) if self.http_cache else None
+            headers = HTTPResponseCache.conditional_headers(cached_entry)
+            attempt = 0
+            while True:
+                if not self.circuit_breaker.allow(host):
+                    self.request_metrics.record_attempt(host, 'circuit_open')
+                    raise CircuitOpenError(f"Circuit open for host {host}")
+                await self.rate_limiter.acquire_async()
+                retry_after = None
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        self.request_metrics.record_attempt(
+                            host, f'status_{response.status}')
+                        retryable = self.retry_policy.is_retryable_status(
+                            response.status)
+                        if not retryable or not self.retry_policy.should_retry(
+                                attempt):
+                            if retryable:
+                                self.circuit_breaker.record_failure(host)
+                            else:
+                                self.circuit_breaker.record_success(host)
+                            if response.status == 304 and cached_entry:
+                                await asyncio.to_thread(
+                                    self.http_cache.touch, url)
+                                return json.loads(cached_entry['body'])
+                            response.raise_for_status()
+                            body = await response.read()
+                            etag = response.headers.get('ETag')
+                            last_modified = response.headers.get(
+                                'Last-Modified')
+                            if self.http_cache and (etag or last_modified):
+                                await asyncio.to_thread(
+                                    self.http_cache.store, url, body, etag,
+                                    last_modified)
+                            return json.loads(body)
+                        self.circuit_breaker.record_failure(host)
+                        retry_after = RetryPolicy.parse_retry_after(
+                            response.headers.get('Retry-After'))
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    self.circuit_breaker.record_failure(host)
+                    self.request_metrics.record_attempt(
+                        host, 'connection_error')
+                    if not self.retry_policy.should_retry(attempt):
+                        raise
+                self.request_metrics.record_retry(host)
+                await asyncio.sleep(
+                    self.retry_policy.backoff(attempt, retry_after))
+                attempt += 1
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error_message = f"Error sending GET request: {str(e)}"
+            self.error_handler.log_error(error_message)
+            return {'error': error_message}
+        except Exception as e:
+            error_message = f"Error during API request: {str(e)}"
+            self.error_handler.log_error(error_message)
+            return {'error': error_message}
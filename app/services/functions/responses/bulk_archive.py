@@ -0,0 +1,146 @@
+import os
+import re
+import zipfile
+from functools import partial
+from typing import (Any, Collection, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+
+import pandas as pd
+
+from app.services.functions.managers import LoggingManager
+
+from .sec_api_client import STREAM_CHUNK_SIZE, SECAPIClient
+
+MEMBER_PATTERN = re.compile(r'^CIK(\d{10})\.json$')
+
+
+class CompanyFactsArchive:
+    """
+    Reads company facts from SEC's nightly `companyfacts.zip` bulk archive.
+
+    Each member of the archive (`CIK##########.json`) holds the same document the companyfacts API
+    returns. Members are decompressed straight from the archive one at a time, without extracting
+    anything to disk, and parsed incrementally with the same flattening as
+    `SECAPIClient._parse_response`, so the output is identical to `SECAPIClient.fetch_company_facts`.
+    A universe-wide refresh becomes one sequential read of a local file instead of thousands of HTTP
+    requests.
+
+    Attributes:
+        archive_path (str): Path to the local `companyfacts.zip`.
+        sec_client (SECAPIClient): Client whose parser is applied to every member.
+
+    Example:
+        >>> archive = CompanyFactsArchive('companyfacts.zip')
+        >>> for cik_number, company_facts in archive.iter_company_facts(['0000320193']):
+        ...     print(cik_number, company_facts.shape)
+    """
+
+    def __init__(self,
+                 archive_path: str,
+                 sec_client: Optional[SECAPIClient] = None) -> None:
+        """
+        Initialize the archive reader.
+
+        Args:
+            archive_path (str): Path to the local `companyfacts.zip`.
+            sec_client (SECAPIClient, optional): Client used to parse members. A client without the
+                on-disk HTTP cache is created if not provided.
+        """
+        if not os.path.isfile(archive_path):
+            raise FileNotFoundError(f"Archive not found: {archive_path}")
+        self.archive_path = archive_path
+        self.sec_client = sec_client if sec_client else SECAPIClient(
+            use_http_cache=False)
+        self.error_handler = LoggingManager()
+
+    def list_ciks(self) -> List[str]:
+        """
+        List the CIK numbers available in the archive, in archive order.
+
+        Returns:
+            list of str: 10-digit CIK numbers.
+        """
+        with zipfile.ZipFile(self.archive_path) as archive:
+            return [
+                match.group(1) for match in map(MEMBER_PATTERN.match,
+                                                archive.namelist()) if match
+            ]
+
+    def iter_company_facts(
+        self,
+        cik_numbers: Optional[Iterable[str]] = None,
+        metrics: Optional[Collection[str]] = None
+    ) -> Iterator[Tuple[str, Union[pd.DataFrame, Dict[str, Any]]]]:
+        """
+        Iterate over the parsed company facts in the archive, in archive order.
+
+        Args:
+            cik_numbers (Iterable[str], optional): Only yield these CIK numbers. Defaults to every member.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+
+        Yields:
+            tuple: The CIK number and its parsed company facts DataFrame or error information.
+        """
+        wanted = set(cik_numbers) if cik_numbers is not None else None
+        with zipfile.ZipFile(self.archive_path) as archive:
+            for member in archive.infolist():
+                match = MEMBER_PATTERN.match(member.filename)
+                if not match:
+                    continue
+                cik_number = match.group(1)
+                if wanted is not None and cik_number not in wanted:
+                    continue
+                yield cik_number, self._read_member(archive, member, metrics)
+
+    def fetch_company_facts(
+        self,
+        cik_number: str,
+        metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, Dict[str, Any]]:
+        """
+        Read the company facts of a single company from the archive.
+
+        Args:
+            cik_number (str): CIK number of the company.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+
+        Returns:
+            pd.DataFrame or dict: Parsed company facts data or error information.
+        """
+        with zipfile.ZipFile(self.archive_path) as archive:
+            try:
+                member = archive.getinfo(f'CIK{cik_number}.json')
+            except KeyError:
+                return {'error': f'CIK {cik_number} not found in archive'}
+            return self._read_member(archive, member, metrics)
+
+    def _read_member(
+        self,
+        archive: zipfile.ZipFile,
+        member: zipfile.ZipInfo,
+        metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, Dict[str, Any]]:
+        """
+        Decompress and parse one archive member as a stream, so only the kept facts are held in memory.
+
+        Args:
+            archive (zipfile.ZipFile): The open archive.
+            member (zipfile.ZipInfo): The member to read.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+
+        Returns:
+            pd.DataFrame or dict: Parsed company facts data or error information.
+        """
+        try:
+            with archive.open(member) as member_file:
+                parsed_data = self.sec_client._parse_company_facts_stream(
+                    iter(partial(member_file.read, STREAM_CHUNK_SIZE), b''),
+                    metrics)
+        except zipfile.BadZipFile as e:
+            error_message = f"Error reading {member.filename}: {str(e)}"
+            self.error_handler.log_error(error_message)
+            return {'error': error_message}
+
+        if isinstance(parsed_data, pd.DataFrame):
+            return parsed_data
+        return {'error': 'Failed to parse company facts'}
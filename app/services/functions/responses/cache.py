@@ -1,8 +1,18 @@
+import os
+import sqlite3
+import threading
 import time
-from typing import Optional
+import zlib
+from contextlib import closing
+from typing import Dict, Iterator, Optional
 
 from cachetools import TTLCache
 
+from app.services.types import HTTP_CACHE_PATH
+
+# Default cap on the compressed bodies of the HTTP response cache, about a few thousand companyfacts.
+HTTP_CACHE_MAX_BYTES = 2 << 30
+
 
 class CacheManager:
 
@@ -50,3 +60,224 @@ class CacheManager:
         for key, cached_data in self.cache.items():
             if cached_data['expiry'] <= time.time():
                 del self.cache[key]
+
+
+class HTTPResponseCache:
+    """
+    Persistent on-disk cache of HTTP response bodies, keyed by URL and stored in SQLite.
+
+    Bodies are stored zlib-compressed together with their `ETag` and `Last-Modified` validators.
+    A cached entry is never served blindly: the client sends its validators as
+    `If-None-Match`/`If-Modified-Since`, and only reuses the stored body when the server answers
+    304 Not Modified. Unchanged filings therefore cost a few hundred bytes instead of a full download,
+    across restarts and across processes sharing the same cache file.
+
+    The cache is bounded: once a `store` takes it over `max_bytes` of compressed bodies or over
+    `max_entries` responses, the least recently used responses are evicted. A response is used when it
+    is stored or revalidated, which `validated_at` records. SQLite reuses the pages freed by evictions,
+    so the file stops growing once the cap is reached.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+        compression_level (int): zlib compression level used for stored bodies.
+        max_bytes (int or None): Maximum total size of the compressed bodies, None for no limit.
+        max_entries (int or None): Maximum number of responses, None for no limit.
+    """
+
+    def __init__(self,
+                 path: str = HTTP_CACHE_PATH,
+                 compression_level: int = 6,
+                 max_bytes: Optional[int] = HTTP_CACHE_MAX_BYTES,
+                 max_entries: Optional[int] = None) -> None:
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            path (str, optional): Path to the SQLite database file. Defaults to HTTP_CACHE_PATH.
+            compression_level (int, optional): zlib compression level. Defaults to 6.
+            max_bytes (int, optional): Maximum total size of the compressed bodies, None for no limit.
+                Defaults to HTTP_CACHE_MAX_BYTES.
+            max_entries (int, optional): Maximum number of responses, None for no limit. Defaults to None.
+        """
+        self.path = path
+        self.compression_level = compression_level
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the cache database. Connections are short-lived so the cache can be
+        used from any thread.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        with self._lock:
+            if not self._initialized:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS responses (
+                            url TEXT PRIMARY KEY,
+                            etag TEXT,
+                            last_modified TEXT,
+                            body BLOB NOT NULL,
+                            stored_at REAL NOT NULL,
+                            validated_at REAL NOT NULL
+                        )
+                        """)
+                    conn.commit()
+                self._initialized = True
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self,
+            url: str,
+            decompress: bool = True) -> Optional[Dict[str, object]]:
+        """
+        Retrieve a cached response.
+
+        Args:
+            url (str): The URL of the response.
+            decompress (bool, optional): Decompress the body. Pass False to stream it later with
+                `iter_body`. Defaults to True.
+
+        Returns:
+            dict or None: The `body` with its `etag`, `last_modified`, `stored_at` and `validated_at`,
+                or None if the URL is not cached.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT etag, last_modified, body, stored_at, validated_at '
+                'FROM responses WHERE url = ?', (url, )).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body, stored_at, validated_at = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': zlib.decompress(body) if decompress else body,
+            'stored_at': stored_at,
+            'validated_at': validated_at
+        }
+
+    def store(self,
+              url: str,
+              body: bytes,
+              etag: Optional[str],
+              last_modified: Optional[str],
+              compressed: bool = False) -> None:
+        """
+        Store a response body compressed, together with its validators, then evict the least recently
+        used responses if the cache is over its limits. The response just stored is always kept.
+
+        Args:
+            url (str): The URL of the response.
+            body (bytes): The raw (decoded) response body.
+            etag (str, optional): The `ETag` response header.
+            last_modified (str, optional): The `Last-Modified` response header.
+            compressed (bool, optional): The body was already compressed with `compressor`. Defaults to False.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, etag, last_modified, body, stored_at, validated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified,
+                 body if compressed else zlib.compress(
+                     body, self.compression_level), now, now))
+            self._evict(conn, url)
+
+    def _evict(self, conn: sqlite3.Connection, kept_url: str) -> None:
+        """
+        Delete the least recently used responses beyond `max_entries` or `max_bytes`.
+
+        Args:
+            conn (sqlite3.Connection): The connection of the ongoing transaction.
+            kept_url (str): URL of a response that is never evicted.
+        """
+        if self.max_entries is not None:
+            conn.execute(
+                'DELETE FROM responses WHERE url != ? AND url IN ('
+                'SELECT url FROM responses ORDER BY validated_at DESC, url '
+                'LIMIT -1 OFFSET ?)', (kept_url, self.max_entries))
+        if self.max_bytes is not None:
+            # Running total of the body sizes from the most recently used response on
+            conn.execute(
+                'DELETE FROM responses WHERE url != ? AND url IN ('
+                'SELECT url FROM (SELECT url, SUM(LENGTH(body)) OVER '
+                '(ORDER BY validated_at DESC, url) AS total FROM responses) '
+                'WHERE total > ?)', (kept_url, self.max_bytes))
+
+    def compressor(self) -> 'zlib._Compress':
+        """
+        Create a compressor for building a body incrementally, e.g. while it is being streamed.
+
+        Returns:
+            zlib._Compress: A compressor whose output can be passed to `store` with `compressed=True`.
+        """
+        return zlib.compressobj(self.compression_level)
+
+    @staticmethod
+    def iter_body(entry: Dict[str, object],
+                  chunk_size: int = 1 << 16) -> Iterator[bytes]:
+        """
+        Decompress the body of an entry fetched with `decompress=False` in chunks.
+
+        Args:
+            entry (dict): The cached entry returned by `get`.
+            chunk_size (int, optional): Size of the compressed slices fed to the decompressor.
+
+        Yields:
+            bytes: The decompressed body, chunk by chunk.
+        """
+        decompressor = zlib.decompressobj()
+        body = memoryview(entry['body'])
+        for start in range(0, len(body), chunk_size):
+            yield decompressor.decompress(body[start:start + chunk_size])
+        yield decompressor.flush()
+
+    def touch(self, url: str) -> None:
+        """
+        Record that a cached response was just revalidated by the server.
+
+        Args:
+            url (str): The URL of the response.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute('UPDATE responses SET validated_at = ? WHERE url = ?',
+                         (time.time(), url))
+
+    def delete(self, url: str) -> None:
+        """
+        Remove a cached response.
+
+        Args:
+            url (str): The URL of the response.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM responses WHERE url = ?', (url, ))
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, object]]) -> Dict[str, str]:
+        """
+        Build the revalidation headers for a cached entry.
+
+        Args:
+            entry (dict, optional): The cached entry returned by `get`.
+
+        Returns:
+            dict: `If-None-Match` and/or `If-Modified-Since` headers, empty if there is nothing to revalidate.
+        """
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
@@ -1,32 +1,124 @@
+import json
 import time
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from itertools import chain, compress
+from typing import (Any, Collection, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 import requests
 from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 
 from app.services.functions.managers import LoggingManager
-from app.services.types import BASE_URL
-from app.services.utils import Roster
+from app.services.types import BASE_URL, HTTP_CACHE_PATH, TICKER_INDEX_PATH
+from app.services.utils import (CircuitBreaker, CircuitOpenError,
+                                RequestMetrics, RetryPolicy, Roster,
+                                TokenBucket, apply_fact_dtypes,
+                                get_shared_rate_limiter)
 
-from .cache import CacheManager
+from .cache import CacheManager, HTTPResponseCache
+from .stream_parser import CompanyFactsStreamParser
+from .ticker_index import TICKER_INDEX_TTL, TickerIndex
+
+
+# TBD dynamic handling of 'User-Agent' based on user's input
+DEFAULT_USER_AGENT = 'YourName <your_email@example.com>'
+STREAM_CHUNK_SIZE = 1 << 16
+STREAM_BATCH_FACTS = 50000
 
 
 class SECAPIClient:
 
-    def __init__(self, base_url: Optional[str] = None) -> None:
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 user_agent: str = DEFAULT_USER_AGENT,
+                 pool_connections: int = 4,
+                 pool_maxsize: int = 10,
+                 timeout: float = 30.0,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 use_http_cache: bool = True,
+                 http_cache_path: str = HTTP_CACHE_PATH,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None) -> None:
         """
         Initialize SECAPIClient with an optional base URL. Uses default if not provided.
 
+        All `fetch_*` methods share one pooled `requests.Session`, so consecutive requests reuse
+        keep-alive connections instead of paying a new TCP/TLS handshake each time.
+
         Args:
             base_url (str, optional): Base URL for the SEC API. Defaults to BASE_URL.
+            user_agent (str, optional): User-Agent header sent with every request. The SEC requires one.
+            pool_connections (int, optional): Number of per-host connection pools to cache. Defaults to 4.
+            pool_maxsize (int, optional): Maximum number of connections kept alive per host. Defaults to 10.
+            timeout (float, optional): Timeout in seconds for each request. Defaults to 30.
+            rate_limiter (TokenBucket, optional): Limiter every request draws from. Defaults to the
+                host-wide limiter shared with all other SEC clients and rosters.
+            use_http_cache (bool, optional): Keep responses in the persistent on-disk cache and revalidate
+                them with conditional requests. Defaults to True.
+            http_cache_path (str, optional): Path to the on-disk cache. Defaults to HTTP_CACHE_PATH.
+            retry_policy (RetryPolicy, optional): Retries for connection errors and transient statuses.
+                Defaults to three retries with jittered exponential backoff.
+            circuit_breaker (CircuitBreaker, optional): Per-host breaker that stops sending requests to a
+                failing host. Defaults to a new breaker for this client.
         """
         self.base_url = base_url if base_url else BASE_URL
         self.error_handler = LoggingManager()
-        self.rate_limit: Optional[Dict[str, int]] = None
+        self.rate_limiter = rate_limiter if rate_limiter else get_shared_rate_limiter(
+        )
         self.cache = CacheManager(maxsize=100, ttl=3600)  # Cache for 1 hour
-        self.roster = Roster()
+        self.http_cache = HTTPResponseCache(
+            http_cache_path) if use_http_cache else None
+        self.roster = Roster(rate_limiter=self.rate_limiter)
+        self.timeout = timeout
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+        self.circuit_breaker = circuit_breaker if circuit_breaker else CircuitBreaker(
+        )
+        self.request_metrics = RequestMetrics()
+        self._ticker_index = None
+        self.session = self._create_session(user_agent, pool_connections,
+                                            pool_maxsize)
+
+    def __enter__(self) -> 'SECAPIClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the pooled session and release its connections.
+        """
+        self.session.close()
+
+    @staticmethod
+    def _create_session(user_agent: str, pool_connections: int,
+                        pool_maxsize: int) -> requests.Session:
+        """
+        Create a session with a keep-alive connection pool and compressed transfer encoding.
+
+        Args:
+            user_agent (str): User-Agent header sent with every request.
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept alive per host.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+        return session
 
     def fetch_company_tickers(self) -> Union[pd.DataFrame, Dict[str, Any]]:
         """
@@ -53,6 +145,36 @@ class SECAPIClient:
 
         return {'error': 'Failed to fetch company tickers'}
 
+    def get_ticker_index(self,
+                         path: str = TICKER_INDEX_PATH,
+                         ttl: float = TICKER_INDEX_TTL,
+                         refresh: bool = False) -> Optional[TickerIndex]:
+        """
+        Return the ticker/CIK index, reading it from disk while it is fresh and downloading it otherwise.
+
+        Parameters:
+            path (str, optional): Where the index is persisted. Defaults to TICKER_INDEX_PATH.
+            ttl (float, optional): Maximum age in seconds of the persisted index. Defaults to TICKER_INDEX_TTL.
+            refresh (bool, optional): Download the index even if a fresh copy exists. Defaults to False.
+
+        Returns:
+            TickerIndex or None: The index, or None if it could neither be loaded nor downloaded.
+        """
+        index = self._ticker_index
+        if refresh or index is None or time.time() - index.fetched_at > ttl:
+            index = None if refresh else TickerIndex.load(path, ttl)
+            if index is None:
+                response = self._send_get_request(
+                    self.roster.api_endpoints["company_tickers"])
+                if not response or 'error' in response:
+                    self.error_handler.log_error(
+                        "Failed to download company tickers")
+                    return self._ticker_index
+                index = TickerIndex.from_response(response)
+                index.save(path)
+            self._ticker_index = index
+        return index
+
     def fetch_submissions(
             self, cik_number: str) -> Union[pd.DataFrame, Dict[str, Any]]:
         """
@@ -62,77 +184,151 @@ class SECAPIClient:
             cik_number (str): CIK number of the company.
 
         Returns:
-            pd.DataFrame or dict: Parsed submissions data or error information.
+            pd.DataFrame or dict: The company's recent filings, one row per filing, or error information.
         """
         key = f'submissions_{cik_number}'
-        cached_data = self.cache.get(key)
-        if cached_data:
-            return cached_data
-        url = self.roster.recruit_cik(cik_number).api_endpoints["submissions"]
-        response = self._send_get_request(url)
-        if response:
+        response = self.cache.get(key)
+        if not response:
+            url = self.roster.recruit_cik(
+                cik_number).api_endpoints["submissions"]
+            response = self._send_get_request(url)
+            if not response:
+                return {'error': 'Failed to fetch company submissions'}
+            if 'error' in response:
+                return response
             self.cache.store(key, response, expiry=3600)
 
-            parsed_data = self._parse_response(response, 'submissions')
-            if isinstance(parsed_data, pd.DataFrame):
-                return parsed_data
-            else:
-                return {'error': 'Failed to parse company submissions'}
+        parsed_data = self._parse_response(response, 'submissions')
+        if isinstance(parsed_data, pd.DataFrame):
+            return parsed_data
+        else:
+            return {'error': 'Failed to parse company submissions'}
 
     def fetch_company_facts(
-            self, cik_number: str) -> Union[pd.DataFrame, Dict[str, Any]]:
+        self,
+        cik_number: str,
+        stream: bool = False,
+        metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, Dict[str, Any]]:
         """
         Fetch facts about a company using its CIK number. Uses cache if available.
 
         Parameters:
             cik_number (str): CIK number of the company.
+            stream (bool, optional): Parse the body incrementally while it is downloaded instead of loading
+                the whole document first. Lowers peak memory for the largest filers; the in-memory cache
+                is bypassed. Defaults to False.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Every other concept is skipped
+                while parsing. Defaults to all concepts.
 
         Returns:
             pd.DataFrame or dict: Parsed company facts data or error information.
         """
+        if stream:
+            url = self.roster.recruit_cik(
+                cik_number).api_endpoints["company_facts"]
+            return self._stream_company_facts(url, metrics)
+
         key = f'company_facts_{cik_number}'
         cached_response = self.cache.get(key)
         if cached_response:
-            return self._parse_response(cached_response, 'company_facts')
+            return self._parse_response(cached_response, 'company_facts',
+                                        metrics)
 
         url = self.roster.recruit_cik(
             cik_number).api_endpoints["company_facts"]
         response = self._send_get_request(url)
-        if response:
+        if response and 'error' not in response:
             self.cache.store(key, response, expiry=3600)  # Cache for 1 hour
 
-            parsed_data = self._parse_response(response, 'company_facts')
+            parsed_data = self._parse_response(response, 'company_facts',
+                                               metrics)
             if isinstance(parsed_data, pd.DataFrame):
                 return parsed_data
             else:
                 return {'error': 'Failed to parse company facts'}
 
+        if response:
+            return response
         return {'error': 'Failed to fetch company facts'}
 
+    def _get(self,
+             url: str,
+             headers: Dict[str, str],
+             stream: bool = False) -> requests.Response:
+        """
+        Send a GET request, retrying connection errors and transient statuses according to `retry_policy`.
+
+        Every attempt waits for a rate limiter token, is refused while the circuit breaker for the host is
+        open, and is counted in `request_metrics`. When the retries are exhausted the last error is raised,
+        or the last response returned, for the caller to handle.
+        Args:
+            url (str): The URL of the API endpoint.
+            headers (dict): Extra headers for the request.
+            stream (bool, optional): Defer reading the body. Defaults to False.
+        Returns:
+            requests.Response: The response of the last attempt.
+        Raises:
+            CircuitOpenError: If the circuit breaker for the host is open.
+            requests.exceptions.RequestException: If the last attempt failed to connect.
+        """
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow(host):
+                self.request_metrics.record_attempt(host, 'circuit_open')
+                raise CircuitOpenError(f"Circuit open for host {host}")
+            self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                kwargs = {'stream': True} if stream else {}
+                response = self.session.get(url,
+                                            headers=headers,
+                                            timeout=self.timeout,
+                                            **kwargs)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                self.circuit_breaker.record_failure(host)
+                self.request_metrics.record_attempt(host, 'connection_error')
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+            else:
+                self.request_metrics.record_attempt(
+                    host, f'status_{response.status_code}')
+                if not self.retry_policy.is_retryable_status(
+                        response.status_code):
+                    self.circuit_breaker.record_success(host)
+                    return response
+                self.circuit_breaker.record_failure(host)
+                if not self.retry_policy.should_retry(attempt):
+                    return response
+                retry_after = RetryPolicy.parse_retry_after(
+                    response.headers.get('Retry-After'))
+                response.close()
+            self.request_metrics.record_retry(host)
+            time.sleep(self.retry_policy.backoff(attempt, retry_after))
+            attempt += 1
+
     def _send_get_request(self, url: str) -> Union[Dict[str, Any], None]:
         """
-        Send a GET request to the SEC API.
+        Send a GET request to the SEC API, with rate limiting and retries as described in `_get`.
+
+        If the URL is in the on-disk cache, the request is made conditional on the cached validators and
+        the cached body is reused when the server answers 304 Not Modified.
         Args:
             url (str): The URL of the API endpoint.
         Returns:
             dict or None: The response from the API as a JSON object, or None if there was a parsing error.
         """
-        # TBD dynamic handling of 'User-Agent' based on user's input
-        headers = {'User-Agent': 'YourName <your_email@example.com>'}
         try:
-            if self.rate_limit and self.rate_limit['remaining'] == 0:
-                cooldown_period = self.rate_limit['reset'] - time.time()
-                if cooldown_period > 0:
-                    time.sleep(cooldown_period +
-                               1)  # Add an extra second to cooldown period
-            response = requests.get(url, headers=headers)
+            cached_entry = self.http_cache.get(url) if self.http_cache else None
+            response = self._get(
+                url, HTTPResponseCache.conditional_headers(cached_entry))
+            if response.status_code == 304 and cached_entry:
+                self.http_cache.touch(url)
+                return json.loads(cached_entry['body'])
             response.raise_for_status()
-            if 'X-RateLimit-Remaining' in response.headers:
-                self.rate_limit = {
-                    'remaining':
-                    int(response.headers['X-RateLimit-Remaining']),
-                    'reset': int(response.headers['X-RateLimit-Reset'])
-                }
+            self._store_http_response(url, response)
             return response.json()
         except requests.exceptions.RequestException as e:
             error_message = f"Error sending GET request: {str(e)}"
@@ -143,43 +339,156 @@ class SECAPIClient:
             self.error_handler.log_error(error_message)
             return {'error': error_message}
 
-    def _parse_response(self, response: Dict[str, Any],
-                        response_type: str) -> Union[pd.DataFrame, None]:
+    def _stream_company_facts(
+        self,
+        url: str,
+        metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, Dict[str, Any]]:
+        """
+        Send a streaming GET request for company facts and parse the body while it is read.
+
+        The on-disk cache is honoured as in `_send_get_request`: a 304 answer is parsed from the cached
+        body, and a new body is compressed chunk by chunk as it streams past, so the uncompressed
+        document is never held in memory.
+        Args:
+            url (str): The URL of the company facts endpoint.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+        Returns:
+            pd.DataFrame or dict: Parsed company facts data or error information.
+        """
+        try:
+            cached_entry = self.http_cache.get(
+                url, decompress=False) if self.http_cache else None
+            with self._get(url,
+                           HTTPResponseCache.conditional_headers(cached_entry),
+                           stream=True) as response:
+                if response.status_code == 304 and cached_entry:
+                    self.http_cache.touch(url)
+                    parsed_data = self._parse_company_facts_stream(
+                        HTTPResponseCache.iter_body(cached_entry), metrics)
+                else:
+                    response.raise_for_status()
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    chunks = response.iter_content(STREAM_CHUNK_SIZE)
+                    compressor, compressed_body = None, []
+                    if self.http_cache and (etag or last_modified):
+                        compressor = self.http_cache.compressor()
+                        chunks = self._tee_compressed(chunks, compressor,
+                                                      compressed_body)
+                    parsed_data = self._parse_company_facts_stream(
+                        chunks, metrics)
+                    if compressor and parsed_data is not None:
+                        compressed_body.append(compressor.flush())
+                        self.http_cache.store(url,
+                                              b''.join(compressed_body),
+                                              etag,
+                                              last_modified,
+                                              compressed=True)
+        except requests.exceptions.RequestException as e:
+            error_message = f"Error sending GET request: {str(e)}"
+            self.error_handler.log_error(error_message)
+            return {'error': error_message}
+        except Exception as e:
+            error_message = f"Error during API request: {str(e)}"
+            self.error_handler.log_error(error_message)
+            return {'error': error_message}
+
+        if isinstance(parsed_data, pd.DataFrame):
+            return parsed_data
+        return {'error': 'Failed to parse company facts'}
+
+    @staticmethod
+    def _tee_compressed(chunks: Iterable[bytes], compressor: 'zlib._Compress',
+                        compressed_body: List[bytes]) -> Iterator[bytes]:
+        """
+        Pass chunks through unchanged while appending their compressed form to `compressed_body`.
+        """
+        for chunk in chunks:
+            compressed_body.append(compressor.compress(chunk))
+            yield chunk
+
+    def _parse_company_facts_stream(
+        self,
+        chunks: Iterable[bytes],
+        metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, None]:
+        """
+        Parse a company facts body given as byte chunks, with the same output as `_parse_response`.
+
+        Facts are converted to columns every `STREAM_BATCH_FACTS` facts, so at most one batch of
+        per-fact dicts is alive at a time.
+        Args:
+            chunks (Iterable[bytes]): The response body.
+            metrics (Collection[str], optional): us-gaap concepts to keep. Defaults to all concepts.
+        Returns:
+            pd.DataFrame or None: The parsed response as a DataFrame, or None in case of error.
+        """
+        try:
+            parser = CompanyFactsStreamParser(chunks, metrics)
+            frames, batch, batch_size = [], [], 0
+            for metric, _, facts in parser:
+                batch.append((metric, facts))
+                batch_size += len(facts)
+                if batch_size >= STREAM_BATCH_FACTS:
+                    frames.append(self._facts_to_frame(batch))
+                    batch, batch_size = [], 0
+            frames.append(self._facts_to_frame(batch))
+            frames = [frame for frame in frames if not frame.empty]
+            if not frames:
+                return pd.DataFrame()
+            frame = frames[0] if len(frames) == 1 else pd.concat(
+                frames, ignore_index=True, sort=False)
+            return self._with_entity_columns(frame, parser.entity_name,
+                                             parser.cik)
+        except Exception as e:
+            self.error_handler.log_error(f"Error parsing response: {str(e)}")
+            return None
+
+    def _store_http_response(self, url: str,
+                             response: requests.Response) -> None:
+        """
+        Keep a response in the on-disk cache if the server sent validators for it.
+        Args:
+            url (str): The URL of the API endpoint.
+            response (requests.Response): The successful response.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if self.http_cache and (etag or last_modified):
+            self.http_cache.store(url, response.content, etag, last_modified)
+
+    def _parse_response(
+            self,
+            response: Dict[str, Any],
+            response_type: str,
+            metrics: Optional[Collection[str]] = None
+    ) -> Union[pd.DataFrame, None]:
         """
         Parse the raw JSON response based on the type of data.
         Args:
             response (dict): The raw JSON response from the SEC API.
             response_type (str): The type of data (e.g., 'tickers', 'submissions', 'company_facts').
+            metrics (Collection[str], optional): For company facts, the us-gaap concepts to keep. Every other
+                concept is skipped before any of its facts are touched. Defaults to all concepts.
         Returns:
             pd.DataFrame or None: The parsed response as a DataFrame, or None in case of error.
         """
         try:
             if response_type == 'tickers':
-                # TBD Specific parsing logic for tickers (consider maybe separating the methods below?)
-                pass
+                return TickerIndex.from_response(response).to_frame()
             elif response_type == 'submissions':
-                # TBD Specific parsing logic for submissions
-                pass
+                # Recent filings come as parallel arrays, newest first
+                return pd.DataFrame(response['filings']['recent'])
             elif response_type == 'company_facts':
-                entityname, cik = response['entityName'], response['cik']
-                all_flattened_data = []
-                current_year = datetime.now().year
-                ten_years_ago = current_year - 10
-                for metric_key, metric_data in response['facts'][
-                        'us-gaap'].items():
-                    if 'units' in metric_data and 'USD' in metric_data['units']:
-                        usd_data = metric_data['units']['USD']
-
-                        flattened_data = [{
-                            'EntityName': entityname,
-                            'CIK': cik,
-                            'Metric': metric_key,
-                            **item
-                        } for item in usd_data if datetime.strptime(
-                            item['end'], '%Y-%m-%d').year >= ten_years_ago]
-                        all_flattened_data.extend(flattened_data)
-
-                return pd.DataFrame(all_flattened_data)
+                metrics = set(metrics) if metrics is not None else None
+                return self._flatten_company_facts(
+                    response['entityName'], response['cik'],
+                    ((metric_key, metric_data['units']['USD'])
+                     for metric_key, metric_data in response['facts']
+                     ['us-gaap'].items()
+                     if (metrics is None or metric_key in metrics)
+                     and 'USD' in metric_data.get('units', {})))
             else:
                 self.error_handler.log_error(
                     f"Unknown response type: {response_type}")
@@ -187,3 +496,75 @@ class SECAPIClient:
         except Exception as e:
             self.error_handler.log_error(f"Error parsing response: {str(e)}")
             return None
+
+    @staticmethod
+    def _flatten_company_facts(
+            entity_name: str, cik: int,
+            metric_items: Iterable[Tuple[str, List[Dict[str, Any]]]]
+    ) -> pd.DataFrame:
+        """
+        Flatten the USD facts of every metric into one DataFrame, keeping the last ten years.
+
+        Columns appear as EntityName, CIK, Metric followed by the fact fields in order of first appearance.
+
+        Args:
+            entity_name (str): Name of the company.
+            cik (int): CIK number of the company.
+            metric_items (Iterable[tuple]): Pairs of metric name and its list of USD facts.
+
+        Returns:
+            pd.DataFrame: One row per fact.
+        """
+        return SECAPIClient._with_entity_columns(
+            SECAPIClient._facts_to_frame(metric_items), entity_name, cik)
+
+    @staticmethod
+    def _facts_to_frame(
+        metric_items: Iterable[Tuple[str, List[Dict[str, Any]]]]
+    ) -> pd.DataFrame:
+        """
+        Build the Metric and fact columns for a batch of metrics, keeping the last ten years.
+
+        The fact lists are chained without copying, the ten-year cutoff is a vectorized comparison on the
+        ISO `end` strings and the DataFrame is built once from the surviving facts, so no per-fact dict or
+        datetime is created.
+
+        Args:
+            metric_items (Iterable[tuple]): Pairs of metric name and its list of USD facts.
+
+        Returns:
+            pd.DataFrame: One row per fact, empty if no fact is recent enough.
+        """
+        metric_names, fact_lists = [], []
+        for metric_key, usd_data in metric_items:
+            metric_names.append(metric_key)
+            fact_lists.append(usd_data)
+        facts = list(chain.from_iterable(fact_lists))
+        if not facts:
+            return pd.DataFrame()
+
+        metrics = np.repeat(np.array(metric_names, dtype=object),
+                            [len(usd_data) for usd_data in fact_lists])
+        cutoff = f'{datetime.now().year - 10:04d}-01-01'
+        keep = np.array([fact['end'] for fact in facts], dtype=object) >= cutoff
+        if not keep.all():
+            facts = list(compress(facts, keep))
+            metrics = metrics[keep]
+        if not facts:
+            return pd.DataFrame()
+
+        frame = pd.DataFrame(facts)
+        frame.insert(0, 'Metric', metrics)
+        return frame
+
+    @staticmethod
+    def _with_entity_columns(frame: pd.DataFrame, entity_name: str,
+                             cik: int) -> pd.DataFrame:
+        """
+        Prepend the EntityName and CIK columns to a non-empty facts frame and apply the fact dtypes.
+        """
+        if not frame.empty:
+            frame.insert(0, 'CIK', cik)
+            frame.insert(0, 'EntityName', entity_name)
+            apply_fact_dtypes(frame)
+        return frame
@@ -0,0 +1,243 @@
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import (Any, Collection, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_CONTINUATION = '0123456789.eE+-'
+
+
+class CompanyFactsStreamParser:
+    """
+    Incremental parser for companyfacts documents, fed with the body as a stream of byte chunks.
+
+    The document is walked as it arrives instead of being loaded whole: only the facts of the wanted
+    units (USD by default) and metrics are materialized, one `(metric, unit, facts)` chunk at a time,
+    and everything else (other taxonomies, labels, descriptions, other units) is skipped without being
+    decoded. Consumed input is dropped from the buffer, so peak memory is bounded by the facts that are
+    kept rather than by the size of the payload.
+
+    Attributes:
+        cik (int): The `cik` of the document, once it has been read.
+        entity_name (str): The `entityName` of the document, once it has been read.
+
+    Example:
+        >>> parser = CompanyFactsStreamParser(response.iter_content(65536), metrics={'Assets'})
+        >>> for metric, unit, facts in parser:
+        ...     print(metric, unit, len(facts))
+    """
+
+    def __init__(self,
+                 chunks: Iterable[bytes],
+                 metrics: Optional[Collection[str]] = None,
+                 units: Collection[str] = ('USD', ),
+                 taxonomy: str = 'us-gaap',
+                 encoding: str = 'utf-8') -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            chunks (Iterable[bytes]): The response body, in chunks of any size.
+            metrics (Collection[str], optional): Metrics to keep. Defaults to every metric.
+            units (Collection[str], optional): Units to keep. Defaults to USD only.
+            taxonomy (str, optional): Taxonomy whose facts are read. Defaults to 'us-gaap'.
+            encoding (str, optional): Encoding of the body. Defaults to 'utf-8'.
+        """
+        self.metrics = set(metrics) if metrics is not None else None
+        self.units = set(units)
+        self.taxonomy = taxonomy
+        self.cik = None
+        self.entity_name = None
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._value_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        """
+        Walk the document, yielding the kept facts as they are read.
+
+        Yields:
+            tuple: The metric name, the unit and the list of facts for that unit.
+
+        Raises:
+            ValueError: If the body is not a valid companyfacts document.
+        """
+        for key in self._iter_object():
+            if key == 'cik':
+                self.cik = self._read_value()
+            elif key == 'entityName':
+                self.entity_name = self._read_value()
+            elif key == 'facts':
+                yield from self._iter_facts()
+            else:
+                self._skip_value()
+        self._skip_whitespace()
+        if self._pos < len(self._buffer):
+            self._error('Extra data')
+
+    def _iter_facts(self) -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        for taxonomy in self._iter_object():
+            if taxonomy != self.taxonomy:
+                self._skip_value()
+                continue
+            for metric in self._iter_object():
+                if self.metrics is not None and metric not in self.metrics:
+                    self._skip_value()
+                    continue
+                for field in self._iter_object():
+                    if field != 'units':
+                        self._skip_value()
+                        continue
+                    for unit in self._iter_object():
+                        if unit in self.units:
+                            yield metric, unit, self._read_array()
+                        else:
+                            self._skip_value()
+
+    def _fill(self) -> bool:
+        """
+        Drop the consumed part of the buffer and append the next decoded chunk.
+
+        Returns:
+            bool: False if the stream is exhausted.
+        """
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return True
+
+    def _error(self, message: str) -> None:
+        raise ValueError(f'{message} in companyfacts stream')
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            self._error('Unexpected end of data')
+        return self._buffer[self._pos]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            self._error(f"Expected '{char}' at position {self._pos}")
+        self._pos += 1
+
+    def _read_value(self) -> Any:
+        """
+        Decode the next value. A value ending at the end of the buffer, or followed by what could be the
+        rest of a number, is only accepted once more data has arrived, since `12` may be the start of
+        `12.5e3` split across chunks.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._value_decoder.raw_decode(
+                    self._buffer, self._pos)
+                if self._eof or (end < len(self._buffer) and
+                                 self._buffer[end] not in NUMBER_CONTINUATION):
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _read_key(self) -> str:
+        self._expect('"')
+        while True:
+            try:
+                key, end = scanstring(self._buffer, self._pos)
+                self._pos = end
+                break
+            except ValueError:
+                if not self._fill():
+                    raise
+        self._expect(':')
+        return key
+
+    def _iter_object(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the next object. The caller must consume each value before resuming.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            yield self._read_key()
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self._error(f"Expected ',' or '}}' at position {self._pos - 1}")
+
+    def _iter_array(self) -> Iterator[None]:
+        """
+        Iterate over the elements of the next array. The caller must consume each element before resuming.
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self._error(f"Expected ',' or ']' at position {self._pos - 1}")
+
+    def _read_array(self) -> List[Any]:
+        """
+        Decode the next array, in one call if it is already complete in the buffer and element by element
+        otherwise, so a large array is never re-scanned as a whole.
+        """
+        if self._peek() == '[':
+            try:
+                items, self._pos = self._value_decoder.raw_decode(
+                    self._buffer, self._pos)
+                return items
+            except ValueError:
+                pass
+        return [self._read_value() for _ in self._iter_array()]
+
+    def _skip_value(self) -> None:
+        """
+        Skip the next value. A container that is already complete in the buffer is decoded in one call
+        and discarded; otherwise it is descended into, so a large value is never re-scanned as a whole.
+        """
+        char = self._peek()
+        if char not in '{[':
+            self._read_value()
+            return
+        try:
+            _, self._pos = self._value_decoder.raw_decode(
+                self._buffer, self._pos)
+            return
+        except ValueError:
+            pass
+        if char == '{':
+            for _ in self._iter_object():
+                self._skip_value()
+        else:
+            for _ in self._iter_array():
+                self._skip_value()
@@ -0,0 +1,210 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from app.services.types import TICKER_INDEX_PATH
+
+# The SEC refreshes company_tickers.json roughly daily.
+TICKER_INDEX_TTL = 24 * 3600
+
+
+class TickerIndex:
+    """
+    In-memory index over SEC's `company_tickers.json`: ticker, CIK and company name of every listed issuer.
+
+    Records are kept in three parallel lists. Lookups by ticker and by CIK go through dicts of row
+    positions, and company names are kept sorted so a name prefix search is a binary search followed
+    by a short scan. The index can be saved to disk and reloaded while it is younger than a TTL, so
+    symbols resolve without a network round trip.
+
+    Attributes:
+        fetched_at (float): Epoch time at which the underlying data was downloaded.
+
+    Example:
+        >>> index = TickerIndex.from_response(client._send_get_request(url))
+        >>> index.resolve('aapl')
+        '0000320193'
+        >>> index.search('micro')[0]['title']
+        'MICROSOFT CORP'
+    """
+
+    def __init__(self,
+                 records: Iterable[Tuple[str, str, str]],
+                 fetched_at: Optional[float] = None) -> None:
+        """
+        Build the index.
+
+        Args:
+            records (Iterable[tuple]): (cik, ticker, title) rows; CIK numbers are zero-padded to 10 digits.
+            fetched_at (float, optional): When the data was downloaded. Defaults to now.
+        """
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self._ciks: List[str] = []
+        self._tickers: List[str] = []
+        self._titles: List[str] = []
+        self._by_ticker: Dict[str, int] = {}
+        self._by_cik: Dict[str, List[int]] = {}
+        for cik, ticker, title in records:
+            position = len(self._ciks)
+            cik = str(cik).zfill(10)
+            self._ciks.append(cik)
+            self._tickers.append(ticker)
+            self._titles.append(title)
+            self._by_ticker.setdefault(ticker.upper(), position)
+            self._by_cik.setdefault(cik, []).append(position)
+        self._sorted_titles = sorted(
+            (title.lower(), position)
+            for position, title in enumerate(self._titles))
+
+    def __len__(self) -> int:
+        return len(self._ciks)
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Dict[str, Any]]) -> 'TickerIndex':
+        """
+        Build the index from the `company_tickers.json` payload.
+
+        Args:
+            response (dict): Maps row numbers to `{'cik_str', 'ticker', 'title'}` entries.
+
+        Returns:
+            TickerIndex: The index.
+        """
+        return cls((entry['cik_str'], entry['ticker'], entry['title'])
+                   for entry in response.values())
+
+    def lookup_ticker(self, ticker: str) -> Optional[str]:
+        """
+        Find the CIK number of a ticker, ignoring case.
+
+        Args:
+            ticker (str): The ticker symbol.
+
+        Returns:
+            str or None: The 10-digit CIK number, or None if the ticker is unknown.
+        """
+        position = self._by_ticker.get(ticker.strip().upper())
+        return self._ciks[position] if position is not None else None
+
+    def lookup_cik(self, cik: str) -> List[str]:
+        """
+        Find the tickers of a CIK number.
+
+        Args:
+            cik (str): The CIK number, with or without zero padding.
+
+        Returns:
+            list of str: The tickers, primary listing first; empty if the CIK is unknown.
+        """
+        return [
+            self._tickers[position]
+            for position in self._by_cik.get(str(cik).strip().zfill(10), [])
+        ]
+
+    def resolve(self, symbol: str) -> Optional[str]:
+        """
+        Resolve a ticker or a CIK number to a 10-digit CIK number.
+
+        A CIK number is accepted as is, listed or not: delisted companies, funds and other registrants
+        without a ticker are missing from the index. Only tickers are looked up.
+
+        Args:
+            symbol (str): A ticker symbol, or a CIK number of at most 10 digits with or without zero
+                padding.
+
+        Returns:
+            str or None: The 10-digit CIK number, or None if the ticker is unknown.
+        """
+        symbol = symbol.strip()
+        if symbol.isdigit() and len(symbol) <= 10:
+            return symbol.zfill(10)
+        return self.lookup_ticker(symbol)
+
+    def search(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Find companies whose name starts with a prefix, ignoring case.
+
+        Args:
+            prefix (str): The start of the company name.
+            limit (int, optional): Maximum number of matches. Defaults to 10.
+
+        Returns:
+            list of dict: Matches in name order, each with `cik`, `ticker` and `title`.
+        """
+        prefix = prefix.strip().lower()
+        matches = []
+        start = bisect_left(self._sorted_titles, (prefix, -1))
+        for title, position in self._sorted_titles[start:start + limit]:
+            if not title.startswith(prefix):
+                break
+            matches.append(self._record(position))
+        return matches
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the index as a DataFrame.
+
+        Returns:
+            pd.DataFrame: One row per ticker, with `cik`, `ticker` and `title` columns.
+        """
+        return pd.DataFrame({
+            'cik': self._ciks,
+            'ticker': self._tickers,
+            'title': self._titles
+        })
+
+    def save(self, path: str = TICKER_INDEX_PATH) -> None:
+        """
+        Write the index to disk, atomically replacing any previous copy.
+
+        Args:
+            path (str, optional): Destination file. Defaults to TICKER_INDEX_PATH.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'fetched_at': self.fetched_at,
+                    'fields': ['cik', 'ticker', 'title'],
+                    'data': list(zip(self._ciks, self._tickers, self._titles))
+                }, file)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls,
+             path: str = TICKER_INDEX_PATH,
+             ttl: Optional[float] = TICKER_INDEX_TTL) -> Optional['TickerIndex']:
+        """
+        Read an index saved with `save`.
+
+        Args:
+            path (str, optional): The saved file. Defaults to TICKER_INDEX_PATH.
+            ttl (float, optional): Maximum age in seconds. None accepts any age. Defaults to TICKER_INDEX_TTL.
+
+        Returns:
+            TickerIndex or None: The index, or None if the file is missing, unreadable or stale.
+        """
+        try:
+            with open(path, encoding='utf-8') as file:
+                saved = json.load(file)
+            fetched_at = saved['fetched_at']
+            records = saved['data']
+        except (OSError, ValueError, KeyError):
+            return None
+        if ttl is not None and time.time() - fetched_at > ttl:
+            return None
+        return cls(records, fetched_at)
+
+    def _record(self, position: int) -> Dict[str, str]:
+        return {
+            'cik': self._ciks[position],
+            'ticker': self._tickers[position],
+            'title': self._titles[position]
+        }
@@ -1,6 +1,9 @@
 # In services/functions/storages/__init__.py
 
 from .local_data_storage import DataStorageManager
+from .snowflake_pool import SnowflakeConnectionPool
 from .sw_flake import SnowflakeDataManager
 
-__all__ = ['SnowflakeDataManager', 'DataStorageManager']
+__all__ = [
+    'SnowflakeConnectionPool', 'SnowflakeDataManager', 'DataStorageManager'
+]
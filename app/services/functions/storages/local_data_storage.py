@@ -1,26 +1,75 @@
 import json
 import os
-from typing import Optional, Union
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
 from app.services.functions.managers import LoggingManager
 from app.services.types import QueryFolderMapping
-from app.services.utils import now
+from app.services.utils import DataManifest, apply_fact_dtypes, now
+
+
+# Comparison operators accepted in `load_data` filters, as in pyarrow's DNF filters.
+FILTER_OPERATORS = {
+    '==': lambda column, value: column == value,
+    '=': lambda column, value: column == value,
+    '!=': lambda column, value: column != value,
+    '<': lambda column, value: column < value,
+    '<=': lambda column, value: column <= value,
+    '>': lambda column, value: column > value,
+    '>=': lambda column, value: column >= value,
+    'in': lambda column, value: column.isin(value),
+    'not in': lambda column, value: ~column.isin(value),
+}
+
+Filter = Tuple[str, str, Any]
 
 
 class DataStorageManager:
+    """
+    Stores DataFrames and JSON documents under `<local_storage_dir>/<cik>/<storage_type>/<category>/`.
+
+    DataFrames are written as Parquet by default, which keeps column dtypes (dates, integers,
+    strings) intact between pipeline stages and lets readers load only the columns and rows they
+    need. CSV is still supported for writing, and files of either format are read back through
+    `load_data`, so data written before the switch stays readable.
+
+    Every stored file is recorded in the company's DataManifest, so finding the latest version of a
+    dataset is a lookup rather than a directory scan.
 
-    def __init__(self, local_storage_dir: str, cik_number: str):
+    Attributes:
+        local_storage_dir (str): The base directory for local storage.
+        cik_number (str): The Central Index Key number.
+        storage_format (str): File format of stored DataFrames, one of STORAGE_FORMATS.
+        manifest (DataManifest): Records the current file of every stored dataset.
+    """
+
+    STORAGE_FORMATS = ('parquet', 'csv')
+
+    def __init__(self,
+                 local_storage_dir: str,
+                 cik_number: str,
+                 storage_format: str = 'parquet'):
         """
         Initialize the DataStorageManager.
 
         Args:
             local_storage_dir (str): The base directory for local storage.
             cik_number (str): The Central Index Key number.
+            storage_format (str, optional): File format of stored DataFrames, 'parquet' or 'csv'.
+                Defaults to 'parquet'.
+
+        Raises:
+            ValueError: If the storage format is not supported.
         """
+        if storage_format not in self.STORAGE_FORMATS:
+            raise ValueError(
+                f"Unsupported storage format '{storage_format}', "
+                f"expected one of {', '.join(self.STORAGE_FORMATS)}.")
         self.local_storage_dir = local_storage_dir
         self.cik_number = cik_number
+        self.storage_format = storage_format
+        self.manifest = DataManifest(local_storage_dir)
         self.error_handler = LoggingManager()
 
     def _generate_file_name(self,
@@ -81,7 +130,7 @@ class DataStorageManager:
                    storage_type: str,
                    category_name: str = None) -> Union[str, None]:
         """
-        Store data in CSV format.
+        Store data in the configured storage format.
 
         Args:
             data (pd.DataFrame): The data to be stored as a DataFrame.
@@ -93,12 +142,51 @@ class DataStorageManager:
         """
         timestamp = now()
         dir_path = self._create_directory_path(storage_type, category_name)
-        file_name = self._generate_file_name(category_name, timestamp, 'csv')
+        file_name = self._generate_file_name(category_name, timestamp,
+                                             self.storage_format)
         file_path = os.path.join(dir_path, file_name)
-        data.to_csv(file_path, index=False)
+        if self.storage_format == 'parquet':
+            data.to_parquet(file_path, index=False)
+        else:
+            data.to_csv(file_path, index=False)
+        self.manifest.record(self.cik_number, storage_type, category_name,
+                             file_name)
         self.error_handler.log(f"Data stored locally at {file_path}", "INFO")
         return file_name
 
+    @staticmethod
+    def load_data(
+            file_path: str,
+            columns: Optional[List[str]] = None,
+            filters: Optional[Sequence[Filter]] = None) -> pd.DataFrame:
+        """
+        Load a DataFrame stored by `store_data`, in whichever format the file was written.
+
+        Parquet files are read with column projection and predicate pushdown, so only the requested
+        columns are decoded and row groups that cannot match the filters are skipped. CSV files are
+        read in full, converted to the fact dtypes that Parquet keeps, and filtered afterwards.
+
+        Args:
+            file_path (str): Path of the stored file.
+            columns (List[str], optional): Columns to load. Defaults to every column.
+            filters (Sequence[tuple], optional): `(column, operator, value)` conditions that rows must
+                all satisfy, e.g. `[('year', '>=', 2015)]`. Supported operators are the keys of
+                FILTER_OPERATORS. Defaults to no filtering.
+
+        Returns:
+            pd.DataFrame: The loaded data.
+        """
+        if file_path.endswith('.parquet'):
+            return pd.read_parquet(file_path,
+                                   columns=columns,
+                                   filters=list(filters) if filters else None)
+        df = apply_fact_dtypes(pd.read_csv(file_path))
+        for column, operator, value in filters or ():
+            df = df[FILTER_OPERATORS[operator](df[column], value)]
+        if columns is not None:
+            df = df[columns]
+        return df.reset_index(drop=True)
+
     def store_json_data(self,
                         json_data: dict,
                         storage_type: str,
@@ -124,6 +212,8 @@ class DataStorageManager:
         file_path = os.path.join(dir_path, file_name)
         with open(file_path, 'w') as json_file:
             json.dump(json_data, json_file, indent=4)
+        self.manifest.record(self.cik_number, storage_type, category_name,
+                             file_name, sub_category)
         self.error_handler.log(f"JSON data stored locally at {file_path}",
                                "INFO")
         return file_name
@@ -132,6 +222,10 @@ class DataStorageManager:
                              data_type: str) -> Union[str, None]:
         """
         Get the path of the latest file for a specific query in a specified data type directory.
+
+        The file recorded in the manifest is used when there is one; directories written before the
+        manifest existed fall back to picking the most recently modified file.
+
         Args:
             query_name (str): The name of the query.
             data_type (str): Type of data ('preprocessed_data' or 'processed_data').
@@ -142,6 +236,11 @@ class DataStorageManager:
         if dir_path is None:
             return None
 
+        recorded_file = self.manifest.latest(self.cik_number, data_type,
+                                             os.path.basename(dir_path))
+        if recorded_file:
+            return recorded_file
+
         try:
             files = [os.path.join(dir_path, f) for f in os.listdir(dir_path)]
             if not files:
@@ -0,0 +1,219 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from snowflake import connector as snowflake_connector
+
+from app.services.configs import SnowflakeConfig
+
+# Connection settings of a SnowflakeConfig; configs with the same settings share a pool.
+CONNECTION_SETTINGS = ('user', 'password', 'account', 'warehouse', 'database',
+                       'schema', 'port', 'role')
+
+
+class SnowflakeConnectionPool:
+    """
+    Pool of Snowflake connections shared by the SnowflakeDataManager instances of a process.
+
+    Connections are only opened when a caller needs one and none is idle, up to `max_size`. An idle
+    connection is checked before it is handed out again: it is dropped if it was closed, or if it has
+    been idle longer than `health_check_after` seconds and fails a `SELECT 1`. Connections idle longer
+    than `max_idle_seconds` are closed.
+
+    Attributes:
+        config (SnowflakeConfig): Settings of the connections.
+        max_size (int): Maximum number of open connections.
+        max_idle_seconds (float): Seconds after which an idle connection is closed.
+        health_check_after (float): Seconds of idleness after which a connection is pinged before reuse.
+        timeout (float): Seconds to wait for a connection when `max_size` are in use.
+    """
+
+    _shared: Dict[Tuple, 'SnowflakeConnectionPool'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 config: SnowflakeConfig,
+                 max_size: int = 4,
+                 max_idle_seconds: float = 300.0,
+                 health_check_after: float = 60.0,
+                 timeout: float = 60.0,
+                 connector=None):
+        """
+        Initialize an empty pool; no connection is opened yet.
+
+        Args:
+            config (SnowflakeConfig): Settings of the connections.
+            max_size (int, optional): Maximum number of open connections. Defaults to 4.
+            max_idle_seconds (float, optional): Seconds after which an idle connection is closed.
+                Defaults to 300.
+            health_check_after (float, optional): Seconds of idleness after which a connection is
+                pinged before reuse. Defaults to 60.
+            timeout (float, optional): Seconds to wait for a connection when all are in use.
+                Defaults to 60.
+            connector (module, optional): Provides `connect(**settings)`. Defaults to
+                `snowflake.connector`.
+        """
+        self.config = config
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+        self.connector = connector or snowflake_connector
+        # Idle connections with the time they were released, the most recent last
+        self._idle: List[Tuple[object, float]] = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    @classmethod
+    def shared(cls, config: SnowflakeConfig, **kwargs) -> 'SnowflakeConnectionPool':
+        """
+        The process-wide pool of the connection settings of a config, created on first use.
+
+        Args:
+            config (SnowflakeConfig): Settings of the connections.
+            **kwargs: Options of the pool if it is created now.
+
+        Returns:
+            SnowflakeConnectionPool: The shared pool.
+        """
+        key = tuple(getattr(config, setting, None) for setting in CONNECTION_SETTINGS)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(config, **kwargs)
+            return cls._shared[key]
+
+    @classmethod
+    def close_shared(cls) -> None:
+        """
+        Close every connection of the shared pools and forget them.
+        """
+        with cls._shared_lock:
+            pools, cls._shared = list(cls._shared.values()), {}
+        for pool in pools:
+            pool.close_all()
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def acquire(self):
+        """
+        Take a healthy idle connection, or open one if fewer than `max_size` are open.
+
+        Returns:
+            The connection, to give back with `release`.
+
+        Raises:
+            TimeoutError: If no connection became available within `timeout` seconds.
+        """
+        deadline = self._clock() + self.timeout
+        while True:
+            with self._condition:
+                expired = self._take_expired()
+                while not self._idle and self._in_use >= self.max_size:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        raise TimeoutError(
+                            f"No Snowflake connection available within {self.timeout} seconds.")
+                # Counted before the health check or login, so concurrent callers cannot exceed max_size
+                self._in_use += 1
+                idle = self._idle.pop() if self._idle else None
+            for connection, _ in expired:
+                self._close(connection)
+
+            if idle is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._discard()
+                    raise
+            connection, released_at = idle
+            if self._is_healthy(connection, self._clock() - released_at):
+                return connection
+            self._close(connection)
+            self._discard()
+
+    def release(self, connection) -> None:
+        """
+        Give a connection back to the pool.
+
+        Args:
+            connection: A connection returned by `acquire`.
+        """
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append((connection, self._clock()))
+            expired = self._take_expired()
+            self._condition.notify()
+        for expired_connection, _ in expired:
+            self._close(expired_connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a `with` block.
+
+        Example:
+            >>> with pool.connection() as connection, connection.cursor() as cursor:
+            ...     cursor.execute('SELECT 1')
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close_all(self) -> None:
+        """
+        Close the idle connections; connections in use return to the pool when released.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def _connect(self):
+        return self.connector.connect(
+            **{setting: getattr(self.config, setting) for setting in CONNECTION_SETTINGS})
+
+    def _take_expired(self) -> List[Tuple[object, float]]:
+        # The idle list is ordered by release time, so expired connections come first
+        now = self._clock()
+        count = 0
+        while count < len(self._idle) and now - self._idle[count][1] > self.max_idle_seconds:
+            count += 1
+        expired, self._idle = self._idle[:count], self._idle[count:]
+        return expired
+
+    def _discard(self) -> None:
+        # Frees the slot of a connection that could not be opened or was dropped
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, connection, idle_seconds: float) -> bool:
+        try:
+            if connection.is_closed():
+                return False
+            if idle_seconds > self.health_check_after:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+atexit.register(SnowflakeConnectionPool.close_shared)
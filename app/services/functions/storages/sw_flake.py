@@ -1,7 +1,7 @@
 """
-This class manages connections and data operations with Snowflake.
-It handles establishing a connection to Snowflake, uploading data,
-executing queries, including those from SQL files, and closing the connection.
+This class manages data operations with Snowflake.
+It handles uploading data and executing queries, including those from SQL files,
+on connections borrowed from a SnowflakeConnectionPool shared across the process.
 """
 # TODO: Dynamic Handling of Stage and Table Names
 # TODO: automate schema detection and table creation from data input
@@ -14,25 +14,30 @@ executing queries, including those from SQL files, and closing the connection.
 import os
 
 import pandas as pd
-from snowflake import connector
 
 from app.services.configs import SnowflakeConfig
 from app.services.functions.managers import LoggingManager
 from app.services.types import CSV_FILE_PATH, DEFAULT_TABLE_NAME
 from app.services.utils import dataframe_to_csv
 
+from .snowflake_pool import SnowflakeConnectionPool
+
 
 class SnowflakeDataManager:
 
     def __init__(self,
                  config: SnowflakeConfig,
                  custom_table_name=None,
-                 custom_stage_name=None):
+                 custom_stage_name=None,
+                 pool: SnowflakeConnectionPool = None):
         """
-        Initializes the SnowflakeDataManager class.
+        Initializes the SnowflakeDataManager class. No connection is opened until one is needed.
         Args:
+            config (SnowflakeConfig): Configuration for Snowflake connection.
             custom_table_name (str): Custom table name provided by the user.
             custom_stage_name (str): Custom stage name provided by the user.
+            pool (SnowflakeConnectionPool, optional): Pool to borrow connections from. Defaults to the
+                process-wide pool of the config, so every manager with the same settings shares it.
         """
         self.user = config.user
         self.password = config.password
@@ -42,9 +47,7 @@ class SnowflakeDataManager:
         self.schema = config.schema
         self.port = config.port
         self.role = config.role
-        # Establish a connection
-        self.connection = None
-        self.connect_to_snowflake()
+        self.pool = pool if pool else SnowflakeConnectionPool.shared(config)
         # Initialize other classes
         self.error_handler = LoggingManager()
         # Set custom table and stage names
@@ -53,21 +56,13 @@ class SnowflakeDataManager:
 
     def connect_to_snowflake(self):
         """
-        Establishes a connection to Snowflake using environment variables for credentials.
+        Checks that a connection to Snowflake can be obtained from the pool.
         Raises:
             Exception: If there is an error in connecting to Snowflake.
         """
         try:
-            self.connection = connector.connect(
-                user=self.user,
-                password=self.password,
-                account=self.account,
-                warehouse=self.warehouse,
-                database=self.database,
-                schema=self.schema,
-                port=self.port,
-                role=self.role,
-            )
+            with self.pool.connection():
+                pass
         except Exception as e:
             print(f"Error connecting to Snowflake: {e}")
             raise
@@ -80,9 +75,8 @@ class SnowflakeDataManager:
             data (pd.DataFrame): The DataFrame to upload.
             table_name (str): The name of the Snowflake table. If None, uses the default table name.
         """
-        if self.connection is None or data.empty:
-            self.error_handler.log(
-                "No connection to Snowflake or data is empty.", "ERROR")
+        if data.empty:
+            self.error_handler.log("Data is empty.", "ERROR")
             return
 
         try:
@@ -123,16 +117,13 @@ class SnowflakeDataManager:
             stage_name (str): The name of the Snowflake stage to upload the file to.
                               If None, a stage name is generated.
         """
-        if self.connection is None:
-            self.error_handler.log("No connection to Snowflake.", "ERROR")
-            return
-
         try:
             # Generate the stage name using the provided or default table name
             stage_name = stage_name or self._generate_stage_name(
                 DEFAULT_TABLE_NAME, 'PUT')
 
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor(
+            ) as cursor:
                 put_command = f"PUT file://{file_path} {stage_name} AUTO_COMPRESS=FALSE OVERWRITE=TRUE"
                 cursor.execute(put_command)
                 print(f"File {file_path} uploaded to stage {stage_name}")
@@ -148,10 +139,6 @@ class SnowflakeDataManager:
             stage_name (str): The name of the Snowflake stage. If None, a stage name is generated.
             table_name (str): The name of the Snowflake table. If None, uses the default table name.
         """
-        if self.connection is None:
-            self.error_handler.log("No connection to Snowflake.", "ERROR")
-            return
-
         try:
             # Generate the stage name using the provided or default table name
             stage_name = stage_name or self._generate_stage_name(
@@ -160,7 +147,8 @@ class SnowflakeDataManager:
             # Use the provided or default table name
             table_name = table_name or DEFAULT_TABLE_NAME
 
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor(
+            ) as cursor:
                 copy_command = f"COPY INTO {table_name} FROM {stage_name} FILE_FORMAT = (TYPE = 'CSV' FIELD_OPTIONALLY_ENCLOSED_BY = '\"' SKIP_HEADER = 1)"
                 cursor.execute(copy_command)
                 print(
@@ -178,11 +166,9 @@ class SnowflakeDataManager:
         Returns:
             pd.DataFrame: The results of the query as a pandas DataFrame.
         """
-        if self.connection is None:
-            self.error_handler.log("No connection to Snowflake.", "ERROR")
-            return pd.DataFrame()
         try:
-            with self.connection.cursor() as cursor:
+            with self.pool.connection() as connection, connection.cursor(
+            ) as cursor:
                 cursor.execute(query)
                 result = cursor.fetchall()
                 # Convert the result into a pandas DataFrame
@@ -208,11 +194,11 @@ class SnowflakeDataManager:
 
     def close_connection(self):
         """
-        Closes the connection to Snowflake.
+        Closes the idle connections of the pool. Connections are returned to the pool after every
+        operation, so there is none to close for this manager alone.
         """
-        if self.connection:
-            self.connection.close()
-            print("Connection to Snowflake closed successfully.")
+        self.pool.close_all()
+        print("Idle connections to Snowflake closed successfully.")
 
     def create_table(self, table_name):
         """
@@ -221,7 +207,6 @@ class SnowflakeDataManager:
             table_name (str): The name of the table to create.
         """
         try:
-            cursor = self.connection.cursor()
             sql = f"""
                    CREATE TABLE {self.schema}.{table_name} (
                        EntityName VARCHAR(255),
@@ -238,8 +223,10 @@ class SnowflakeDataManager:
                        start DATE
                    )
                    """
-            cursor.execute(sql)
-            self.connection.commit()
+            with self.pool.connection() as connection, connection.cursor(
+            ) as cursor:
+                cursor.execute(sql)
+                connection.commit()
             print(
                 f"Table {table_name} created successfully with specific columns."
             )
@@ -38,8 +38,11 @@ class InterpolationTransformer:
         Initializes the InterpolationTransformer with financial data.
 
         Args:
-            df (pd.DataFrame): The dataset containing financial metrics and dates.
+            df (pd.DataFrame): The dataset containing financial metrics and dates. Dates may be
+                'YYYY-MM-DD' strings or datetimes; datetimes are converted to strings.
         """
+        if pd.api.types.is_datetime64_any_dtype(df['DATE']):
+            df = df.assign(DATE=df['DATE'].dt.strftime('%Y-%m-%d'))
         self.data = df
         #print(self.data.head())
 
@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
 from typing import Dict, List, Union
 
 import pandas as pd
@@ -133,13 +132,13 @@ class BaseTransformer(ABC):
         Format the date from the DataFrame row.
 
         Args:
-            row (pd.Series): A row from the DataFrame containing the data.
+            row (pd.Series): A row from the DataFrame containing the data. `DATE` may be a
+                'YYYY-MM-DD' string or a timestamp.
 
         Returns:
             str: The formatted date string.
         """
-        date_str = row["DATE"]
-        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m")
+        return pd.Timestamp(row["DATE"]).strftime("%Y-%m")
 
     @abstractmethod
     def transform_all(self) -> Union[Dict, pd.DataFrame]:
@@ -1 +1,2 @@
 from .query_manager import QueryExecutor
+from .sql_engine import LocalSQLEngine
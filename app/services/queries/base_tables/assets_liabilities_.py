@@ -1,10 +1,44 @@
 import numpy as np
 
+from app.services.types import Units
+
 from ..base_tables.query_base import FinancialQueryBase
 
 
 class AssetsLiabilityQuery(FinancialQueryBase):
 
+    column_units = {
+        'AssetToLiabilityRatio': Units.RATIO,
+        'DebtToEquityRatio': Units.RATIO
+    }
+
+    # Names of the columns in the final DataFrame
+    rename_map = {
+        'EntityName': 'ENTITY',
+        'end': 'DATE',
+        'year': 'Year',
+        'quarter': 'Quarter',
+        'AssetsCurrent': 'ASSETS_CURRENT',
+        'LiabilitiesCurrent': 'LIABILITIES_CURRENT',
+        'StockholdersEquity': 'STOCKHOLDERS_EQUITY',
+        'AssetToLiabilityRatio': 'ASSET_TO_LIABILITY_RATIO',
+        'DebtToEquityRatio': 'DEBT_TO_EQUITY_RATIO'
+    }
+
+    # Columns of the result of the query's SQL file, by the column of `add_calculations` they hold
+    sql_columns = {
+        'EntityName': 'EntityName',
+        'CIK': 'CIK',
+        'end_date': 'end',
+        'year': 'year',
+        'quarter': 'quarter',
+        'Assets_Million': 'AssetsCurrent',
+        'Liabilities_Million': 'LiabilitiesCurrent',
+        'StockholdersEquity_Million': 'StockholdersEquity',
+        'AssetToLiabilityRatio': 'AssetToLiabilityRatio',
+        'DebtToEquityRatio': 'DebtToEquityRatio'
+    }
+
     def __init__(self):
         super().__init__(metrics=[
             'AssetsCurrent', 'LiabilitiesCurrent', 'StockholdersEquity'
@@ -54,17 +88,7 @@ class AssetsLiabilityQuery(FinancialQueryBase):
         if date_columns is None:
             date_columns = ['end']
         if rename_map is None:
-            rename_map = {
-                'EntityName': 'ENTITY',
-                'end': 'DATE',
-                'year': 'Year',
-                'quarter': 'Quarter',
-                'AssetsCurrent': 'ASSETS_CURRENT',
-                'LiabilitiesCurrent': 'LIABILITIES_CURRENT',
-                'StockholdersEquity': 'STOCKHOLDERS_EQUITY',
-                'AssetToLiabilityRatio': 'ASSET_TO_LIABILITY_RATIO',
-                'DebtToEquityRatio': 'DEBT_TO_EQUITY_RATIO'
-            }
+            rename_map = self.rename_map
 
         # Run the base query process
         df_final = super().run_query(df, index_cols, date_columns, rename_map)
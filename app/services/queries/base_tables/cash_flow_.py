@@ -3,6 +3,32 @@ from ..base_tables.query_base import FinancialQueryBase
 
 class CashFlowQuery(FinancialQueryBase):
 
+    # Names of the columns in the final DataFrame
+    rename_map = {
+        'EntityName': 'ENTITY',
+        'end': 'DATE',
+        'year': 'Year',
+        'quarter': 'Quarter',
+        'NetCashProvidedByUsedInOperatingActivities':
+        'CASH_FLOW_OPERATING',
+        'NetCashProvidedByUsedInInvestingActivities':
+        'CASH_FLOW_INVESTING',
+        'NetCashProvidedByUsedInFinancingActivities':
+        'CASH_FLOW_FINANCING'
+    }
+
+    # Columns of the result of the query's SQL file, by the column of `add_calculations` they hold
+    sql_columns = {
+        'Entity': 'EntityName',
+        'CIK': 'CIK',
+        'Date': 'end',
+        'Year': 'year',
+        'Quarter': 'quarter',
+        'CashFlow_Operating': 'NetCashProvidedByUsedInOperatingActivities',
+        'CashFlow_Investing': 'NetCashProvidedByUsedInInvestingActivities',
+        'CashFlow_Financing': 'NetCashProvidedByUsedInFinancingActivities'
+    }
+
     def __init__(self):
         # Initialize with metrics essential for cash flow analysis
         super().__init__(metrics=[
@@ -38,18 +64,7 @@ class CashFlowQuery(FinancialQueryBase):
         if date_columns is None:
             date_columns = ['end']
         if rename_map is None:
-            rename_map = {
-                'EntityName': 'ENTITY',
-                'end': 'DATE',
-                'year': 'Year',
-                'quarter': 'Quarter',
-                'NetCashProvidedByUsedInOperatingActivities':
-                'CASH_FLOW_OPERATING',
-                'NetCashProvidedByUsedInInvestingActivities':
-                'CASH_FLOW_INVESTING',
-                'NetCashProvidedByUsedInFinancingActivities':
-                'CASH_FLOW_FINANCING'
-            }
+            rename_map = self.rename_map
 
         # Run the base query process
         df_final = super().run_query(df, index_cols, date_columns, rename_map)
@@ -1,10 +1,37 @@
 import numpy as np
 
+from app.services.types import Units
+
 from ..base_tables.query_base import FinancialQueryBase
 
 
 class LiquidityQuery(FinancialQueryBase):
 
+    column_units = {'CurrentRatio': Units.RATIO}
+
+    # Names of the columns in the final DataFrame
+    rename_map = {
+        'EntityName': 'ENTITY',
+        'end': 'DATE',
+        'year': 'Year',
+        'quarter': 'Quarter',
+        'AssetsCurrent': 'CURRENT_ASSETS',
+        'LiabilitiesCurrent': 'CURRENT_LIABILITIES',
+        'CurrentRatio': 'CURRENT_RATIO'
+    }
+
+    # Columns of the result of the query's SQL file, by the column of `add_calculations` they hold
+    sql_columns = {
+        'ENTITY': 'EntityName',
+        'CIK': 'CIK',
+        'DATE': 'end',
+        'Year': 'year',
+        'Quarter': 'quarter',
+        'CurrentAssets_Million': 'AssetsCurrent',
+        'CurrentLiabilities_Million': 'LiabilitiesCurrent',
+        'CurrentRatio': 'CurrentRatio'
+    }
+
     def __init__(self):
         # Initialize with metrics essential for liquidity analysis
         super().__init__(metrics=['AssetsCurrent', 'LiabilitiesCurrent'])
@@ -44,15 +71,7 @@ class LiquidityQuery(FinancialQueryBase):
         if date_columns is None:
             date_columns = ['end']
         if rename_map is None:
-            rename_map = {
-                'EntityName': 'ENTITY',
-                'end': 'DATE',
-                'year': 'Year',
-                'quarter': 'Quarter',
-                'AssetsCurrent': 'CURRENT_ASSETS',
-                'LiabilitiesCurrent': 'CURRENT_LIABILITIES',
-                'CurrentRatio': 'CURRENT_RATIO'
-            }
+            rename_map = self.rename_map
 
         # Run the base query process, including preparation, calculations, and renaming
         df_final = super().run_query(df, index_cols, date_columns, rename_map)
@@ -1,10 +1,40 @@
 import numpy as np
 
+from app.services.types import Units
+
 from ..base_tables.query_base import FinancialQueryBase
 
 
 class ProfitabilityQuery(FinancialQueryBase):
 
+    column_units = {'ProfitMarginPercent': Units.PERCENT}
+
+    # Names of the columns in the final DataFrame
+    rename_map = {
+        'EntityName': 'ENTITY',
+        'end': 'DATE',
+        'year': 'Year',
+        'quarter': 'Quarter',
+        'NetIncomeLoss': 'NET_INCOME_LOSS',
+        'OperatingIncomeLoss': 'OPS_INCOME_LOSS',
+        #DEV
+        'RevenueFromContractWithCustomerExcludingAssessedTax': 'REVENUES',
+        'ProfitMarginPercent': 'PROFIT_MARGIN'
+    }
+
+    # Columns of the result of the query's SQL file, by the column of `add_calculations` they hold
+    sql_columns = {
+        'ENTITY': 'EntityName',
+        'CIK': 'CIK',
+        'DATE': 'end',
+        'Year': 'year',
+        'Quarter': 'quarter',
+        'NetIncomeLoss_Million': 'NetIncomeLoss',
+        'Revenues_Million': 'RevenueFromContractWithCustomerExcludingAssessedTax',
+        'OperatingIncomeLoss_Million': 'OperatingIncomeLoss',
+        'ProfitMarginPercent': 'ProfitMarginPercent'
+    }
+
     def __init__(self):
         # Initialize with a list of metrics essential for profitability calculations
         super().__init__(
@@ -49,17 +79,7 @@ class ProfitabilityQuery(FinancialQueryBase):
         if date_columns is None:
             date_columns = ['end']
         if rename_map is None:
-            rename_map = {
-                'EntityName': 'ENTITY',
-                'end': 'DATE',
-                'year': 'Year',
-                'quarter': 'Quarter',
-                'NetIncomeLoss': 'NET_INCOME_LOSS',
-                'OperatingIncomeLoss': 'OPS_INCOME_LOSS',
-                #DEV
-                'RevenueFromContractWithCustomerExcludingAssessedTax': 'REVENUES',
-                'ProfitMarginPercent': 'PROFIT_MARGIN'
-            }
+            rename_map = self.rename_map
 
         # Run the base query process
         df_final = super().run_query(df, index_cols, date_columns, rename_map)
@@ -1,19 +1,81 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from app.services.types import UNITS_ATTR, Units
+from app.services.utils import apply_fact_dtypes
+
+# How `pivot_dataframe` combines several facts of the same period and metric: their mean (as
+# `pivot_table` does), the first or last in row order, or the one filed last.
+DEDUPE_RULES = ('mean', 'first', 'last', 'latest_filed')
+
+
+def _sorted_group_codes(df: pd.DataFrame,
+                        columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Number the distinct combinations of some columns in their sorted order.
+
+    Each column is factorized on its own and the codes are combined into one mixed-radix integer key,
+    so no tuple or MultiIndex is built per row.
+
+    Args:
+        df (pd.DataFrame): The data, without missing values in `columns`.
+        columns (List[str]): The columns to group by.
+
+    Returns:
+        tuple: The group number of every row, and the position of the first row of every group.
+    """
+    key = np.zeros(len(df), dtype=np.int64)
+    size = 1
+    for column in columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            # Category codes already follow the sort order of the categories
+            codes = df[column].cat.codes.to_numpy()
+            base = max(len(df[column].cat.categories), 1)
+        else:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            base = max(len(uniques), 1)
+        if size > np.iinfo(np.int64).max // base:
+            # Renumber the combinations seen so far, keeping their order, before the key overflows
+            _, key = np.unique(key, return_inverse=True)
+            size = int(key.max()) + 1
+        key = key * base + codes
+        size *= base
+    _, first_rows, group_codes = np.unique(key,
+                                           return_index=True,
+                                           return_inverse=True)
+    return group_codes.reshape(-1), first_rows
+
 
 class FinancialQueryBase:
 
-    def __init__(self, metrics: List[str]):
+    # Units of the columns added by `add_calculations`; the metrics themselves are in USD millions
+    column_units: Dict[str, Units] = {}
+
+    # Names of the columns in the final DataFrame, by the name of the column they are renamed from
+    rename_map: Dict[str, str] = {}
+
+    # Columns of the result of the query's SQL file, by the column of `add_calculations` they hold
+    sql_columns: Dict[str, str] = {}
+
+    def __init__(self, metrics: List[str], dedupe: str = 'mean'):
         """
         Initialize the FinancialQueryBase with a list of metrics.
 
         Args:
             metrics (List[str]): A list of metrics that are essential for the analysis.
+            dedupe (str, optional): How duplicate facts of a period and metric are combined, one of
+                DEDUPE_RULES. Defaults to 'mean'.
+
+        Raises:
+            ValueError: If the dedupe rule is not supported.
         """
+        if dedupe not in DEDUPE_RULES:
+            raise ValueError(
+                f"Unsupported dedupe rule '{dedupe}', expected one of {', '.join(DEDUPE_RULES)}.")
         self.metrics = metrics
+        self.dedupe = dedupe
 
     def validate_data(self, df: pd.DataFrame,
                       required_columns: List[str]) -> None:
@@ -34,22 +96,53 @@ class FinancialQueryBase:
             raise ValueError(
                 f"Missing required columns: {', '.join(missing_columns)}")
 
-    def pivot_dataframe(self, df: pd.DataFrame,
-                        index_cols: List[str]) -> pd.DataFrame:
+    def pivot_dataframe(self,
+                        df: pd.DataFrame,
+                        index_cols: List[str],
+                        dedupe: Optional[str] = None) -> pd.DataFrame:
         """
         Pivot the DataFrame so that each metric becomes a column, filling missing values with NaN.
 
+        The output is the same as `pivot_table` with the mean of duplicate facts: one row per distinct
+        combination of `index_cols`, sorted, and one column per metric, sorted by name. It is built by
+        factorizing the index and metric columns and scattering the values into a preallocated 2-D
+        array, which avoids the generic groupby and unstack.
+
         Args:
             df (pd.DataFrame): The DataFrame containing financial data.
             index_cols (List[str]): A list of column names to use as index in the pivot table.
+            dedupe (str, optional): How duplicate facts of a period and metric are combined, one of
+                DEDUPE_RULES. 'latest_filed' needs a 'filed' column. Defaults to the query's rule.
 
         Returns:
             pd.DataFrame: The pivoted DataFrame.
+
+        Raises:
+            ValueError: If the dedupe rule is not supported or needs a missing column.
         """
-        pivot_df = df.pivot_table(index=index_cols,
-                                  columns='Metric',
-                                  values='val',
-                                  fill_value=np.nan).reset_index()
+        dedupe = dedupe or self.dedupe
+        if dedupe not in DEDUPE_RULES:
+            raise ValueError(
+                f"Unsupported dedupe rule '{dedupe}', expected one of {', '.join(DEDUPE_RULES)}.")
+        if dedupe == 'latest_filed' and 'filed' not in df.columns:
+            raise ValueError("The 'latest_filed' dedupe rule needs a 'filed' column.")
+
+        # Like pivot_table: rows without a key or value take no part
+        complete = df[index_cols + ['Metric', 'val']].notna().all(axis=1)
+        if not complete.all():
+            df = df[complete]
+        if df.empty:
+            pivot_df = df.pivot_table(index=index_cols,
+                                      columns='Metric',
+                                      values='val',
+                                      fill_value=np.nan,
+                                      observed=True).reset_index()
+        else:
+            if dedupe == 'latest_filed':
+                # The last fact of a cell is then the one filed last
+                df = df.sort_values('filed', kind='stable')
+            pivot_df = self._scatter_pivot(df, index_cols,
+                                           'last' if dedupe == 'latest_filed' else dedupe)
         pivot_df.columns.name = None  # Remove MultiIndex
         # Ensure the DataFrame contains all the metrics specified in self.metrics, adding missing ones as NaN
         for metric in self.metrics:
@@ -57,6 +150,45 @@ class FinancialQueryBase:
                 pivot_df[metric] = np.nan
         return pivot_df
 
+    @staticmethod
+    def _scatter_pivot(df: pd.DataFrame, index_cols: List[str],
+                       dedupe: str) -> pd.DataFrame:
+        """
+        Reshape non-empty long data to one row per index and one column per metric.
+
+        Args:
+            df (pd.DataFrame): The data, without missing keys or values.
+            index_cols (List[str]): The columns identifying a row of the output.
+            dedupe (str): 'mean', 'first' or 'last'.
+
+        Returns:
+            pd.DataFrame: The index columns followed by the metric columns.
+        """
+        row_codes, first_rows = _sorted_group_codes(df, index_cols)
+        metric_codes, metric_names = pd.factorize(df['Metric'], sort=True)
+        n_rows, n_metrics = len(first_rows), len(metric_names)
+        cells = row_codes * n_metrics + metric_codes
+        values = df['val'].to_numpy(dtype=np.float64)
+
+        if dedupe == 'mean':
+            sums = np.bincount(cells, weights=values, minlength=n_rows * n_metrics)
+            counts = np.bincount(cells, minlength=n_rows * n_metrics)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                wide = sums / counts  # Empty cells are 0 / 0, i.e. NaN
+        else:
+            if dedupe == 'first':
+                _, picked = np.unique(cells, return_index=True)
+            else:
+                _, picked = np.unique(cells[::-1], return_index=True)
+                picked = len(cells) - 1 - picked
+            wide = np.full(n_rows * n_metrics, np.nan)
+            wide[cells[picked]] = values[picked]
+
+        index_df = df[index_cols].iloc[first_rows].reset_index(drop=True)
+        metric_df = pd.DataFrame(wide.reshape(n_rows, n_metrics),
+                                 columns=list(metric_names))
+        return pd.concat([index_df, metric_df], axis=1)
+
     def convert_to_datetime(self,
                             df: pd.DataFrame,
                             date_columns: List[str] = ['end']) -> pd.DataFrame:
@@ -76,7 +208,8 @@ class FinancialQueryBase:
 
     def scale_financial_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Scale financial metrics from cents to millions.
+        Scale financial metrics from USD to millions of USD, dividing every metric column in one
+        block operation, and record their unit.
 
         Args:
             df (pd.DataFrame): The DataFrame containing financial data.
@@ -84,10 +217,32 @@ class FinancialQueryBase:
         Returns:
             pd.DataFrame: The DataFrame with scaled financial columns.
         """
-        for metric in self.metrics:
-            if metric in df.columns:
-                df[metric] = df[metric].apply(lambda x: x / 1e6
-                                              if pd.notnull(x) else np.nan)
+        metric_columns = [
+            metric for metric in self.metrics if metric in df.columns
+        ]
+        if metric_columns:
+            df[metric_columns] = df[metric_columns].to_numpy(
+                dtype=np.float64) / 1e6
+        return self.record_units(
+            df, dict.fromkeys(metric_columns, Units.USD_MILLIONS))
+
+    @staticmethod
+    def record_units(df: pd.DataFrame,
+                     units: Dict[str, Units]) -> pd.DataFrame:
+        """
+        Record the unit of some columns in `df.attrs['units']`, which Parquet files keep.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing financial data.
+            units (Dict[str, Units]): The unit of each column.
+
+        Returns:
+            pd.DataFrame: The same DataFrame.
+        """
+        recorded = dict(df.attrs.get(UNITS_ATTR, {}))
+        recorded.update(
+            {column: unit.value for column, unit in units.items()})
+        df.attrs[UNITS_ATTR] = recorded
         return df
 
     def rename_columns(self, df: pd.DataFrame,
@@ -103,6 +258,11 @@ class FinancialQueryBase:
             pd.DataFrame: The DataFrame with renamed columns.
         """
         df = df.rename(columns=rename_map)
+        if UNITS_ATTR in df.attrs:
+            df.attrs[UNITS_ATTR] = {
+                rename_map.get(column, column): unit
+                for column, unit in df.attrs[UNITS_ATTR].items()
+            }
         return df
 
     def prepare_data(self,
@@ -149,5 +309,63 @@ class FinancialQueryBase:
         self.validate_data(df, index_cols + ['Metric', 'val'] + date_columns)
         df_final = self.prepare_data(df, index_cols, date_columns)
         df_final = self.add_calculations(df_final)
+        df_final = self.record_units(df_final, {
+            column: unit
+            for column, unit in self.column_units.items()
+            if column in df_final.columns
+        })
         df_final = self.rename_columns(df_final, rename_map)
         return df_final
+
+    def conform_sql_result(self,
+                           df: pd.DataFrame,
+                           rename_map: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Give the result of the query's SQL file the columns, dtypes, order and units of `run_query`.
+
+        The SQL files pivot, average duplicate facts and round the ratios as `run_query` does, but
+        name their columns differently; `sql_columns` maps them back to the columns of
+        `add_calculations`, which are then renamed with `rename_map` as `run_query` renames them.
+
+        Args:
+            df (pd.DataFrame): The result of the query's SQL file.
+            rename_map (Dict[str, str], optional): A dictionary for renaming columns in the final
+                DataFrame. Defaults to the query's `rename_map`.
+
+        Returns:
+            pd.DataFrame: The final DataFrame, as `run_query` returns it.
+
+        Raises:
+            ValueError: If any column of `sql_columns` is missing from the result.
+        """
+        self.validate_data(df, list(self.sql_columns))
+        df = df[list(self.sql_columns)].rename(columns=self.sql_columns)
+        df = apply_fact_dtypes(df)
+        calculation_columns = [
+            column for column in self.sql_columns.values()
+            if column in self.column_units
+        ]
+        index_cols = [
+            column for column in self.sql_columns.values()
+            if column not in self.metrics and column not in calculation_columns
+        ]
+        df[self.metrics + calculation_columns] = df[
+            self.metrics + calculation_columns].astype(np.float64)
+
+        # Like `pivot_dataframe`: the metrics with facts sorted by name, then the missing ones
+        found_metrics = sorted(metric for metric in self.metrics
+                               if df[metric].notna().any())
+        missing_metrics = [
+            metric for metric in self.metrics if metric not in found_metrics
+        ]
+        df = df[index_cols + found_metrics + missing_metrics +
+                calculation_columns].sort_values(index_cols,
+                                                 kind='stable',
+                                                 ignore_index=True)
+
+        df = self.record_units(
+            df, dict.fromkeys(self.metrics, Units.USD_MILLIONS))
+        df = self.record_units(
+            df, {column: self.column_units[column] for column in calculation_columns})
+        return self.rename_columns(
+            df, self.rename_map if rename_map is None else rename_map)
@@ -29,13 +29,15 @@ class ProfitabilityFinancialAnalysis:
     def revenue_distribution_by_quarter(self):
         """Sums up revenues by quarter."""
         if 'REVENUES' in self.df.columns:
-            return self.df.groupby('Quarter')['REVENUES'].sum()
+            return self.df.groupby('Quarter',
+                                   observed=True)['REVENUES'].sum()
         return None
 
     def margin_analysis_by_quarter(self):
         """Analyzes profit margins by quarter."""
         if 'PROFIT_MARGIN' in self.df.columns:
-            return self.df.groupby('Quarter')['PROFIT_MARGIN'].mean()
+            return self.df.groupby('Quarter',
+                                   observed=True)['PROFIT_MARGIN'].mean()
         return None
 
     def calculate_yoy_growth(self, column_name):
@@ -43,7 +45,8 @@ class ProfitabilityFinancialAnalysis:
         if column_name in self.df.columns:
             self.df.sort_values(by=['Year', 'Quarter'], inplace=True)
             self.df[f'{column_name}_YoY_Growth'] = self.df.groupby(
-                ['Quarter'])[column_name].pct_change(periods=4) * 100
+                ['Quarter'],
+                observed=True)[column_name].pct_change(periods=4) * 100
         return self.df
 
     def calculate_operational_expenses(self):
@@ -1,30 +1,62 @@
+import numpy as np
 import pandas as pd
 
 from app.services.functions.managers import LoggingManager
+from app.services.utils import apply_fact_dtypes
 
 from .base_tables import ASSET_LIABILITIES, CASH_FLOW, LIQUIDITY, PROFITABILITY
+from .sql_engine import LocalSQLEngine
 from .sql_tables import SQL_QUERY_FILES
 
+# Columns of the preprocessed data read by the local queries.
+LOCAL_QUERY_COLUMNS = [
+    'EntityName', 'CIK', 'end', 'year', 'quarter', 'Metric', 'val'
+]
+
+# Engines of the local queries: the pandas query classes of `base_tables`, or the SQL files of
+# `sql_tables` run by LocalSQLEngine. Both return the columns of the query classes.
+LOCAL_ENGINES = ('pandas', 'sql')
+
+# Query classes of the queries that run locally, by query name.
+LOCAL_QUERY_CLASSES = {
+    'Assets Liabilities': ASSET_LIABILITIES,
+    'Cash Flow': CASH_FLOW,
+    'Liquidity': LIQUIDITY,
+    'Profitability': PROFITABILITY
+}
+
 
 class QueryExecutor:
     """
     Args:
             snowflake_manager: Snowflake manager for executing queries in Snowflake.
             data_storage_manager: Data storage manager for executing queries locally.
+            local_engine (str, optional): Engine of the local queries, one of LOCAL_ENGINES. 'sql' runs
+                the same SQL files as Snowflake on the local data and returns the same DataFrames as
+                'pandas'. Defaults to 'pandas'.
     """
 
-    def __init__(self, snowflake_manager, data_storage_manager):
+    def __init__(self,
+                 snowflake_manager,
+                 data_storage_manager,
+                 local_engine='pandas'):
+        if local_engine not in LOCAL_ENGINES:
+            raise ValueError(
+                f"Unsupported local engine '{local_engine}', expected one of {', '.join(LOCAL_ENGINES)}.")
         self.snowflake_manager = snowflake_manager
         self.data_storage_manager = data_storage_manager
+        self.local_engine = local_engine
         self.error_handler = LoggingManager()
 
-    def execute_query(self, query_names, use_snowflake) -> dict:
+    def execute_query(self, query_names, use_snowflake, frames=None) -> dict:
         """
         Executes one or more queries, either locally or in Snowflake.
 
         Args:
             query_names (str or list of str): Name or names of the queries to execute.
             use_snowflake (bool): Flag indicating whether to execute queries in Snowflake.
+            frames (dict, optional): Preprocessed DataFrames by query name. Local queries found here run
+                on the given DataFrame instead of the latest stored file. Defaults to None.
 
         Returns:
             dict: A dictionary where keys are query names, and values are query results.
@@ -48,10 +80,99 @@ class QueryExecutor:
             if use_snowflake:
                 results[query_name] = self._execute_query_snowflake(query_name)
             else:
-                results[query_name] = self._execute_query_locally(query_name)
+                results[query_name] = self._execute_query_locally(
+                    query_name, (frames or {}).get(query_name))
+
+        return results
+
+    def execute_query_batch(self, query_names, frames_by_cik) -> dict:
+        """
+        Executes local queries once over the preprocessed data of many companies.
+
+        The DataFrames of all companies are concatenated, so each query pivots and computes its ratios
+        in a single pass whatever the number of companies, and the result is then split per company.
+
+        Args:
+            query_names (str or list of str): Name or names of the queries to execute.
+            frames_by_cik (dict): Maps each CIK number to its preprocessed DataFrames by query name, as
+                returned by `DataPreprocessor.preprocess_data`.
+
+        Returns:
+            dict: Maps each CIK number to its query results by query name, as `execute_query` returns
+            them. A company only gets the results of the queries it has a DataFrame for.
+
+        Example:
+            >>> results = query_executor.execute_query_batch('Liquidity', {'0000012927': frames})
+            >>> results['0000012927']['Liquidity']
+        """
+        if isinstance(query_names, str):
+            query_names = [query_names]
+
+        results = {cik_number: {} for cik_number in frames_by_cik}
+        for query_name in query_names:
+            cik_numbers = [
+                cik_number for cik_number, frames in frames_by_cik.items()
+                if frames.get(query_name) is not None
+            ]
+            if not cik_numbers:
+                continue
+            # Categories differ between companies, so the concatenated columns are categorized again
+            df = apply_fact_dtypes(
+                pd.concat([
+                    frames_by_cik[cik_number][query_name]
+                    for cik_number in cik_numbers
+                ], ignore_index=True)[LOCAL_QUERY_COLUMNS])
+            result = self._run_local_query(df, query_name)
+            if result is None:
+                continue
+            for cik_number, partition in self._partition_by_cik(
+                    result, cik_numbers).items():
+                results[cik_number][query_name] = partition
 
         return results
 
+    @staticmethod
+    def _partition_by_cik(df, cik_numbers) -> dict:
+        """
+        Splits the result of a query over many companies into one DataFrame per company.
+
+        Args:
+            df (pd.DataFrame): The query result, with a 'CIK' column.
+            cik_numbers (list of str): CIK numbers of the companies in the result.
+
+        Returns:
+            dict: Maps each CIK number to its rows, in their order in `df`, with the attributes of `df`.
+        """
+        attrs = df.attrs
+        codes, uniques = pd.factorize(df['CIK'])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.concatenate(
+            ([0], np.cumsum(np.bincount(codes, minlength=len(uniques)))))
+        rows = dict(zip(uniques, zip(bounds[:-1], bounds[1:])))
+        # pandas copies the attributes into every derived DataFrame, so they are only set at the end
+        sorted_df = df.iloc[order].reset_index(drop=True)
+        sorted_df.attrs = {}
+        # Like the company names, whose categories are only the company's own in a query of the
+        # company alone; ordered categories such as the quarters are kept whole
+        shrunk_columns = [
+            column for column, dtype in sorted_df.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered
+        ]
+
+        partitions = {}
+        for cik_number in cik_numbers:
+            start, stop = rows.get(int(cik_number), (0, 0))
+            partition = sorted_df.iloc[start:stop].reset_index(drop=True)
+            for column in shrunk_columns:
+                partition[column] = partition[
+                    column].cat.remove_unused_categories()
+            partition.attrs = {
+                key: dict(value) if isinstance(value, dict) else value
+                for key, value in attrs.items()
+            }
+            partitions[cik_number] = partition
+        return partitions
+
     def _execute_query_snowflake(self, query_name) -> pd.DataFrame:
         """
         Executes a query in Snowflake.
@@ -74,12 +195,14 @@ class QueryExecutor:
                                    "ERROR")
             return None
 
-    def _execute_query_locally(self, query_name) -> pd.DataFrame:
+    def _execute_query_locally(self, query_name, df=None) -> pd.DataFrame:
         """
         Executes a query locally.
 
         Args:
             query_name (str): Name of the query.
+            df (pd.DataFrame, optional): The preprocessed data, already in memory. Defaults to reading
+                the latest stored file.
 
         Returns:
             pd.DataFrame: Result of the query as a DataFrame.
@@ -87,6 +210,8 @@ class QueryExecutor:
         Raises:
             ValueError: If no processed data file is found for the query.
         """
+        if df is not None:
+            return self._run_local_query(df[LOCAL_QUERY_COLUMNS], query_name)
         file_path = self.data_storage_manager.get_latest_file_path(
             query_name, 'preprocessed_data')
         if not file_path:
@@ -94,13 +219,45 @@ class QueryExecutor:
                 f"No processed data file found for query {query_name}.",
                 "ERROR")
             return None
-        df = pd.read_csv(file_path)
+        df = self.data_storage_manager.load_data(file_path,
+                                                 columns=LOCAL_QUERY_COLUMNS)
 
         return self._run_local_query(df, query_name)
 
+    def _run_local_sql(self, df, query_name) -> pd.DataFrame:
+        """
+        Runs the SQL file of a query on local data.
+
+        The result is mapped onto the columns of the pandas query class of the same name, so both
+        engines return the same DataFrame.
+
+        Args:
+            df (pd.DataFrame): The preprocessed data.
+            query_name (str): Name of the query.
+
+        Returns:
+            pd.DataFrame: Result of the query as a DataFrame.
+        """
+        query_filename = SQL_QUERY_FILES.get(query_name)
+        if not query_filename or query_name not in LOCAL_QUERY_CLASSES:
+            self.error_handler.log(
+                f"Query name '{query_name}' not implemented for local execution.",
+                "ERROR")
+            return None
+        engine = LocalSQLEngine()
+        try:
+            engine.upload_data(df)
+            result = engine.execute_query_from_file(query_filename)
+        finally:
+            engine.close_connection()
+        if result.empty and not len(result.columns):
+            # The engine logged the error
+            return None
+        return LOCAL_QUERY_CLASSES[query_name]().conform_sql_result(result)
+
     def _run_local_query(self, df, query_name) -> pd.DataFrame:
         """
-        Runs a local query based on the query name.
+        Runs a local query based on the query name, with the local engine of the executor.
 
         Args:
             df (pd.DataFrame): DataFrame containing the data.
@@ -112,14 +269,10 @@ class QueryExecutor:
         Raises:
             ValueError: If the provided `query_name` is not implemented for local execution.
         """
-        query_classes = {
-            'Assets Liabilities': ASSET_LIABILITIES,
-            'Cash Flow': CASH_FLOW,
-            'Liquidity': LIQUIDITY,
-            'Profitability': PROFITABILITY
-        }
-        if query_name in query_classes:
-            query_class = query_classes[query_name]()
+        if self.local_engine == 'sql':
+            return self._run_local_sql(df, query_name)
+        if query_name in LOCAL_QUERY_CLASSES:
+            query_class = LOCAL_QUERY_CLASSES[query_name]()
             return query_class.run_query(df)
         else:
             self.error_handler.log(
@@ -0,0 +1,179 @@
+import re
+import sqlite3
+
+import pandas as pd
+
+from app.services.functions.managers import LoggingManager
+from app.services.types import DEFAULT_TABLE_NAME
+
+# Columns of the Snowflake facts table the SQL files query, by the name of the preprocessed column
+# they are loaded from.
+FACT_TABLE_COLUMNS = {
+    'EntityName': 'EntityName',
+    'CIK': 'CIK',
+    'Metric': 'Metric',
+    'end': 'End',
+    'val': 'Value',
+    'accn': 'accn',
+    'fy': 'fy',
+    'fp': 'fp',
+    'form': 'form',
+    'filed': 'filed',
+    'frame': 'frame',
+    'start': 'start',
+}
+
+# Snowflake syntax that SQLite spells differently, rewritten before a query runs
+SNOWFLAKE_REWRITES = [
+    # CAST(x AS DATE) -> DATE(x); dates are stored as ISO 8601 text
+    (re.compile(r'CAST\(\s*([^()]+?)\s+AS\s+DATE\s*\)', re.IGNORECASE),
+     r'DATE(\1)'),
+    (re.compile(r'EXTRACT\(\s*YEAR\s+FROM\s+([^()]+?)\s*\)', re.IGNORECASE),
+     r"CAST(STRFTIME('%Y', \1) AS INTEGER)"),
+    (re.compile(r'EXTRACT\(\s*MONTH\s+FROM\s+([^()]+?)\s*\)', re.IGNORECASE),
+     r"CAST(STRFTIME('%m', \1) AS INTEGER)"),
+    (re.compile(r'EXTRACT\(\s*DAY\s+FROM\s+([^()]+?)\s*\)', re.IGNORECASE),
+     r"CAST(STRFTIME('%d', \1) AS INTEGER)"),
+    (re.compile(r'EXTRACT\(\s*QUARTER\s+FROM\s+([^()]+?)\s*\)', re.IGNORECASE),
+     r"((CAST(STRFTIME('%m', \1) AS INTEGER) + 2) / 3)"),
+]
+
+
+def _concat(*values):
+    # Snowflake's CONCAT is NULL if any argument is; integers print without a decimal point
+    if any(value is None for value in values):
+        return None
+    return ''.join(
+        str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+        for value in values)
+
+
+def _div0(dividend, divisor):
+    if dividend is None or divisor is None:
+        return None
+    return dividend / divisor if divisor else 0
+
+
+def _iff(condition, true_value, false_value):
+    return true_value if condition else false_value
+
+
+# Snowflake functions SQLite does not have, as (name, number of arguments, implementation);
+# -1 accepts any number of arguments.
+SNOWFLAKE_FUNCTIONS = [
+    ('CONCAT', -1, _concat),
+    ('DIV0', 2, _div0),
+    ('IFF', 3, _iff),
+    ('NVL', 2, lambda value, default: default if value is None else value),
+]
+
+
+def translate_snowflake_sql(query: str) -> str:
+    """
+    Rewrite the Snowflake syntax of a query that SQLite does not understand.
+
+    Args:
+        query (str): The Snowflake SQL query.
+
+    Returns:
+        str: The query for SQLite.
+    """
+    for pattern, replacement in SNOWFLAKE_REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+class LocalSQLEngine:
+    """
+    Runs the Snowflake SQL files of `sql_tables` on local data, in an in-memory SQLite database.
+
+    It offers the methods of SnowflakeDataManager that QueryExecutor uses, so both run the same
+    queries: preprocessed data is loaded into the facts table with `upload_data`, and queried with
+    `execute_query_from_file` or `get_data`.
+
+    Args:
+        table_name (str, optional): Name of the facts table the SQL files query. Defaults to
+            DEFAULT_TABLE_NAME.
+
+    Example:
+        >>> engine = LocalSQLEngine()
+        >>> engine.upload_data(preprocessed_df)
+        >>> engine.execute_query_from_file(SQL_QUERY_FILES['Liquidity'])
+    """
+
+    def __init__(self, table_name: str = DEFAULT_TABLE_NAME):
+        self.table_name = table_name
+        self.error_handler = LoggingManager()
+        self.connection = sqlite3.connect(':memory:', check_same_thread=False)
+        for name, num_params, function in SNOWFLAKE_FUNCTIONS:
+            self.connection.create_function(name,
+                                            num_params,
+                                            function,
+                                            deterministic=True)
+
+    def upload_data(self, data: pd.DataFrame, table_name: str = None):
+        """
+        Load preprocessed data into a table, replacing its content, with the columns of the Snowflake
+        facts table.
+
+        The preprocessed files keep the year and quarter parsed from the frame rather than the frame
+        itself, so a missing `frame` is rebuilt from them (e.g. 'CY2021Q4' or 'CY2021' for a full year).
+
+        Args:
+            data (pd.DataFrame): The preprocessed data.
+            table_name (str, optional): Name of the table. Defaults to the facts table.
+        """
+        table_name = table_name or self.table_name
+        table = pd.DataFrame(index=data.index)
+        for column, table_column in FACT_TABLE_COLUMNS.items():
+            if column in data.columns:
+                values = data[column]
+                if pd.api.types.is_datetime64_any_dtype(values):
+                    values = values.dt.strftime('%Y-%m-%d')
+                elif isinstance(values.dtype, pd.CategoricalDtype):
+                    values = values.astype(object)
+                table[table_column] = values
+            else:
+                table[table_column] = None
+        if 'frame' not in data.columns and {'year', 'quarter'} <= set(data.columns):
+            table['frame'] = ('CY' + data['year'].astype(str) +
+                              data['quarter'].astype(str).replace('FY', ''))
+        table.to_sql(table_name, self.connection, if_exists='replace', index=False)
+
+    def get_data(self, query: str) -> pd.DataFrame:
+        """
+        Execute a Snowflake SQL query on the local data.
+
+        Args:
+            query (str): The SQL query to execute.
+
+        Returns:
+            pd.DataFrame: The results of the query, empty on error.
+        """
+        try:
+            return pd.read_sql_query(translate_snowflake_sql(query),
+                                     self.connection)
+        except Exception as e:
+            self.error_handler.log(f"Error executing query locally: {e}",
+                                   "ERROR")
+            return pd.DataFrame()
+
+    def execute_query_from_file(self, query_filename: str) -> pd.DataFrame:
+        """
+        Execute a SQL query from a file on the local data.
+
+        Args:
+            query_filename (str): The path to the SQL file containing the query.
+
+        Returns:
+            pd.DataFrame: The results of the query.
+        """
+        with open(query_filename, 'r') as file:
+            query = file.read()
+        return self.get_data(query)
+
+    def close_connection(self):
+        """
+        Closes the in-memory database.
+        """
+        self.connection.close()
@@ -16,9 +16,11 @@ WITH preprocessed_data AS (
         SUBSTRING(frame, 7, 2) AS quarter -- Extract quarter
     FROM test_table
     WHERE frame IS NOT NULL AND frame LIKE 'CY____Q_%'
+      AND Metric IN ('AssetsCurrent', 'LiabilitiesCurrent', 'StockholdersEquity')
+      AND value IS NOT NULL
 ),
 
--- Step 2: Pivot the table
+-- Step 2: Pivot the table, averaging duplicate facts
 pivoted_data AS (
     SELECT
         EntityName,
@@ -26,9 +28,9 @@ pivoted_data AS (
         end_date,
         year,
         quarter,
-        MAX(CASE WHEN Metric = 'AssetsCurrent' THEN value ELSE NULL END) AS Assets,
-        MAX(CASE WHEN Metric = 'Liabilities' THEN value ELSE NULL END) AS Liabilities,
-        MAX(CASE WHEN Metric = 'StockholdersEquity' THEN value ELSE NULL END) AS StockholdersEquity
+        AVG(CASE WHEN Metric = 'AssetsCurrent' THEN value ELSE NULL END) AS Assets,
+        AVG(CASE WHEN Metric = 'LiabilitiesCurrent' THEN value ELSE NULL END) AS Liabilities,
+        AVG(CASE WHEN Metric = 'StockholdersEquity' THEN value ELSE NULL END) AS StockholdersEquity
     FROM preprocessed_data
     GROUP BY EntityName, CIK, end_date, year, quarter
 )
@@ -42,13 +44,14 @@ SELECT
     Liabilities / 1000000 AS Liabilities_Million,
     StockholdersEquity / 1000000 AS StockholdersEquity_Million,
     CASE
-        WHEN Assets IS NOT NULL AND Liabilities IS NOT NULL AND Liabilities != 0 THEN Assets / Liabilities
+        WHEN Assets IS NOT NULL AND Liabilities IS NOT NULL AND Liabilities != 0 THEN ROUND(Assets / Liabilities, 1)
         ELSE NULL
     END AS AssetToLiabilityRatio,
     CASE
-        WHEN Liabilities IS NOT NULL AND StockholdersEquity IS NOT NULL AND StockholdersEquity != 0 THEN Liabilities / StockholdersEquity
+        WHEN Liabilities IS NOT NULL AND StockholdersEquity IS NOT NULL AND StockholdersEquity != 0 THEN ROUND(Liabilities / StockholdersEquity, 1)
         ELSE NULL
     END AS DebtToEquityRatio,
     year,
     quarter
-FROM pivoted_data;
+FROM pivoted_data
+ORDER BY EntityName, CIK, end_date, year, quarter;
@@ -1,21 +1,46 @@
-SELECT 
+-- Step 1: Preprocessing
+WITH preprocessed_data AS (
+    SELECT
+        EntityName,
+        CIK,
+        Metric,
+        CAST(end AS DATE) AS end_date,
+        value,
+        SUBSTRING(frame, 3, 4) AS year,   -- Extract year
+        CASE
+            WHEN frame LIKE 'CY____Q_' THEN SUBSTRING(frame, 7, 2) -- Quarter of a quarterly frame
+            ELSE 'FY'                                               -- Full year
+        END AS quarter
+    FROM test_table
+    WHERE frame IS NOT NULL
+      AND Metric IN ('NetCashProvidedByUsedInOperatingActivities', 'NetCashProvidedByUsedInInvestingActivities', 'NetCashProvidedByUsedInFinancingActivities')
+      AND value IS NOT NULL
+),
+
+-- Step 2: Pivot the table, averaging duplicate facts
+pivoted_data AS (
+    SELECT
+        EntityName,
+        CIK,
+        end_date,
+        year,
+        quarter,
+        AVG(CASE WHEN Metric = 'NetCashProvidedByUsedInOperatingActivities' THEN value ELSE NULL END) AS Operating,
+        AVG(CASE WHEN Metric = 'NetCashProvidedByUsedInInvestingActivities' THEN value ELSE NULL END) AS Investing,
+        AVG(CASE WHEN Metric = 'NetCashProvidedByUsedInFinancingActivities' THEN value ELSE NULL END) AS Financing
+    FROM preprocessed_data
+    GROUP BY EntityName, CIK, end_date, year, quarter
+)
+
+-- Step 3: Scale to millions
+SELECT
     EntityName AS Entity,
     CIK,
-    End AS Date,
-    ROUND(SUM(CASE WHEN Metric = 'NetCashProvidedByUsedInOperatingActivities' THEN Value ELSE NULL END) / 1000000, 2) AS CashFlow_Operating,
-    ROUND(SUM(CASE WHEN Metric = 'NetCashProvidedByUsedInInvestingActivities' THEN Value ELSE NULL END) / 1000000, 2) AS CashFlow_Investing,
-    ROUND(SUM(CASE WHEN Metric = 'NetCashProvidedByUsedInFinancingActivities' THEN Value ELSE NULL END) / 1000000, 2) AS CashFlow_Financing,
-    CASE
-        WHEN EXTRACT(MONTH FROM End) IN (1, 2, 3) THEN CONCAT('Q1-', EXTRACT(YEAR FROM End))
-        WHEN EXTRACT(MONTH FROM End) IN (4, 5, 6) THEN CONCAT('Q2-', EXTRACT(YEAR FROM End))
-        WHEN EXTRACT(MONTH FROM End) IN (7, 8, 9) THEN CONCAT('Q3-', EXTRACT(YEAR FROM End))
-        ELSE CONCAT('Q4-', EXTRACT(YEAR FROM End))
-    END AS Quarter
-FROM 
-    test_table
-WHERE 
-    Metric IN ('NetCashProvidedByUsedInOperatingActivities', 'NetCashProvidedByUsedInInvestingActivities', 'NetCashProvidedByUsedInFinancingActivities')
-GROUP BY 
-    EntityName, CIK, End
-ORDER BY 
-    EntityName, CIK, End;
+    end_date AS Date,
+    Operating / 1000000 AS CashFlow_Operating,
+    Investing / 1000000 AS CashFlow_Investing,
+    Financing / 1000000 AS CashFlow_Financing,
+    year AS Year,
+    quarter AS Quarter
+FROM pivoted_data
+ORDER BY EntityName, CIK, end_date, year, quarter;
@@ -11,9 +11,10 @@ WITH preprocessed_data AS (
     FROM test_table
     WHERE frame IS NOT NULL AND frame LIKE 'CY____Q_%'
       AND Metric IN ('AssetsCurrent', 'LiabilitiesCurrent')
+      AND value IS NOT NULL
 ),
 
--- Step 2: Pivot the table
+-- Step 2: Pivot the table, averaging duplicate facts
 pivoted_data AS (
     SELECT
         EntityName,
@@ -21,8 +22,8 @@ pivoted_data AS (
         end_date,
         year,
         quarter,
-        MAX(CASE WHEN Metric = 'AssetsCurrent' THEN value ELSE NULL END) AS CurrentAssets,
-        MAX(CASE WHEN Metric = 'LiabilitiesCurrent' THEN value ELSE NULL END) AS CurrentLiabilities
+        AVG(CASE WHEN Metric = 'AssetsCurrent' THEN value ELSE NULL END) AS CurrentAssets,
+        AVG(CASE WHEN Metric = 'LiabilitiesCurrent' THEN value ELSE NULL END) AS CurrentLiabilities
     FROM preprocessed_data
     GROUP BY EntityName, CIK, end_date, year, quarter
 )
@@ -35,9 +36,10 @@ SELECT
     CurrentAssets / 1000000 AS CurrentAssets_Million,
     CurrentLiabilities / 1000000 AS CurrentLiabilities_Million,
     CASE
-        WHEN CurrentLiabilities > 0 THEN CurrentAssets / CurrentLiabilities
+        WHEN CurrentLiabilities > 0 THEN ROUND(CurrentAssets / CurrentLiabilities, 2)
         ELSE NULL
     END AS CurrentRatio,
     year AS Year,
     quarter AS Quarter
-FROM pivoted_data;
+FROM pivoted_data
+ORDER BY EntityName, CIK, end_date, year, quarter;
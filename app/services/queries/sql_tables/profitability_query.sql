@@ -16,9 +16,11 @@ WITH preprocessed_data AS (
         SUBSTRING(frame, 7, 2) AS quarter -- Extract quarter
     FROM test_table
     WHERE frame IS NOT NULL AND frame LIKE 'CY____Q_%'
+      AND Metric IN ('NetIncomeLoss', 'RevenueFromContractWithCustomerExcludingAssessedTax', 'OperatingIncomeLoss')
+      AND value IS NOT NULL
 ),
 
--- Step 2: Pivot the table
+-- Step 2: Pivot the table, averaging duplicate facts
 pivoted_data AS (
     SELECT
         EntityName,
@@ -26,9 +28,9 @@ pivoted_data AS (
         end_date,
         year,
         quarter,
-        MAX(CASE WHEN Metric = 'NetIncomeLoss' THEN value ELSE NULL END) AS NetIncomeLoss,
-        MAX(CASE WHEN Metric = 'Revenues' THEN value ELSE NULL END) AS Revenues,
-        MAX(CASE WHEN Metric = 'OperatingIncomeLoss' THEN value ELSE NULL END) AS OperatingIncomeLoss
+        AVG(CASE WHEN Metric = 'NetIncomeLoss' THEN value ELSE NULL END) AS NetIncomeLoss,
+        AVG(CASE WHEN Metric = 'RevenueFromContractWithCustomerExcludingAssessedTax' THEN value ELSE NULL END) AS Revenues,
+        AVG(CASE WHEN Metric = 'OperatingIncomeLoss' THEN value ELSE NULL END) AS OperatingIncomeLoss
     FROM preprocessed_data
     GROUP BY EntityName, CIK, end_date, year, quarter
 )
@@ -42,9 +44,10 @@ SELECT
     Revenues / 1000000 AS Revenues_Million,
     OperatingIncomeLoss / 1000000 AS OperatingIncomeLoss_Million,
     CASE
-        WHEN NetIncomeLoss IS NOT NULL AND Revenues IS NOT NULL AND Revenues != 0 THEN (NetIncomeLoss / Revenues) * 100
+        WHEN NetIncomeLoss IS NOT NULL AND Revenues IS NOT NULL AND Revenues != 0 THEN ROUND((NetIncomeLoss / Revenues) * 100, 2)
         ELSE NULL
     END AS ProfitMarginPercent,
     year AS Year,
     quarter AS Quarter
-FROM pivoted_data;
+FROM pivoted_data
+ORDER BY EntityName, CIK, end_date, year, quarter;
@@ -1,12 +1,16 @@
+import asyncio
+
 from .configs import SnowflakeConfig
-from .functions import (DataPreprocessor, DataProcessor, DataStorageManager,
-                        JSONDataTransformer, LoggingManager, SECAPIClient,
-                        SnowflakeDataManager, TransformerManager)
+from .functions import (AsyncSECAPIClient, DataPreprocessor, DataProcessor,
+                        DataStorageManager, JSONDataTransformer,
+                        LoggingManager, SECAPIClient, SnowflakeDataManager,
+                        TransformerManager)
 from .queries import QueryExecutor
 from .types import (ANNUAL_METRICS, ASSET_LIABILITIES_METRICS,
-                    CASH_FLOW_METRICS, LIQUIDITY_METRICS,
-                    PROFITABILITY_METRICS, QUARTERLY_METRICS)
-from .utils import FileVersionManager
+                    CASH_FLOW_METRICS, HTTP_CACHE_PATH, LIQUIDITY_METRICS,
+                    PIPELINE_METRICS, PROFITABILITY_METRICS,
+                    QUARTERLY_METRICS)
+from .utils import FileVersionManager, FilingWatermark
 
 
 class SECDataFetcher:
@@ -18,6 +22,7 @@ class SECDataFetcher:
 
     Methods:
         fetch_company_data(cik_number): Fetch data for a company using its CIK number.
+        fetch_company_data_many(cik_numbers): Fetch data for many companies concurrently.
 
     Example:
         >>> sec_client = SECAPIClient()
@@ -29,12 +34,15 @@ class SECDataFetcher:
     def __init__(self, sec_client: SECAPIClient):
         self.sec_client = sec_client
 
-    def fetch_company_data(self, cik_number: str) -> dict:
+    def fetch_company_data(self,
+                           cik_number: str,
+                           metrics: list = None) -> dict:
         """
         Fetch data for a company using its CIK number.
 
         Args:
             cik_number (str): The Central Index Key (CIK) of the company.
+            metrics (list of str, optional): us-gaap concepts to keep. Defaults to all concepts.
 
         Returns:
             dict: The fetched data or an error message.
@@ -46,7 +54,8 @@ class SECDataFetcher:
             >>> print(company_data)
         """
         try:
-            company_facts = self.sec_client.fetch_company_facts(cik_number)
+            company_facts = self.sec_client.fetch_company_facts(
+                cik_number, metrics=metrics)
             if 'error' in company_facts:
                 return {
                     'error':
@@ -56,6 +65,54 @@ class SECDataFetcher:
         except Exception as e:
             return {'error': str(e)}
 
+    def fetch_company_data_many(self,
+                                cik_numbers: list,
+                                max_concurrency: int = 8,
+                                metrics: list = None) -> dict:
+        """
+        Fetch data for many companies concurrently, within the SEC rate limit.
+
+        Args:
+            cik_numbers (list of str): The Central Index Keys (CIK) of the companies.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 8.
+            metrics (list of str, optional): us-gaap concepts to keep. Defaults to all concepts.
+
+        Returns:
+            dict: Maps each CIK number to its fetched data or an error message.
+
+        Example:
+            >>> data_fetcher = SECDataFetcher(SECAPIClient())
+            >>> universe_data = data_fetcher.fetch_company_data_many(['0000012927', '0000320193'])
+        """
+        if isinstance(self.sec_client, AsyncSECAPIClient):
+            async_client = self.sec_client
+        else:
+            async_client = AsyncSECAPIClient(
+                self.sec_client.base_url,
+                self.sec_client.session.headers['User-Agent'],
+                max_concurrency=max_concurrency,
+                rate_limiter=self.sec_client.rate_limiter,
+                use_http_cache=self.sec_client.http_cache is not None,
+                http_cache_path=self.sec_client.http_cache.path
+                if self.sec_client.http_cache else HTTP_CACHE_PATH,
+                retry_policy=self.sec_client.retry_policy,
+                circuit_breaker=self.sec_client.circuit_breaker)
+            async_client.request_metrics = self.sec_client.request_metrics
+        try:
+            company_facts = asyncio.run(
+                async_client.fetch_company_facts_many(cik_numbers, metrics))
+        except Exception as e:
+            return {cik_number: {'error': str(e)} for cik_number in cik_numbers}
+        finally:
+            if async_client is not self.sec_client:
+                async_client.close()
+        return {
+            cik_number:
+            {'error': f"Error fetching data for CIK {cik_number}: {data['error']}"}
+            if isinstance(data, dict) else data
+            for cik_number, data in company_facts.items()
+        }
+
 
 class DataPipelineIntegration:
     """
@@ -70,6 +127,7 @@ class DataPipelineIntegration:
         fetch_data: Fetches data from the SEC API using a CIK number.
         preprocess_data: Preprocesses raw data fetched from the SEC API.
         process_and_store_data: Processes preprocessed data and stores or uploads results.
+        store_query_results: Stores processed data computed by a batched query over many companies.
         transform_and_store_json: Transforms data into JSON format and stores it.
 
     Example:
@@ -86,7 +144,11 @@ class DataPipelineIntegration:
                  cik_number: str = None,
                  use_snowflake: bool = True,
                  snowflake_config: SnowflakeConfig = None,
-                 local_storage_dir: str = 'data'):
+                 local_storage_dir: str = 'data',
+                 sec_client: SECAPIClient = None,
+                 storage_format: str = 'parquet',
+                 in_memory_handoff: bool = True,
+                 local_engine: str = 'pandas'):
         """
         Initializes the DataPipelineIntegration with necessary configurations and clients.
 
@@ -95,9 +157,20 @@ class DataPipelineIntegration:
             use_snowflake (bool): Flag to indicate whether to use Snowflake for storage.
             snowflake_config (SnowflakeConfig): Configuration for Snowflake connection.
             local_storage_dir (str): Directory path for local data storage.
+            sec_client (SECAPIClient, optional): Client shared across pipelines so batch runs reuse its
+                pooled connections. A new client is created if not provided.
+            storage_format (str, optional): File format of locally stored DataFrames, 'parquet' or 'csv'.
+                Defaults to 'parquet'.
+            in_memory_handoff (bool, optional): Run the local queries on the DataFrames kept from
+                `preprocess_data` instead of reading them back from disk, and store those DataFrames on
+                a background thread meanwhile. Defaults to True.
+            local_engine (str, optional): Engine of the local queries, 'pandas' for the query classes
+                or 'sql' for the Snowflake SQL files run on SQLite. Both give the same results.
+                Defaults to 'pandas'.
         Other attributes:
             data_storage_manager (DataStorageManager): Manages data storage operations.
             document (FileVersionManager): Manages file versioning and indexing.
+            watermark (FilingWatermark): Latest filing the local data was built from, per CIK.
             error_handler (LoggingManager): Handles logging of errors and information.
             sec_client (SECAPIClient): Client for fetching data from SEC API.
             transformer_manager (TransformerManager): Manages data transformation processes.
@@ -106,16 +179,22 @@ class DataPipelineIntegration:
             data_preprocessor (DataPreprocessor): Processes raw SEC data.
             data_processor (DataProcessor): Processes preprocessed data and stores results.
             json_data_transformer (JSONDataTransformer): Transforms and stores data in JSON format.
+            preprocessed_frames (dict): Preprocessed DataFrames by category from the last `preprocess_data`
+                call, when handed off in memory.
         """
         # Initialization
         self.cik_number = cik_number
         self.data_storage_manager = DataStorageManager(local_storage_dir,
-                                                       cik_number)
+                                                       cik_number,
+                                                       storage_format)
         self.document = FileVersionManager(base_dir=local_storage_dir)
+        self.watermark = FilingWatermark(base_dir=local_storage_dir)
         self.error_handler = LoggingManager()
-        self.sec_client = SECAPIClient()
+        self.sec_client = sec_client if sec_client else SECAPIClient()
         self.sec_data_fetcher = SECDataFetcher(self.sec_client)
         self.transformer_manager = TransformerManager()
+        self.in_memory_handoff = in_memory_handoff
+        self.preprocessed_frames = None
 
         # Initialize processor attributes
         self.data_preprocessor = None
@@ -134,7 +213,8 @@ class DataPipelineIntegration:
                 self.snowflake_config)
         self.query_executor = QueryExecutor(
             self.snowflake_manager if self.use_snowflake else None,
-            self.data_storage_manager)
+            self.data_storage_manager,
+            local_engine=local_engine)
 
     def _init_metrics(self):
         self.metrics = {
@@ -163,7 +243,47 @@ class DataPipelineIntegration:
         if not cik:
             self.error_handler.log("CIK number is not provided.", "ERROR")
             return {"error": "CIK number is required"}
-        return self.sec_data_fetcher.fetch_company_data(cik)
+        return self.sec_data_fetcher.fetch_company_data(
+            cik, metrics=PIPELINE_METRICS)
+
+    def check_for_new_filings(self, cik_number=None) -> dict:
+        """
+        Compares the latest financial filing in the company's submissions with its stored watermark.
+
+        Args:
+            cik_number (str, optional): CIK number to check. If None, uses the CIK number provided during
+            initialization.
+
+        Returns:
+            dict: `changed` (bool) and the latest `filing` (dict or None), or error information.
+        """
+        cik = cik_number if cik_number else self.cik_number
+        if not cik:
+            self.error_handler.log("CIK number is not provided.", "ERROR")
+            return {"error": "CIK number is required"}
+        submissions = self.sec_client.fetch_submissions(cik)
+        if isinstance(submissions, dict):
+            return {
+                'error':
+                f"Error fetching submissions for CIK {cik}: {submissions.get('error')}"
+            }
+        latest_filing = FilingWatermark.latest_filing(submissions)
+        changed = latest_filing is not None and not self.watermark.is_current(
+            cik, latest_filing)
+        return {'changed': changed, 'filing': latest_filing}
+
+    def update_watermark(self, filing: dict, cik_number=None):
+        """
+        Records the filing the local data of the company was just built from.
+
+        Args:
+            filing (dict): The filing returned by `check_for_new_filings`.
+            cik_number (str, optional): CIK number of the company. If None, uses the CIK number provided
+            during initialization.
+        """
+        cik = cik_number if cik_number else self.cik_number
+        if filing:
+            self.watermark.set(cik, filing)
 
     def preprocess_data(self, raw_data: dict) -> dict:
         """
@@ -184,16 +304,23 @@ class DataPipelineIntegration:
         """
         self.data_preprocessor = DataPreprocessor(
             self.data_storage_manager, self.document, self.error_handler,
-            self.snowflake_manager if self.use_snowflake else None)
-        return self.data_preprocessor.preprocess_data(raw_data,
-                                                      self.category_metric_map,
-                                                      self.use_snowflake,
-                                                      self.cik_number)
+            self.snowflake_manager if self.use_snowflake else None,
+            persist_in_background=self.in_memory_handoff)
+        preprocessed_data = self.data_preprocessor.preprocess_data(
+            raw_data, self.category_metric_map, self.use_snowflake,
+            self.cik_number)
+        self.preprocessed_frames = preprocessed_data if (
+            self.in_memory_handoff and 'error' not in preprocessed_data) else None
+        return preprocessed_data
 
     def process_and_store_data(self, specific_queries: dict = None) -> dict:
         """
         Processes preprocessed data and stores or uploads results.
 
+        With the in-memory hand-off, the queries run on the DataFrames kept by `preprocess_data`, and
+        this method returns once their background writes are done too, so every preprocessed and
+        processed file is on disk afterwards.
+
         Args:
             specific_queries (dict, optional): Specific queries to process.
 
@@ -212,9 +339,39 @@ class DataPipelineIntegration:
         self.data_processor = DataProcessor(self.data_storage_manager,
                                             self.document, self.query_executor,
                                             self.error_handler)
-        return self.data_processor.process_and_store_data(
+        result = self.data_processor.process_and_store_data(
             self.category_metric_map, self.use_snowflake, self.cik_number,
-            specific_queries)
+            specific_queries, self.preprocessed_frames)
+        write_error = self.data_preprocessor.wait_for_writes(
+        ) if self.data_preprocessor else None
+        return result or write_error
+
+    def store_query_results(self, query_results: dict) -> dict:
+        """
+        Stores the processed data of the company computed by a batched query over many companies.
+
+        Like `process_and_store_data`, this method returns once the background writes of the
+        preprocessed data are done too.
+
+        Args:
+            query_results (dict): The company's query results by category, as returned by
+                `QueryExecutor.execute_query_batch`.
+
+        Returns:
+            dict: Error information, or None.
+
+        Example:
+            >>> results = query_executor.execute_query_batch(categories, {cik_number: preprocessed_data})
+            >>> data_pipeline.store_query_results(results[cik_number])
+        """
+        self.data_processor = DataProcessor(self.data_storage_manager,
+                                            self.document, self.query_executor,
+                                            self.error_handler)
+        result = self.data_processor.store_query_results(
+            query_results, self.cik_number)
+        write_error = self.data_preprocessor.wait_for_writes(
+        ) if self.data_preprocessor else None
+        return result or write_error
 
     def transform_and_store_json(self,
                                  specific_category: str = None,
@@ -4,6 +4,7 @@ from .file_paths import FilePaths
 from .metrics import AnnualMetrics, QuarterlyMetrics
 from .query_folder_mapping import QueryFolderMapping
 from .sec_endpoints import SECEndpoints
+from .units import UNITS_ATTR, Units
 
 ANNUAL_METRICS = [metric.value for metric in AnnualMetrics]
 QUARTERLY_METRICS = [metric.value for metric in QuarterlyMetrics]
@@ -13,6 +14,12 @@ CASH_FLOW_METRICS = CategoryMetrics.CASH_FLOW.value
 LIQUIDITY_METRICS = CategoryMetrics.LIQUIDITY.value
 PROFITABILITY_METRICS = CategoryMetrics.PROFITABILITY.value
 
+# Every us-gaap concept the pipeline reads; used as the fetch allow-list
+PIPELINE_METRICS = list(
+    dict.fromkeys(ANNUAL_METRICS + QUARTERLY_METRICS + [
+        metric for category in CategoryMetrics for metric in category.value
+    ]))
+
 BASE_URL = SECEndpoints.BASE_URL.value
 COMPANY_TICKERS = SECEndpoints.COMPANY_TICKERS.value
 SUBMISSIONS = SECEndpoints.SUBMISSIONS.value
@@ -33,17 +40,20 @@ DEFAULT_STAGE_NAME = FilePaths().DEFAULT_STAGE_NAME
 DEFAULT_TABLE_NAME = FilePaths().DEFAULT_TABLE_NAME
 CSV_DIRECTORY = FilePaths().CSV_DIRECTORY
 CSV_FILE_PATH = FilePaths().CSV_FILE_PATH
+CACHE_DIRECTORY = FilePaths().CACHE_DIRECTORY
+HTTP_CACHE_PATH = FilePaths().HTTP_CACHE_PATH
+TICKER_INDEX_PATH = FilePaths().TICKER_INDEX_PATH
 
 __all__ = [
     'ANNUAL_METRICS', 'ASSETS_LIABILITIES_BAR_METRICS',
     'ASSETS_LIABILITIES_DEBT_LINE_METRIC',
     'ASSETS_LIABILITIES_EQUITY_LINE_METRIC', 'ASSETS_LIABILITIES_LINE_METRICS',
-    'ASSET_LIABILITIES_METRICS', 'BASE_URL', 'CASH_FLOW_METRICS',
-    'CASH_FLOW_CHARTS_METRICS', 'COMPANY_FACTS', 'COMPANY_TICKERS',
-    'CSV_DIRECTORY', 'CSV_FILE_PATH', 'DEFAULT_STAGE_NAME',
-    'DEFAULT_TABLE_NAME', 'FilePaths', 'LIQUIDITY_BAR_METRICS',
-    'LIQUIDITY_LINE_METRICS', 'LIQUIDITY_METRICS',
+    'ASSET_LIABILITIES_METRICS', 'BASE_URL', 'CACHE_DIRECTORY',
+    'CASH_FLOW_METRICS', 'CASH_FLOW_CHARTS_METRICS', 'COMPANY_FACTS',
+    'COMPANY_TICKERS', 'CSV_DIRECTORY', 'CSV_FILE_PATH', 'DEFAULT_STAGE_NAME',
+    'DEFAULT_TABLE_NAME', 'FilePaths', 'HTTP_CACHE_PATH', 'LIQUIDITY_BAR_METRICS',
+    'LIQUIDITY_LINE_METRICS', 'LIQUIDITY_METRICS', 'PIPELINE_METRICS',
     'PROFITABILITY_LINE_METRICS', 'PROFITABILITY_MARGIN_LINE_METRIC',
     'PROFITABILITY_METRICS', 'QUARTERLY_METRICS', 'QueryFolderMapping',
-    'SECEndpoints', 'SUBMISSIONS'
+    'SECEndpoints', 'SUBMISSIONS', 'TICKER_INDEX_PATH', 'UNITS_ATTR', 'Units'
 ]
@@ -14,3 +14,9 @@ class FilePaths:
             os.makedirs(self.CSV_DIRECTORY)
 
         self.CSV_FILE_PATH = os.path.join(self.CSV_DIRECTORY, 'data.csv')
+        # Kept outside CSV_DIRECTORY, whose sub-directories are read as CIK numbers
+        self.CACHE_DIRECTORY = '.cache'
+        self.HTTP_CACHE_PATH = os.path.join(self.CACHE_DIRECTORY,
+                                            'http_cache.sqlite')
+        self.TICKER_INDEX_PATH = os.path.join(self.CACHE_DIRECTORY,
+                                              'company_tickers.json')
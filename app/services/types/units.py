@@ -0,0 +1,27 @@
+from enum import Enum
+
+# Key of the {column: unit} mapping in the `attrs` of processed DataFrames
+UNITS_ATTR = 'units'
+
+
+class Units(Enum):
+    USD = 'USD'
+    USD_MILLIONS = 'USD millions'
+    RATIO = 'ratio'
+    PERCENT = 'percent'
+
+    @classmethod
+    def of(cls, df, column, default=None):
+        """
+        Unit recorded for a column of a processed DataFrame, or `default` if none was recorded (e.g.
+        for data read back from CSV).
+        """
+        unit = df.attrs.get(UNITS_ATTR, {}).get(column)
+        return cls(unit) if unit else default
+
+    def format(self, value):
+        """
+        Display a value with the unit, e.g. '12.5 mil $' or '12.5%'.
+        """
+        suffixes = {'USD': ' $', 'USD millions': ' mil $', 'percent': '%'}
+        return f"{value}{suffixes.get(self.value, '')}"
@@ -1,7 +1,22 @@
 # In services/utils/__init__.py
 
+from .dtypes import (FACT_DATE_COLUMNS, FACT_DTYPES, QUARTER_DTYPE,
+                     apply_fact_dtypes)
+from .file_lock import file_lock
 from .file_version_control import FileVersionManager
+from .filing_watermark import FINANCIAL_FORMS, FilingWatermark
+from .manifest import DataManifest
+from .rate_limiter import (SharedTokenBucket, TokenBucket,
+                           get_shared_rate_limiter)
+from .retry_policy import (CircuitBreaker, CircuitOpenError, RequestMetrics,
+                           RetryPolicy)
 from .roster import Roster
 from .utils import dataframe_to_csv, now
 
-__all__ = ['FileVersionManager', 'now', 'dataframe_to_csv', 'Roster', 'now']
+__all__ = [
+    'FileVersionManager', 'now', 'dataframe_to_csv', 'Roster', 'now',
+    'SharedTokenBucket', 'TokenBucket', 'file_lock', 'get_shared_rate_limiter',
+    'CircuitBreaker', 'CircuitOpenError', 'RequestMetrics', 'RetryPolicy',
+    'FINANCIAL_FORMS', 'FilingWatermark', 'DataManifest', 'FACT_DTYPES',
+    'FACT_DATE_COLUMNS', 'QUARTER_DTYPE', 'apply_fact_dtypes'
+]
@@ -0,0 +1,55 @@
+from typing import Dict, Union
+
+import pandas as pd
+
+# Ordered, so sorting by quarter puts the full year after its quarters
+QUARTER_DTYPE = pd.CategoricalDtype(['Q1', 'Q2', 'Q3', 'Q4', 'FY'],
+                                    ordered=True)
+
+# Column dtypes of a company facts frame and the frames preprocessed from it. Names, metrics,
+# forms, fiscal periods and frames repeat on every row, so they are categorical; amounts are always
+# float64, even when every fact of a filer happens to be a whole number.
+FACT_DTYPES: Dict[str, Union[str, pd.CategoricalDtype]] = {
+    'EntityName': 'category',
+    'CIK': 'int32',
+    'Metric': 'category',
+    'form': 'category',
+    'fp': 'category',
+    'frame': 'category',
+    'fy': 'Int32',
+    'year': 'int32',
+    'quarter': QUARTER_DTYPE,
+    'val': 'float64',
+}
+
+# Columns holding ISO dates, stored as datetime64.
+FACT_DATE_COLUMNS = ('start', 'end', 'filed')
+
+# Annual data stored before quarters were categorical numbered them 1-4, with 5 for the full year
+LEGACY_QUARTERS = dict(enumerate(QUARTER_DTYPE.categories, start=1))
+
+
+def apply_fact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the known columns of a facts frame to their dtypes in `FACT_DTYPES`, in place.
+
+    Columns that are missing, or that already have their dtype, are left alone, so the function is
+    cheap to call again on frames read back from Parquet.
+
+    Args:
+        df (pd.DataFrame): The facts frame, or any frame derived from it.
+
+    Returns:
+        pd.DataFrame: The same frame.
+    """
+    for column, dtype in FACT_DTYPES.items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        if column == 'quarter' and pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = df[column].map(LEGACY_QUARTERS)
+        df[column] = df[column].astype(dtype)
+    for column in FACT_DATE_COLUMNS:
+        if column in df.columns and not pd.api.types.is_datetime64_dtype(
+                df[column]):
+            df[column] = pd.to_datetime(df[column], format='ISO8601')
+    return df
@@ -0,0 +1,45 @@
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Generator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: str) -> Generator[BinaryIO, None, None]:
+    """
+    Hold an exclusive, cross-process lock on a file for the duration of the block.
+
+    The file is created if it does not exist and is yielded opened in binary read/write mode,
+    so small shared state can be kept in the lock file itself.
+
+    Args:
+        path (str): Path to the lock file.
+
+    Yields:
+        BinaryIO: The locked file, positioned at the start.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handle = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o666), 'r+b')
+    try:
+        if fcntl:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield handle
+        finally:
+            handle.flush()
+            if fcntl:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        handle.close()
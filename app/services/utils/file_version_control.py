@@ -1,25 +1,45 @@
+import json
 import os
+import time
+from typing import Dict, List
+
+from .file_lock import file_lock
 
 
 class FileVersionManager:
     """
     Manages versioning and indexing of files in a directory structure.
 
+    Every stored file is appended as one JSON line to `<base_dir>/<cik>/<storage_type>/index.jsonl`,
+    so recording a version costs a single append however long the history is. The latest line of a
+    category is its current version. `index.md` is an optional view rendered from it, and
+    directories indexed only in Markdown are still read.
+
     Attributes:
         base_dir (str): The base directory path where files are stored.
+        render_markdown (bool): Whether `index.md` is re-rendered on every update.
 
     Methods:
         update_index(cik_number, category, file_name, storage_type): Updates the index file with file details.
+        read_index(cik_number, storage_type): Latest index entry of every category.
+        categories(cik_number, storage_type): Names of the indexed categories.
+        compact_index(cik_number, storage_type): Rewrite the index with only the latest entries.
+        render_markdown_index(cik_number, storage_type): Render the index as Markdown.
     """
 
-    def __init__(self, base_dir: str):
+    INDEX_FILE = 'index.jsonl'
+    MARKDOWN_FILE = 'index.md'
+
+    def __init__(self, base_dir: str, render_markdown: bool = False):
         """
         Initializes the FileVersionManager with a base directory path.
 
         Args:
             base_dir (str): The base directory path where files are stored.
+            render_markdown (bool, optional): Re-render `index.md` on every update. Defaults to False.
         """
         self.base_dir = base_dir
+        self.render_markdown = render_markdown
 
     def update_index(self, cik_number: str, category: str, file_name: str,
                      storage_type: str):
@@ -32,87 +52,162 @@ class FileVersionManager:
             file_name (str): The name of the file to be indexed.
             storage_type (str): The type of storage for the file.
         """
-        index_path = os.path.join(self.base_dir, cik_number, storage_type,
-                                  'index.md')
-        self._write_to_index(index_path, cik_number, category, file_name,
-                             storage_type)
+        index_path = self._index_path(cik_number, storage_type)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        entry = self._build_entry(cik_number, category, file_name,
+                                  storage_type)
+        # The lock only serializes appends with `compact_index`, which rewrites the file
+        with file_lock(f'{index_path}.lock'):
+            # Carry over the entries of a legacy index.md the first time
+            legacy_entries = [] if os.path.exists(index_path) else list(
+                self._read_markdown_index(cik_number, storage_type).values())
+            with open(index_path, 'a', encoding='utf-8') as file:
+                file.writelines(
+                    json.dumps(line) + '\n'
+                    for line in legacy_entries + [entry])
+        if self.render_markdown:
+            self.render_markdown_index(cik_number, storage_type)
+
+    def read_index(self, cik_number: str,
+                   storage_type: str) -> Dict[str, Dict[str, str]]:
+        """
+        Read the latest index entry of every category.
 
-    def _write_to_index(self, index_path: str, cik_number: str, category: str,
-                        file_name: str, storage_type: str):
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            storage_type (str): The type of storage.
+
+        Returns:
+            dict: Maps each category, in the order first indexed, to its latest entry with `category`,
+                `file_name`, `path` and `version`. Empty if nothing was indexed.
+        """
+        index_path = self._index_path(cik_number, storage_type)
+        if not os.path.exists(index_path):
+            return self._read_markdown_index(cik_number, storage_type)
+
+        latest = {}
+        with open(index_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted write
+                    continue
+                latest[entry['category']] = entry
+        return latest
+
+    def categories(self, cik_number: str, storage_type: str) -> List[str]:
         """
-        Writes updated content to the index file at the given path.
+        List the indexed categories.
 
         Args:
-            index_path (str): The path to the index file.
             cik_number (str): The Central Index Key (CIK) number of the company.
-            category (str): The category of the data.
-            file_name (str): The name of the file to be indexed.
-            storage_type (str): The type of storage for the file.
+            storage_type (str): The type of storage.
+
+        Returns:
+            list of str: The category names, in the order first indexed.
         """
-        os.makedirs(os.path.dirname(index_path), exist_ok=True)
-        index_content = self._read_and_categorize_index(index_path)
-        self._update_index_content(index_content, category, file_name,
-                                   cik_number, storage_type)
-        self._save_index(index_path, cik_number, storage_type, index_content)
+        return list(self.read_index(cik_number, storage_type))
 
-    def _update_index_content(self, index_content: dict, category: str,
-                              file_name: str, cik_number: str,
-                              storage_type: str):
+    def compact_index(self, cik_number: str, storage_type: str) -> None:
+        """
+        Atomically rewrite the index with only the latest entry of every category.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            storage_type (str): The type of storage.
+        """
+        index_path = self._index_path(cik_number, storage_type)
+        if not os.path.exists(index_path):
+            return
+        with file_lock(f'{index_path}.lock'):
+            entries = self.read_index(cik_number, storage_type)
+            temporary_path = f'{index_path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                file.writelines(
+                    json.dumps(entry) + '\n' for entry in entries.values())
+            os.replace(temporary_path, index_path)
+
+    def render_markdown_index(self, cik_number: str, storage_type: str):
         """
-        Updates index content with new file details for a given category.
+        Render the index as `index.md`, one section per category linking its latest file.
 
         Args:
-            index_content (dict): The existing index content.
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            storage_type (str): The type of storage.
+        """
+        markdown_path = os.path.join(self.base_dir, cik_number, storage_type,
+                                     self.MARKDOWN_FILE)
+        os.makedirs(os.path.dirname(markdown_path), exist_ok=True)
+        with open(markdown_path, 'w') as file:
+            self._write_index_header(file, cik_number, storage_type)
+            for category, entry in self.read_index(cik_number,
+                                                   storage_type).items():
+                file.write(
+                    f"### {category}\n- [{category} {entry['version']}]({entry['path']})\n\n"
+                )
+
+    def _index_path(self, cik_number: str, storage_type: str) -> str:
+        return os.path.join(self.base_dir, cik_number, storage_type,
+                            self.INDEX_FILE)
+
+    @staticmethod
+    def _build_entry(cik_number: str, category: str, file_name: str,
+                     storage_type: str) -> Dict[str, str]:
+        """
+        Builds the index entry of a stored file.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
             category (str): The category of the data.
             file_name (str): The name of the file to be indexed.
-            cik_number (str): The Central Index Key (CIK) number of the company.
             storage_type (str): The type of storage for the file.
+
+        Returns:
+            dict: The entry, with `category`, `file_name`, `path`, `version` and `indexed_at`.
         """
         formatted_category = category.replace(' ', '_')
-        relative_path = f"data/{cik_number}/{storage_type}/{formatted_category}/{file_name}"
-        category_header = f"### {category}"
-        index_content[
-            category_header] = f"- [{category} {file_name.split('_')[-1].split('.')[0]}]({relative_path})\n"
-
-    def _read_and_categorize_index(self, index_path: str) -> dict:
+        return {
+            'category': category,
+            'file_name': file_name,
+            'path': f"data/{cik_number}/{storage_type}/{formatted_category}/{file_name}",
+            'version': file_name.split('_')[-1].split('.')[0],
+            'indexed_at': time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+
+    def _read_markdown_index(self, cik_number: str,
+                             storage_type: str) -> Dict[str, Dict[str, str]]:
         """
-        Reads and categorizes lines from the index file into a structured format.
+        Reads a legacy `index.md`, written before the structured index existed.
 
         Args:
-            index_path (str): The path to the index file.
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            storage_type (str): The type of storage.
 
         Returns:
-            dict: The structured index content.
+            dict: The index entries, as returned by `read_index`.
         """
-        if not os.path.exists(index_path):
+        markdown_path = os.path.join(self.base_dir, cik_number, storage_type,
+                                     self.MARKDOWN_FILE)
+        if not os.path.exists(markdown_path):
             return {}
 
-        index_content = {}
+        entries = {}
         current_category = None
-        with open(index_path, 'r') as file:
+        with open(markdown_path, 'r') as file:
             for line in file:
                 if line.startswith('### '):
-                    current_category = line.strip()
-                    index_content[current_category] = ''
-                elif current_category and line.strip():
-                    index_content[current_category] += line
-        return index_content
-
-    def _save_index(self, index_path: str, cik_number: str, storage_type: str,
-                    index_content: dict):
-        """
-        Saves the structured index content back to the index file.
-
-        Args:
-            index_path (str): The path to the index file.
-            cik_number (str): The Central Index Key (CIK) number of the company.
-            storage_type (str): The type of storage for the file.
-            index_content (dict): The structured index content.
-        """
-        with open(index_path, 'w') as file:
-            self._write_index_header(file, cik_number, storage_type)
-            for category, entry in index_content.items():
-                file.write(f"{category}\n{entry}\n")
+                    current_category = line[4:].strip()
+                elif current_category and '](' in line:
+                    path = line.split('](', 1)[1].rsplit(')', 1)[0]
+                    file_name = path.split('/')[-1]
+                    entries[current_category] = {
+                        'category': current_category,
+                        'file_name': file_name,
+                        'path': path,
+                        'version': file_name.split('_')[-1].split('.')[0]
+                    }
+        return entries
 
     @staticmethod
     def _write_index_header(file, cik_number, storage_type):
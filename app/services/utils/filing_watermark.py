@@ -0,0 +1,115 @@
+import json
+import os
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+# Filings that can change the financial statements read from companyfacts.
+FINANCIAL_FORMS = ('10-K', '10-K/A', '10-Q', '10-Q/A', '20-F', '20-F/A',
+                   '40-F', '40-F/A')
+
+
+class FilingWatermark:
+    """
+    Stores, per CIK number, the latest financial filing that the local data was built from.
+
+    The watermark lives next to the company's data, in `<base_dir>/<cik>/watermark.json`. Comparing it
+    with the latest filing listed in the company's submissions tells whether anything new was filed
+    since the last refresh, so unchanged companies can be skipped.
+
+    Attributes:
+        base_dir (str): The base directory path where company data is stored.
+
+    Methods:
+        get(cik_number): Read the stored watermark.
+        set(cik_number, filing): Store a new watermark.
+        latest_filing(submissions): Find the latest financial filing in parsed submissions.
+        is_current(cik_number, filing): Check whether the stored watermark matches a filing.
+    """
+
+    FILE_NAME = 'watermark.json'
+
+    def __init__(self, base_dir: str):
+        """
+        Initializes the FilingWatermark with a base directory path.
+
+        Args:
+            base_dir (str): The base directory path where company data is stored.
+        """
+        self.base_dir = base_dir
+
+    def get(self, cik_number: str) -> Optional[Dict[str, str]]:
+        """
+        Read the stored watermark of a company.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+
+        Returns:
+            dict or None: The `accessionNumber`, `filingDate` and `form` of the filing, or None if the
+                company has no watermark yet.
+        """
+        try:
+            with open(self._path(cik_number), encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, cik_number: str, filing: Dict[str, str]) -> None:
+        """
+        Store the watermark of a company, atomically replacing the previous one.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            filing (dict): The filing, with at least `accessionNumber` and `filingDate`.
+        """
+        path = self._path(cik_number)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(filing, file)
+        os.replace(temporary_path, path)
+
+    def is_current(self, cik_number: str, filing: Dict[str, str]) -> bool:
+        """
+        Check whether the stored watermark of a company matches a filing.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            filing (dict): The latest filing.
+
+        Returns:
+            bool: True if the local data was already built from this filing.
+        """
+        watermark = self.get(cik_number)
+        return bool(watermark) and all(
+            watermark.get(key) == filing.get(key)
+            for key in ('accessionNumber', 'filingDate'))
+
+    @staticmethod
+    def latest_filing(
+            submissions: pd.DataFrame,
+            forms: Iterable[str] = FINANCIAL_FORMS) -> Optional[Dict[str, str]]:
+        """
+        Find the latest financial filing in a company's recent submissions.
+
+        Args:
+            submissions (pd.DataFrame): Recent filings, as returned by `SECAPIClient.fetch_submissions`.
+            forms (Iterable[str], optional): Forms that count as financial filings. Defaults to FINANCIAL_FORMS.
+
+        Returns:
+            dict or None: The `accessionNumber`, `filingDate` and `form` of the latest financial filing,
+                or None if there is none.
+        """
+        filings = submissions[submissions['form'].isin(list(forms))]
+        if filings.empty:
+            return None
+        latest = filings.sort_values(['filingDate', 'accessionNumber']).iloc[-1]
+        return {
+            'accessionNumber': str(latest['accessionNumber']),
+            'filingDate': str(latest['filingDate']),
+            'form': str(latest['form'])
+        }
+
+    def _path(self, cik_number: str) -> str:
+        return os.path.join(self.base_dir, cik_number, self.FILE_NAME)
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Generator, Optional, Tuple
+
+from .file_lock import file_lock
+
+
+class DataManifest:
+    """
+    Per-CIK record of the current file of every stored dataset.
+
+    Each company directory holds a `manifest.json` mapping a dataset key, built from the storage
+    type, category and (for chart JSON) chart type, to the path of its latest file relative to the
+    company directory. Writers record every new file as they store it; readers look the current file
+    up instead of listing the dataset directory and comparing modification times, which gets slower
+    with every version kept.
+
+    The manifest is replaced atomically under a file lock, so concurrent pipelines do not lose each
+    other's entries. Parsed manifests are cached per process and revalidated with a single `stat`,
+    so repeated lookups (e.g. on every Streamlit rerun) do not re-read the file.
+
+    Attributes:
+        base_dir (str): The base directory path where company data is stored.
+
+    Methods:
+        record(cik_number, storage_type, category, file_name, chart_type): Make a file the current one.
+        latest(cik_number, storage_type, category, chart_type): Path of the current file, if recorded.
+        entries(cik_number): All recorded datasets of a company.
+        discard_missing(cik_number): Drop entries whose file no longer exists.
+        lock(cik_number): Hold the company's manifest lock.
+    """
+
+    FILE_NAME = 'manifest.json'
+
+    # Shared by every instance: path -> ((inode, mtime_ns, size), entries)
+    _cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, str]]] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, base_dir: str):
+        """
+        Initializes the DataManifest with a base directory path.
+
+        Args:
+            base_dir (str): The base directory path where company data is stored.
+        """
+        self.base_dir = base_dir
+
+    @staticmethod
+    def key(storage_type: str,
+            category: Optional[str] = None,
+            chart_type: Optional[str] = None) -> str:
+        """
+        Build the key of a dataset. Categories are normalized to their folder names, so
+        'Assets Liabilities' and 'Assets_Liabilities' name the same dataset.
+
+        Args:
+            storage_type (str): The storage type, e.g. 'preprocessed_data' or 'processed_json'.
+            category (str, optional): The category of the data.
+            chart_type (str, optional): The chart type, for chart JSON.
+
+        Returns:
+            str: The dataset key, e.g. 'processed_json/Cash_Flow/bar_chart'.
+        """
+        parts = [storage_type]
+        if category:
+            parts.append(category.replace(' ', '_'))
+        if chart_type:
+            parts.append(chart_type.replace(' ', '_'))
+        return '/'.join(parts)
+
+    def record(self,
+               cik_number: str,
+               storage_type: str,
+               category: Optional[str],
+               file_name: str,
+               chart_type: Optional[str] = None) -> None:
+        """
+        Make a stored file the current file of its dataset.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            storage_type (str): The storage type of the file.
+            category (str, optional): The category of the data.
+            file_name (str): The name of the stored file.
+            chart_type (str, optional): The chart type, for chart JSON.
+        """
+        key = self.key(storage_type, category, chart_type)
+        path = self._path(cik_number)
+        with self.lock(cik_number):
+            entries = dict(self._read(path))
+            entries[key] = f'{key}/{file_name}'
+            self._write(path, entries)
+
+    def discard_missing(self, cik_number: str) -> int:
+        """
+        Drop the entries whose file no longer exists.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        path = self._path(cik_number)
+        with self.lock(cik_number):
+            entries = self._read(path)
+            kept = {
+                key: relative_path
+                for key, relative_path in entries.items()
+                if os.path.isfile(self._file_path(cik_number, relative_path))
+            }
+            if len(kept) < len(entries):
+                self._write(path, kept)
+            return len(entries) - len(kept)
+
+    @contextmanager
+    def lock(self, cik_number: str) -> Generator[BinaryIO, None, None]:
+        """
+        Hold the lock that serializes updates to a company's manifest. Not reentrant: do not call
+        `record` or `discard_missing` for the same company while holding it.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+        """
+        with file_lock(f'{self._path(cik_number)}.lock') as handle:
+            yield handle
+
+    def latest(self,
+               cik_number: str,
+               storage_type: str,
+               category: Optional[str] = None,
+               chart_type: Optional[str] = None) -> Optional[str]:
+        """
+        Look up the current file of a dataset.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+            storage_type (str): The storage type of the dataset.
+            category (str, optional): The category of the data.
+            chart_type (str, optional): The chart type, for chart JSON.
+
+        Returns:
+            str or None: The path of the current file, or None if the dataset was never recorded or its
+                file no longer exists.
+        """
+        relative_path = self.entries(cik_number).get(
+            self.key(storage_type, category, chart_type))
+        if relative_path is None:
+            return None
+        file_path = self._file_path(cik_number, relative_path)
+        return file_path if os.path.isfile(file_path) else None
+
+    def entries(self, cik_number: str) -> Dict[str, str]:
+        """
+        Read every recorded dataset of a company.
+
+        Args:
+            cik_number (str): The Central Index Key (CIK) number of the company.
+
+        Returns:
+            dict: Maps dataset keys to file paths relative to the company directory. Empty if the
+                company has no manifest.
+        """
+        return dict(self._read(self._path(cik_number)))
+
+    def _path(self, cik_number: str) -> str:
+        return os.path.join(self.base_dir, str(cik_number), self.FILE_NAME)
+
+    def _file_path(self, cik_number: str, relative_path: str) -> str:
+        return os.path.join(self.base_dir, str(cik_number),
+                            *relative_path.split('/'))
+
+    def _write(self, path: str, entries: Dict[str, str]) -> None:
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'entries': entries}, file, indent=4, sort_keys=True)
+        os.replace(temporary_path, path)
+        self._read(path)
+
+    @classmethod
+    def _read(cls, path: str) -> Dict[str, str]:
+        """
+        Return the entries of a manifest, from the cache unless the file changed since it was read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return {}
+        # Replacing the file changes its inode, so a rewrite is noticed even within one mtime tick
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with cls._cache_lock:
+            cached = cls._cache.get(path)
+            if cached and cached[0] == version:
+                return cached[1]
+        try:
+            with open(path, encoding='utf-8') as file:
+                entries = json.load(file)['entries']
+        except (OSError, ValueError, KeyError):
+            return {}
+        with cls._cache_lock:
+            cls._cache[path] = (version, entries)
+        return entries
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+from .file_lock import file_lock
+
+# SEC fair access policy: no more than 10 requests per second per user.
+SEC_MAX_REQUESTS_PER_SECOND = 10
+DEFAULT_RATE_LIMIT_STATE_PATH = os.path.join(tempfile.gettempdir(),
+                                             'stockscouterai_sec_rate_limit')
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter usable from both threads and asyncio tasks.
+
+    Callers reserve a token before each request. When the bucket is empty the reservation
+    is still granted, but the caller is told how long to wait, so concurrent callers are
+    queued in arrival order and the overall rate never exceeds `rate` requests per second.
+
+    Attributes:
+        rate (float): Tokens added to the bucket per second.
+        capacity (float): Maximum number of tokens the bucket can hold (burst size).
+    """
+
+    def __init__(self,
+                 rate: float = SEC_MAX_REQUESTS_PER_SECOND,
+                 capacity: Optional[float] = None) -> None:
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate (float, optional): Tokens added per second. Defaults to SEC_MAX_REQUESTS_PER_SECOND.
+            capacity (float, optional): Burst size. Defaults to `rate`.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else self.rate
+        self._tokens = self.capacity
+        self._updated = self._clock()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def _load_state(self) -> Tuple[float, float]:
+        return self._tokens, self._updated
+
+    def _save_state(self, tokens: float, updated: float) -> None:
+        self._tokens, self._updated = tokens, updated
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds the caller must wait before using the reserved tokens.
+        """
+        with self._lock:
+            return self._reserve(tokens)
+
+    def _reserve(self, tokens: float) -> float:
+        available, updated = self._load_state()
+        now = self._clock()
+        available = min(self.capacity,
+                        available + max(0.0, now - updated) * self.rate)
+        available -= tokens
+        self._save_state(available, now)
+        return max(0.0, -available / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block the current thread until the tokens are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """
+        Suspend the current task until the tokens are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a lock file, so every thread and process on the host
+    draws from the same budget.
+
+    The bucket level and the time it was last updated are stored in `state_path`, which is
+    locked exclusively while a reservation is made. Parallel pipeline workers therefore stay
+    under the SEC ceiling together instead of each assuming it has the full rate to itself.
+
+    Attributes:
+        state_path (str): Path to the lock file holding the shared state.
+    """
+    _STATE_FORMAT = '<dd'
+
+    def __init__(self,
+                 rate: float = SEC_MAX_REQUESTS_PER_SECOND,
+                 capacity: Optional[float] = None,
+                 state_path: str = DEFAULT_RATE_LIMIT_STATE_PATH) -> None:
+        """
+        Initialize the shared bucket. An existing state file is reused as is.
+
+        Args:
+            rate (float, optional): Tokens added per second. Defaults to SEC_MAX_REQUESTS_PER_SECOND.
+            capacity (float, optional): Burst size. Defaults to `rate`.
+            state_path (str, optional): Path to the shared state file. Defaults to a file in the
+                system temporary directory.
+        """
+        super().__init__(rate, capacity)
+        self.state_path = state_path
+        self._handle = None
+
+    @staticmethod
+    def _clock() -> float:
+        # Wall-clock time, because monotonic clocks are not comparable across processes.
+        return time.time()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock, file_lock(self.state_path) as handle:
+            self._handle = handle
+            try:
+                return self._reserve(tokens)
+            finally:
+                self._handle = None
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """
+        Suspend the current task until the tokens are available.
+
+        The reservation blocks on the file lock while another process holds it, so it runs on a worker
+        thread rather than stalling every other task of the event loop.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+        """
+        wait = await asyncio.to_thread(self.reserve, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _load_state(self) -> Tuple[float, float]:
+        self._handle.seek(0)
+        raw = self._handle.read(struct.calcsize(self._STATE_FORMAT))
+        if len(raw) != struct.calcsize(self._STATE_FORMAT):
+            return self.capacity, self._clock()
+        return struct.unpack(self._STATE_FORMAT, raw)
+
+    def _save_state(self, tokens: float, updated: float) -> None:
+        self._handle.seek(0)
+        self._handle.write(struct.pack(self._STATE_FORMAT, tokens, updated))
+        self._handle.truncate()
+
+
+_shared_rate_limiters = {}
+_shared_rate_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(
+        state_path: str = DEFAULT_RATE_LIMIT_STATE_PATH) -> SharedTokenBucket:
+    """
+    Return the process-wide SharedTokenBucket for a state file, creating it on first use.
+
+    Args:
+        state_path (str, optional): Path to the shared state file.
+
+    Returns:
+        SharedTokenBucket: The limiter shared by all SEC clients using `state_path`.
+    """
+    with _shared_rate_limiters_lock:
+        if state_path not in _shared_rate_limiters:
+            _shared_rate_limiters[state_path] = SharedTokenBucket(
+                state_path=state_path)
+        return _shared_rate_limiters[state_path]
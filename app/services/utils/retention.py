@@ -0,0 +1,234 @@
+"""
+Prunes old versions of the timestamped artifacts that every pipeline run writes under
+`<base_dir>/<cik>/<storage_type>/<category>[/<chart_type>]/`.
+
+Run it as a module to compact the data directory:
+
+    python -m app.services.utils.retention --keep-last 3 --max-age-days 30
+"""
+import argparse
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.services.functions.managers import LoggingManager
+
+from .file_version_control import FileVersionManager
+from .manifest import DataManifest
+
+# `{cik}_{category}[_{chart_type}]_{timestamp}.{extension}`, as written by DataStorageManager.
+VERSIONED_FILE_PATTERN = re.compile(r'^(?P<stem>.+)_(?P<timestamp>\d{14})\.\w+$')
+
+
+class RetentionPolicy:
+    """
+    Decides which versions of a dataset are kept.
+
+    A version is kept if it is one of the `keep_last` newest versions, or if it is younger than
+    `max_age_days`. The newest version is always kept, so a dataset is never emptied.
+
+    Attributes:
+        keep_last (int or None): Number of newest versions kept. None keeps versions by age only.
+        max_age_days (float or None): Versions younger than this are kept. None keeps by count only.
+    """
+
+    def __init__(self,
+                 keep_last: Optional[int] = 5,
+                 max_age_days: Optional[float] = None) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            keep_last (int, optional): Number of newest versions kept. Defaults to 5.
+            max_age_days (float, optional): Versions younger than this many days are kept. Defaults to None.
+
+        Raises:
+            ValueError: If `keep_last` is smaller than 1 or `max_age_days` is negative.
+        """
+        if keep_last is not None and keep_last < 1:
+            raise ValueError('keep_last must be at least 1.')
+        if max_age_days is not None and max_age_days < 0:
+            raise ValueError('max_age_days must not be negative.')
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+
+    def expired(self, timestamps: List[float], now: float) -> List[bool]:
+        """
+        Flag the versions the policy does not keep.
+
+        Args:
+            timestamps (List[float]): Epoch times of the versions, newest first.
+            now (float): The current epoch time.
+
+        Returns:
+            List[bool]: True for each version that may be removed.
+        """
+        keep_last = self.keep_last if self.keep_last is not None else 1
+        if self.keep_last is None and self.max_age_days is None:
+            keep_last = len(timestamps)
+        cutoff = now - self.max_age_days * 86400 if self.max_age_days is not None else None
+        return [
+            rank >= keep_last and (cutoff is None or timestamp < cutoff)
+            for rank, timestamp in enumerate(timestamps)
+        ]
+
+
+class ArtifactCompactor:
+    """
+    Removes the versions of stored artifacts that a RetentionPolicy no longer keeps.
+
+    Files that are current, i.e. recorded in the company's manifest or linked from an index, are
+    never removed, whatever their age. Each company is compacted while holding its manifest lock, so
+    no pipeline records a new version in the middle of it; readers resolve the current file through
+    the manifest or pick the newest file, both of which are always kept. Afterwards the manifest
+    drops entries whose file is gone and each index is rewritten with only its current entries.
+
+    Attributes:
+        base_dir (str): The base directory path where company data is stored.
+        policy (RetentionPolicy): Which versions are kept.
+        manifest (DataManifest): Current files of every dataset.
+        file_version_manager (FileVersionManager): Reads and compacts the indexes.
+    """
+
+    def __init__(self, base_dir: str, policy: RetentionPolicy) -> None:
+        """
+        Initialize the compactor.
+
+        Args:
+            base_dir (str): The base directory path where company data is stored.
+            policy (RetentionPolicy): Which versions are kept.
+        """
+        self.base_dir = base_dir
+        self.policy = policy
+        self.manifest = DataManifest(base_dir)
+        self.file_version_manager = FileVersionManager(base_dir)
+        self.logging_manager = LoggingManager()
+
+    def compact(self,
+                cik_numbers: Optional[Iterable[str]] = None,
+                dry_run: bool = False) -> Dict[str, object]:
+        """
+        Remove expired versions.
+
+        Args:
+            cik_numbers (Iterable[str], optional): Companies to compact. Defaults to every company
+                directory under `base_dir`.
+            dry_run (bool, optional): Only report what would be removed. Defaults to False.
+
+        Returns:
+            dict: `removed` (paths of the removed files), `kept` (number of versions kept) and
+                `freed_bytes`.
+        """
+        if cik_numbers is None:
+            cik_numbers = sorted(
+                name for name in os.listdir(self.base_dir)
+                if os.path.isdir(os.path.join(self.base_dir, name)))
+        summary = {'removed': [], 'kept': 0, 'freed_bytes': 0}
+        now = time.time()
+        for cik_number in cik_numbers:
+            with self.manifest.lock(cik_number):
+                self._compact_company(cik_number, now, dry_run, summary)
+            if not dry_run:
+                self.manifest.discard_missing(cik_number)
+                for storage_type in self._storage_types(cik_number):
+                    self.file_version_manager.compact_index(
+                        cik_number, storage_type)
+        self.logging_manager.log(
+            f"{'Would remove' if dry_run else 'Removed'} {len(summary['removed'])} "
+            f"artifact versions ({summary['freed_bytes']} bytes), kept {summary['kept']}.",
+            "INFO")
+        return summary
+
+    def _compact_company(self, cik_number: str, now: float, dry_run: bool,
+                         summary: Dict[str, object]) -> None:
+        company_dir = os.path.join(self.base_dir, cik_number)
+        protected = self._current_files(cik_number)
+        for dir_path, _, file_names in os.walk(company_dir):
+            versions: Dict[str, List[tuple]] = {}
+            for file_name in file_names:
+                match = VERSIONED_FILE_PATTERN.match(file_name)
+                if match:
+                    timestamp = time.mktime(
+                        time.strptime(match['timestamp'], '%Y%m%d%H%M%S'))
+                    versions.setdefault(match['stem'], []).append(
+                        (timestamp, file_name))
+            for stem_versions in versions.values():
+                stem_versions.sort(reverse=True)
+                expired = self.policy.expired(
+                    [timestamp for timestamp, _ in stem_versions], now)
+                for (_, file_name), is_expired in zip(stem_versions, expired):
+                    file_path = os.path.join(dir_path, file_name)
+                    if not is_expired or os.path.abspath(file_path) in protected:
+                        summary['kept'] += 1
+                        continue
+                    self._remove(file_path, dry_run, summary)
+
+    def _remove(self, file_path: str, dry_run: bool,
+                summary: Dict[str, object]) -> None:
+        try:
+            size = os.path.getsize(file_path)
+            if not dry_run:
+                os.remove(file_path)
+        except OSError as e:
+            # e.g. held open by a reader on Windows; it is retried on the next run
+            self.logging_manager.log(f"Could not remove {file_path}: {e}",
+                                     "WARNING")
+            summary['kept'] += 1
+            return
+        summary['removed'].append(file_path)
+        summary['freed_bytes'] += size
+
+    def _current_files(self, cik_number: str) -> Set[str]:
+        """
+        Collect the absolute paths of the files that the manifest or an index points at.
+        """
+        company_dir = os.path.join(self.base_dir, cik_number)
+        current = {
+            os.path.abspath(os.path.join(company_dir, *relative_path.split('/')))
+            for relative_path in self.manifest.entries(cik_number).values()
+        }
+        for storage_type in self._storage_types(cik_number):
+            for entry in self.file_version_manager.read_index(
+                    cik_number, storage_type).values():
+                # Index paths look like data/<cik>/<storage_type>/<category>/<file>
+                current.add(
+                    os.path.abspath(
+                        os.path.join(company_dir, storage_type,
+                                     *entry['path'].split('/')[-2:])))
+        return current
+
+    def _storage_types(self, cik_number: str) -> List[str]:
+        company_dir = os.path.join(self.base_dir, cik_number)
+        return [
+            name for name in os.listdir(company_dir)
+            if os.path.isdir(os.path.join(company_dir, name))
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Prune old versions of stored pipeline artifacts.')
+    parser.add_argument('--base-dir', default='data',
+                        help='Data directory (default: data).')
+    parser.add_argument('--keep-last', type=int, default=5,
+                        help='Newest versions kept per dataset (default: 5).')
+    parser.add_argument('--max-age-days', type=float, default=None,
+                        help='Also keep versions younger than this many days.')
+    parser.add_argument('--cik', action='append', dest='cik_numbers',
+                        help='Compact only this CIK; may be repeated.')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='List what would be removed without removing it.')
+    args = parser.parse_args(argv)
+
+    compactor = ArtifactCompactor(
+        args.base_dir, RetentionPolicy(args.keep_last, args.max_age_days))
+    summary = compactor.compact(args.cik_numbers, dry_run=args.dry_run)
+    for file_path in summary['removed']:
+        print(file_path)
+    print(f"{'Would remove' if args.dry_run else 'Removed'} {len(summary['removed'])} files, "
+          f"{summary['freed_bytes']} bytes; kept {summary['kept']}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+# Statuses worth retrying: throttling and transient server-side failures.
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a request is refused because the circuit breaker for its host is open.
+    """
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to wait before each retry.
+
+    Waits grow exponentially with the attempt number and use full jitter, so many clients failing at
+    the same moment do not retry in lockstep. A `Retry-After` header sent by the server takes
+    precedence over the computed backoff.
+
+    Attributes:
+        max_retries (int): Retries after the first attempt.
+        backoff_factor (float): Base wait in seconds; the n-th retry waits up to `backoff_factor * 2 ** n`.
+        max_backoff (float): Upper bound on any single wait, including `Retry-After`.
+        retry_statuses (frozenset): HTTP statuses that are retried.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries (int, optional): Retries after the first attempt. Defaults to 3.
+            backoff_factor (float, optional): Base wait in seconds. Defaults to 0.5.
+            max_backoff (float, optional): Upper bound on any single wait. Defaults to 30.
+            retry_statuses (Iterable[int], optional): HTTP statuses that are retried.
+                Defaults to DEFAULT_RETRY_STATUSES.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, attempt: int) -> bool:
+        """
+        Check whether a failed attempt may be retried.
+
+        Args:
+            attempt (int): Zero-based number of the attempt that failed.
+
+        Returns:
+            bool: True if another attempt is allowed.
+        """
+        return attempt < self.max_retries
+
+    def is_retryable_status(self, status: int) -> bool:
+        """
+        Check whether a response status is a transient failure.
+
+        Args:
+            status (int): The HTTP status code.
+
+        Returns:
+            bool: True if the status should be retried.
+        """
+        return status in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute how long to wait before retrying.
+
+        Args:
+            attempt (int): Zero-based number of the attempt that failed.
+            retry_after (float, optional): Wait requested by the server, in seconds.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_backoff)
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a `Retry-After` header given either in seconds or as an HTTP date.
+
+        Args:
+            value (str, optional): The header value.
+
+        Returns:
+            float or None: Seconds to wait, or None if the header is missing or malformed.
+        """
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failed attempts against a host its circuit opens and
+    requests to it are refused immediately for `reset_timeout` seconds, instead of piling more load
+    on a struggling server. Once the timeout has passed a single trial request is let through; its
+    success closes the circuit again and its failure re-opens it.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds an open circuit waits before allowing a trial request.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0) -> None:
+        """
+        Initialize the breaker with every circuit closed.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            reset_timeout (float, optional): Seconds before an open circuit allows a trial. Defaults to 30.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = defaultdict(int)
+        self._opened_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """
+        Check whether a request to a host may be sent.
+
+        Args:
+            host (str): The host of the request.
+
+        Returns:
+            bool: False while the circuit for the host is open.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                # Half-open: let one trial through and hold the others until it reports back
+                self._opened_at[host] = time.monotonic()
+                return True
+            return False
+
+    def is_open(self, host: str) -> bool:
+        """
+        Check whether the circuit for a host is open.
+
+        Args:
+            host (str): The host to check.
+
+        Returns:
+            bool: True if requests to the host are currently refused.
+        """
+        with self._lock:
+            return host in self._opened_at
+
+    def record_success(self, host: str) -> None:
+        """
+        Record a successful attempt, closing the circuit for the host.
+
+        Args:
+            host (str): The host of the request.
+        """
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        """
+        Record a failed attempt, opening the circuit once the threshold is reached.
+
+        Args:
+            host (str): The host of the request.
+        """
+        with self._lock:
+            self._failures[host] += 1
+            if self._failures[host] >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+
+class RequestMetrics:
+    """
+    Thread-safe counters of request attempts and their outcomes, per host.
+
+    Every attempt is counted under `attempts` and under its outcome, e.g. `status_200`,
+    `status_503`, `connection_error` or `circuit_open`; every retry is also counted under `retries`.
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def record_attempt(self, host: str, outcome: str) -> None:
+        """
+        Count one attempt and its outcome.
+
+        Args:
+            host (str): The host of the request.
+            outcome (str): The outcome of the attempt.
+        """
+        with self._lock:
+            self._counters[host]['attempts'] += 1
+            self._counters[host][outcome] += 1
+
+    def record_retry(self, host: str) -> None:
+        """
+        Count one retry.
+
+        Args:
+            host (str): The host of the request.
+        """
+        with self._lock:
+            self._counters[host]['retries'] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        Copy the current counters.
+
+        Returns:
+            dict: Maps each host to its counters.
+        """
+        with self._lock:
+            return {host: dict(counter) for host, counter in self._counters.items()}
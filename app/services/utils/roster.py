@@ -1,8 +1,18 @@
+import threading
+import time
+from typing import Optional
+
 import requests
 
 from app.services.functions.managers import LoggingManager
 from app.services.types import SECEndpoints
 
+from .rate_limiter import TokenBucket, get_shared_rate_limiter
+
+# Endpoint status is shared by every Roster in the process, keyed by endpoint URL.
+_status_cache = {}
+_status_cache_lock = threading.Lock()
+
 
 class Roster:
     """
@@ -12,16 +22,24 @@ class Roster:
         cik (str): The Central Index Key (CIK) number.
         user_agent (str): The user agent string for API requests.
         api_endpoints (dict): Dictionary of API endpoints.
-        api_status (dict): Status of each API endpoint.
+        api_status (dict): Last known status of each API endpoint. Only populated by `check_api_status`.
         logging_manager (LoggingManager): Instance for logging activities.
+        rate_limiter (TokenBucket): Limiter that status checks draw from.
+        status_ttl (int): Seconds a status check result is reused before the endpoint is probed again.
     """
 
-    def __init__(self, user_agent: str = "your_email@example.com"):
+    def __init__(self,
+                 user_agent: str = "your_email@example.com",
+                 rate_limiter: Optional[TokenBucket] = None,
+                 status_ttl: int = 300):
         """
         Initializes the Roster with an optional user agent.
 
         Args:
             user_agent (str, optional): User agent string for API requests. Defaults to "your_email@example.com".
+            rate_limiter (TokenBucket, optional): Limiter that status checks draw from. Defaults to the
+                host-wide limiter shared with all SEC clients.
+            status_ttl (int, optional): Seconds a status check result is reused. Defaults to 300.
         """
         self.cik = None
         self.user_agent = user_agent
@@ -30,14 +48,21 @@ class Roster:
             "submissions": SECEndpoints.SUBMISSIONS.full_url(),
             "company_facts": SECEndpoints.COMPANY_FACTS.full_url(),
         }
+        # Unformatted URLs, so the CIK can be swapped on every recruit
+        self.endpoint_templates = dict(self.api_endpoints)
+        self.status_ttl = status_ttl
         self.api_status = {}
         self.logging_manager = LoggingManager()
+        self.rate_limiter = rate_limiter if rate_limiter else get_shared_rate_limiter(
+        )
 
-    def recruit_cik(self, cik: str) -> 'Roster':
+    def recruit_cik(self, cik: str, check_status: bool = False) -> 'Roster':
         """
         Assigns a CIK number and updates API endpoints accordingly.
         Args:
             cik (str): The CIK number to be assigned.
+            check_status (bool, optional): Also run `check_api_status` for the new endpoints. Defaults to False,
+                so the fetch path never sends extra requests.
         Returns:
             Roster: The current Roster instance.
         """
@@ -47,7 +72,8 @@ class Roster:
 
         self.cik = cik
         self._update_api_endpoints(cik)
-        self.api_status = self._check_api_status()
+        if check_status:
+            self.check_api_status()
         return self
 
     def _update_api_endpoints(self, cik: str):
@@ -57,29 +83,52 @@ class Roster:
             cik (str): The CIK number to be used for API endpoints.
         """
         for key in ['submissions', 'company_facts']:
-            self.api_endpoints[key] = self.api_endpoints[key].format(cik)
+            self.api_endpoints[key] = self.endpoint_templates[key].format(cik)
 
-    def _check_api_status(self) -> dict:
+    def check_api_status(self, force: bool = False) -> dict:
         """
-        Checks the status of each API endpoint.
+        Checks the status of each API endpoint, reusing results younger than `status_ttl`.
+        Args:
+            force (bool, optional): Probe every endpoint even if a cached status exists. Defaults to False.
         Returns:
             dict: The status of each API endpoint.
         """
         status = {}
         for endpoint_name, endpoint_url in self.api_endpoints.items():
-            try:
-                response = requests.get(
-                    endpoint_url, headers={'User-Agent': self.user_agent})
-                status_code = response.status_code
-                status[
-                    endpoint_name] = 'OK' if status_code == 200 else f'Failed (Status Code: {status_code})'
-            except Exception as e:
-                status[endpoint_name] = f'Error: {str(e)}'
-                self.logging_manager.log_error(
-                    f"API status check error for {endpoint_name}: {str(e)}",
-                    "ERROR")
+            with _status_cache_lock:
+                cached = _status_cache.get(endpoint_url)
+            if cached is None or cached['expiry'] <= time.time() or force:
+                cached = self._check_api_status(endpoint_name, endpoint_url)
+                with _status_cache_lock:
+                    _status_cache[endpoint_url] = cached
+            status[endpoint_name] = cached['status']
+        self.api_status = status
         return status
 
+    def _check_api_status(self, endpoint_name: str, endpoint_url: str) -> dict:
+        """
+        Probes one API endpoint with a HEAD request, so no response body is downloaded.
+        Args:
+            endpoint_name (str): The name of the endpoint, used for logging.
+            endpoint_url (str): The URL of the endpoint.
+        Returns:
+            dict: The status of the endpoint, with its expiry time.
+        """
+        try:
+            self.rate_limiter.acquire()
+            response = requests.head(endpoint_url,
+                                     headers={'User-Agent': self.user_agent},
+                                     allow_redirects=True,
+                                     timeout=10)
+            status_code = response.status_code
+            status = 'OK' if status_code == 200 else f'Failed (Status Code: {status_code})'
+        except Exception as e:
+            status = f'Error: {str(e)}'
+            self.logging_manager.log_error(
+                f"API status check error for {endpoint_name}: {str(e)}",
+                "ERROR")
+        return {'status': status, 'expiry': time.time() + self.status_ttl}
+
     @staticmethod
     def _validate_cik(cik: str) -> bool:
         """
@@ -94,7 +143,7 @@ class Roster:
     # Additional methods for future use
     def get_api_status(self) -> dict:
         """
-        Retrieves the status of the API endpoints.
+        Retrieves the last known status of the API endpoints without sending any request.
         Returns:
             dict: The status of each API endpoint.
         """
@@ -115,6 +164,7 @@ class Roster:
         """
         if endpoint_name in self.api_endpoints:
             self.api_endpoints[endpoint_name] = url
+            self.endpoint_templates[endpoint_name] = url
             self.logging_manager.log(f"Endpoint {endpoint_name} updated",
                                      "INFO")
         else:
@@ -0,0 +1,80 @@
+"""
+Compare FinancialQueryBase.pivot_dataframe with the `pivot_table` it replaced on the preprocessed data
+under `data/`, checking that both give the same output.
+
+The stored filers are small, so each dataset can be stacked `--scale` times, shifting the period end of
+each copy by a day, to time a filer with a long history:
+
+    python -m benchmarks.pivot_benchmark --scale 200
+"""
+import argparse
+import os
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from app.services.functions import DataStorageManager
+from app.services.queries.base_tables import (ASSET_LIABILITIES, CASH_FLOW,
+                                              LIQUIDITY, PROFITABILITY)
+from app.services.queries.query_manager import LOCAL_QUERY_COLUMNS
+
+QUERIES = {
+    'Assets Liabilities': ASSET_LIABILITIES,
+    'Cash Flow': CASH_FLOW,
+    'Liquidity': LIQUIDITY,
+    'Profitability': PROFITABILITY,
+}
+INDEX_COLS = ['EntityName', 'CIK', 'end', 'year', 'quarter']
+
+
+def pivot_table(query, df):
+    pivot_df = df.pivot_table(index=INDEX_COLS,
+                              columns='Metric',
+                              values='val',
+                              fill_value=np.nan,
+                              observed=True).reset_index()
+    pivot_df.columns.name = None
+    for metric in query.metrics:
+        if metric not in pivot_df:
+            pivot_df[metric] = np.nan
+    return pivot_df
+
+
+def scale_up(df, scale):
+    copies = []
+    for copy in range(scale):
+        shifted = df.copy()
+        shifted['end'] = shifted['end'] + pd.Timedelta(days=copy)
+        copies.append(shifted)
+    return pd.concat(copies, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--scale', type=int, default=1,
+                        help='Stack each dataset this many times (default: 1).')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Timed runs per dataset; the best is reported (default: 20).')
+    args = parser.parse_args()
+
+    print(f"{'CIK':<12}{'category':<20}{'rows':>8}{'pivot_table ms':>16}{'scatter ms':>12}{'speedup':>9}")
+    for cik_number in sorted(os.listdir(args.data_dir)):
+        storage = DataStorageManager(args.data_dir, cik_number)
+        for category, query_class in QUERIES.items():
+            file_path = storage.get_latest_file_path(category, 'preprocessed_data')
+            if not file_path:
+                continue
+            df = scale_up(storage.load_data(file_path, columns=LOCAL_QUERY_COLUMNS), args.scale)
+            query = query_class()
+            pd.testing.assert_frame_equal(query.pivot_dataframe(df, INDEX_COLS), pivot_table(query, df))
+            before = min(timeit.repeat(lambda: pivot_table(query, df), number=1, repeat=args.repeat))
+            after = min(timeit.repeat(lambda: query.pivot_dataframe(df, INDEX_COLS), number=1,
+                                      repeat=args.repeat))
+            print(f'{cik_number:<12}{category:<20}{len(df):>8}{before * 1e3:>16.2f}{after * 1e3:>12.2f}'
+                  f'{before / after:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
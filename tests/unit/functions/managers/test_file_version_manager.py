@@ -1,30 +1,62 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, mock_open, patch
 
 from app.services.utils.file_version_control import FileVersionManager
 
+LEGACY_INDEX = """---
+title: CIK 123456 Data
+slug: /data/123456/processed_data/
+---
+
+### Cash Flow
+- [Cash Flow 20240101000000](data/123456/processed_data/Cash_Flow/123456_Cash_Flow_20240101000000.csv)
+
+"""
+
 
 class TestFileVersionManager(unittest.TestCase):
-    @patch('app.services.utils.file_version_control.os.makedirs')
-    @patch('app.services.utils.file_version_control.open', new_callable=mock_open, read_data="Existing content")
-    def test_update_index(self, mock_open, mock_makedirs):
-        # Setup
-        base_dir = "/fake/base/dir"
-        manager = FileVersionManager(base_dir)
-
-        # Dummy arguments for update_index method
-        cik_number = "123456"
-        category = "test_category"
-        file_name = "test_file.txt"
-        storage_type = "test_storage"
-
-        # Call the method under test
-        manager.update_index(cik_number, category, file_name, storage_type)
-
-        # Assertions to verify that directories were created and files were written as expected
-        mock_makedirs.assert_called_once()
-        mock_open.assert_called_once_with(f"{base_dir}/{cik_number}/{storage_type}/index.md", 'w')
-        # Add more assertions here to verify the behavior of update_index method
+    def setUp(self):
+        self.base_dir = tempfile.TemporaryDirectory()
+        self.index_dir = os.path.join(self.base_dir.name, "123456", "processed_data")
+
+    def tearDown(self):
+        self.base_dir.cleanup()
+
+    def test_update_index(self):
+        manager = FileVersionManager(self.base_dir.name)
+
+        manager.update_index("123456", "Cash Flow", "123456_Cash_Flow_20240101000000.parquet", "processed_data")
+        manager.update_index("123456", "Liquidity", "123456_Liquidity_20240101000000.parquet", "processed_data")
+        manager.update_index("123456", "Cash Flow", "123456_Cash_Flow_20240102000000.parquet", "processed_data")
+
+        self.assertEqual(manager.categories("123456", "processed_data"), ["Cash Flow", "Liquidity"])
+        entry = manager.read_index("123456", "processed_data")["Cash Flow"]
+        self.assertEqual(entry["version"], "20240102000000")
+        self.assertEqual(entry["path"], "data/123456/processed_data/Cash_Flow/123456_Cash_Flow_20240102000000.parquet")
+        self.assertFalse(os.path.exists(os.path.join(self.index_dir, "index.md")))
+
+        manager.compact_index("123456", "processed_data")
+        with open(os.path.join(self.index_dir, "index.jsonl")) as file:
+            self.assertEqual(len(file.readlines()), 2)
+
+    def test_markdown_is_an_optional_view(self):
+        FileVersionManager(self.base_dir.name, render_markdown=True).update_index(
+            "123456", "Cash Flow", "123456_Cash_Flow_20240101000000.csv", "processed_data")
+        with open(os.path.join(self.index_dir, "index.md")) as file:
+            self.assertEqual(file.read(), LEGACY_INDEX)
+
+    def test_legacy_markdown_index_is_read_and_carried_over(self):
+        os.makedirs(self.index_dir)
+        with open(os.path.join(self.index_dir, "index.md"), "w") as file:
+            file.write(LEGACY_INDEX)
+        manager = FileVersionManager(self.base_dir.name)
+        self.assertEqual(manager.categories("123456", "processed_data"), ["Cash Flow"])
+
+        manager.update_index("123456", "Liquidity", "123456_Liquidity_20240102000000.parquet", "processed_data")
+
+        self.assertEqual(manager.categories("123456", "processed_data"), ["Cash Flow", "Liquidity"])
+
 
 if __name__ == '__main__':
     unittest.main()
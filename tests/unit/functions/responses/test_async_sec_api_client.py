@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+
+from app.services.functions import AsyncSECAPIClient
+
+COMPANY_FACTS = {
+    'cik': 320193,
+    'entityName': 'Apple Inc.',
+    'facts': {
+        'us-gaap': {
+            'AssetsCurrent': {
+                'units': {
+                    'USD': [{
+                        'end': '2099-03-30', 'val': 10, 'accn': 'a', 'fy': 2099,
+                        'fp': 'Q2', 'form': '10-Q', 'filed': '2099-05-01', 'frame': 'CY2099Q1I'
+                    }]
+                }
+            }
+        }
+    }
+}
+
+
+class TestAsyncSECAPIClient(unittest.TestCase):
+    def test_fetch_company_facts_many(self):
+        client = AsyncSECAPIClient(max_concurrency=2, use_http_cache=False)
+        with patch.object(AsyncSECAPIClient, '_send_get_request_async',
+                          new_callable=AsyncMock, return_value=COMPANY_FACTS) as mock_send:
+            results = asyncio.run(
+                client.fetch_company_facts_many(['0000320193', '0000789019', 'bad']))
+        client.close()
+
+        self.assertEqual(mock_send.await_count, 2)
+        self.assertIsInstance(results['0000320193'], pd.DataFrame)
+        self.assertEqual(results['0000789019']['Metric'].tolist(), ['AssetsCurrent'])
+        self.assertIn('error', results['bad'])
+
+
+if __name__ == '__main__':
+    unittest.main()
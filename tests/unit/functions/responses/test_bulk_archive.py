@@ -0,0 +1,86 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.services import generate_data_from_archive
+from app.services.functions import CompanyFactsArchive, SECAPIClient
+from app.services.service_manager import DataPipelineIntegration
+
+
+def _company_facts(cik, name):
+    end = f'{datetime.datetime.now().year - 1}-12-31'
+    return {
+        'cik': int(cik),
+        'entityName': name,
+        'facts': {
+            'us-gaap': {
+                'Assets': {
+                    'units': {
+                        'USD': [{
+                            'end': end, 'val': 100, 'accn': '0000320193-23-000106',
+                            'fy': 2023, 'fp': 'FY', 'form': '10-K',
+                            'filed': end, 'frame': 'CY2023Q4I'
+                        }]
+                    }
+                }
+            }
+        }
+    }
+
+
+class TestCompanyFactsArchive(unittest.TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.archive_dir.name, 'companyfacts.zip')
+        self.documents = {
+            '0000320193': _company_facts('0000320193', 'Apple Inc.'),
+            '0000789019': _company_facts('0000789019', 'Microsoft Corp'),
+        }
+        with zipfile.ZipFile(self.archive_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for cik, document in self.documents.items():
+                archive.writestr(f'CIK{cik}.json', json.dumps(document))
+            archive.writestr('CIK0000000001.json', '{not json')
+        self.client = SECAPIClient(use_http_cache=False)
+        self.archive = CompanyFactsArchive(self.archive_path, self.client)
+
+    def tearDown(self):
+        self.client.close()
+        self.archive_dir.cleanup()
+
+    def test_list_ciks(self):
+        self.assertEqual(self.archive.list_ciks(), ['0000320193', '0000789019', '0000000001'])
+
+    def test_members_parse_like_the_api(self):
+        results = dict(self.archive.iter_company_facts(['0000320193']))
+
+        self.assertEqual(list(results), ['0000320193'])
+        expected = self.client._parse_response(self.documents['0000320193'], 'company_facts')
+        pd.testing.assert_frame_equal(results['0000320193'], expected)
+
+    def test_bad_and_missing_members_return_errors(self):
+        self.assertIn('error', self.archive.fetch_company_facts('0000000001'))
+        self.assertIn('error', self.archive.fetch_company_facts('0000000002'))
+
+    @patch.object(DataPipelineIntegration, 'transform_and_store_json')
+    @patch.object(DataPipelineIntegration, 'process_and_store_data',
+                  side_effect=[None, {'error': 'Error processing data: disk full'}])
+    @patch.object(DataPipelineIntegration, 'preprocess_data', return_value={})
+    def test_failed_stages_are_reported(self, mock_preprocess, mock_process, mock_transform):
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = generate_data_from_archive(self.archive_path, local_storage_dir=data_dir)
+
+        self.assertIs(results['0000320193'], True)
+        self.assertEqual(results['0000789019'], {'error': 'Error processing data: disk full'})
+        self.assertIn('error', results['0000000001'])
+        # The failed company is not transformed
+        self.assertEqual(mock_transform.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import itertools
+import json
+import os
+import tempfile
+import unittest
+from contextlib import closing
+from unittest.mock import MagicMock, patch
+
+from app.services.functions import SECAPIClient
+from app.services.functions.responses.cache import HTTPResponseCache
+
+URL = 'https://data.sec.gov/api/xbrl/companyfacts/CIK0000320193.json'
+BODY = json.dumps({'cik': 320193, 'entityName': 'Apple Inc.'}).encode()
+
+
+def _response(status_code, body=b'', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = body
+    response.headers = headers or {}
+    response.json.side_effect = lambda: json.loads(body)
+    return response
+
+
+class TestHTTPResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.cache_dir.name, 'http_cache.sqlite')
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_store_and_get_round_trip(self):
+        cache = HTTPResponseCache(self.cache_path)
+        self.assertIsNone(cache.get(URL))
+        cache.store(URL, BODY, '"abc"', 'Mon, 01 Jan 2024 00:00:00 GMT')
+
+        entry = HTTPResponseCache(self.cache_path).get(URL)
+        self.assertEqual(entry['body'], BODY)
+        self.assertEqual(HTTPResponseCache.conditional_headers(entry), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        })
+
+    @patch('app.services.functions.responses.sec_api_client.requests.Session.get')
+    def test_not_modified_response_reuses_cached_body(self, mock_get):
+        mock_get.side_effect = [
+            _response(200, BODY, {'ETag': '"abc"'}),
+            _response(304),
+        ]
+        with SECAPIClient(http_cache_path=self.cache_path) as client:
+            first = client._send_get_request(URL)
+            second = client._send_get_request(URL)
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_args_list[0].kwargs['headers'], {})
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers'], {'If-None-Match': '"abc"'})
+
+    def _stored_urls(self, cache):
+        with closing(cache._connect()) as conn:
+            return {url for url, in conn.execute('SELECT url FROM responses')}
+
+    @patch('app.services.functions.responses.cache.time.time', side_effect=itertools.count())
+    def test_least_recently_used_entries_are_evicted(self, mock_time):
+        cache = HTTPResponseCache(self.cache_path, max_entries=2)
+        cache.store(URL + '?1', BODY, '"1"', None)
+        cache.store(URL + '?2', BODY, '"2"', None)
+        cache.touch(URL + '?1')
+        cache.store(URL + '?3', BODY, '"3"', None)
+
+        self.assertEqual(self._stored_urls(cache), {URL + '?1', URL + '?3'})
+
+    @patch('app.services.functions.responses.cache.time.time', side_effect=itertools.count())
+    def test_cache_shrinks_to_max_bytes(self, mock_time):
+        bodies = {f'{URL}?{number}': os.urandom(1000) for number in range(5)}
+        cache = HTTPResponseCache(self.cache_path, max_bytes=None)
+        for url, body in bodies.items():
+            cache.store(url, body, '"etag"', None)
+        self.assertEqual(self._stored_urls(cache), set(bodies))
+
+        cache.max_bytes = 2500
+        cache.store(URL, BODY, '"abc"', None)
+
+        with closing(cache._connect()) as conn:
+            total_bytes, = conn.execute('SELECT SUM(LENGTH(body)) FROM responses').fetchone()
+        self.assertLessEqual(total_bytes, 2500)
+        self.assertEqual(self._stored_urls(cache), {URL, f'{URL}?4', f'{URL}?3'})
+
+
+if __name__ == '__main__':
+    unittest.main()
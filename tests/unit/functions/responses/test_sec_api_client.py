@@ -11,7 +11,7 @@ from app.services.functions import SECAPIClient
 
 
 class TestSECAPIClient(unittest.TestCase):
-    @patch('app.services.functions.responses.sec_api_client.requests.get')
+    @patch('app.services.functions.responses.sec_api_client.requests.Session.get')
     @patch('app.services.functions.responses.sec_api_client.CacheManager')
     def test_fetch_company_tickers(self, mock_cache, mock_get):
         # Setup: Prepare mock responses
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+
+from app.services.functions import AsyncSECAPIClient, SECAPIClient
+from app.services.utils import CircuitBreaker, RetryPolicy, TokenBucket
+
+BODY = json.dumps({'ok': True}).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers each path with the next status of its script, then 200 once the script runs out."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+            script = self.server.scripts.get(self.path, [])
+            status = script.pop(0) if script else 200
+        self.send_response(status)
+        if status == 503:
+            self.send_header('Retry-After', '0')
+        body = BODY if status == 200 else b'{}'
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSECAPIClientRetries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        cls.server.lock = threading.Lock()
+        cls.server.hits = {}
+        cls.server.scripts = {}
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.host = f'127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _client(self, client_class=SECAPIClient, failure_threshold=5):
+        return client_class(use_http_cache=False,
+                            rate_limiter=TokenBucket(rate=1000),
+                            retry_policy=RetryPolicy(max_retries=2, backoff_factor=0),
+                            circuit_breaker=CircuitBreaker(failure_threshold=failure_threshold))
+
+    def test_transient_failures_are_retried(self):
+        self.server.scripts['/transient'] = [503, 500]
+        with self._client() as client:
+            self.assertEqual(client._send_get_request(f'{self.base_url}/transient'), {'ok': True})
+            metrics = client.request_metrics.snapshot()[self.host]
+
+        self.assertEqual(self.server.hits['/transient'], 3)
+        self.assertEqual(metrics['attempts'], 3)
+        self.assertEqual(metrics['retries'], 2)
+        self.assertEqual((metrics['status_503'], metrics['status_500'], metrics['status_200']), (1, 1, 1))
+
+    def test_client_errors_are_not_retried(self):
+        self.server.scripts['/missing'] = [404]
+        with self._client() as client:
+            self.assertIn('error', client._send_get_request(f'{self.base_url}/missing'))
+
+        self.assertEqual(self.server.hits['/missing'], 1)
+
+    def test_exhausted_retries_open_the_circuit(self):
+        self.server.scripts['/down'] = [500] * 3
+        with self._client(failure_threshold=3) as client:
+            self.assertIn('error', client._send_get_request(f'{self.base_url}/down'))
+            self.assertTrue(client.circuit_breaker.is_open(self.host))
+            self.assertIn('Circuit open', client._send_get_request(f'{self.base_url}/other')['error'])
+            metrics = client.request_metrics.snapshot()[self.host]
+
+        self.assertEqual(self.server.hits['/down'], 3)
+        self.assertNotIn('/other', self.server.hits)
+        self.assertEqual(metrics['circuit_open'], 1)
+
+    def test_async_client_retries(self):
+        self.server.scripts['/async'] = [503]
+
+        async def fetch(client):
+            async with aiohttp.ClientSession() as session:
+                return await client._send_get_request_async(session, f'{self.base_url}/async')
+
+        with self._client(AsyncSECAPIClient) as client:
+            self.assertEqual(asyncio.run(fetch(client)), {'ok': True})
+            self.assertEqual(client.request_metrics.snapshot()[self.host]['retries'], 1)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_is_jittered_and_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for attempt in range(6):
+            self.assertTrue(0 <= policy.backoff(attempt) <= min(5, 2**attempt))
+        self.assertEqual(policy.backoff(0, retry_after=3), 3)
+        self.assertEqual(policy.backoff(0, retry_after=60), 5)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(RetryPolicy.parse_retry_after('2'), 2.0)
+        self.assertLess(RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
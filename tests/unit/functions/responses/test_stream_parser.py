@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from app.services.functions import SECAPIClient
+from app.services.functions.responses.stream_parser import CompanyFactsStreamParser
+
+URL = 'https://data.sec.gov/api/xbrl/companyfacts/CIK0000320193.json'
+RECENT = f'{datetime.now().year - 1}-12-31'
+DOCUMENT = {
+    'cik': 320193,
+    'entityName': 'Apple Inc.',
+    'facts': {
+        'dei': {'EntityPublicFloat': {'units': {'USD': [{'end': RECENT, 'val': 9}]}}},
+        'us-gaap': {
+            'Assets': {
+                'label': 'Assets "total" [x] {y}',
+                'description': 'Escapes \\ and unicode ☃',
+                'units': {'USD': [
+                    {'end': '2001-12-31', 'val': 1, 'fy': 2002},
+                    {'end': RECENT, 'val': 2.5e10, 'fy': 2023, 'frame': 'CY2023Q4I'},
+                ]}
+            },
+            'EarningsPerShareBasic': {'units': {'USD/shares': [{'end': RECENT, 'val': 6.13}]}},
+            'Revenues': {'units': {'USD': [
+                {'start': '2023-01-01', 'end': RECENT, 'val': 383285000000, 'fy': 2023},
+            ]}},
+        }
+    }
+}
+BODY = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+
+
+def _chunks(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def _streaming_response(status_code, body=b'', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_content.side_effect = lambda size: iter(_chunks(body, size))
+    response.__enter__.return_value = response
+    return response
+
+
+class TestCompanyFactsStreamParser(unittest.TestCase):
+    def test_yields_usd_facts_of_wanted_metrics(self):
+        parser = CompanyFactsStreamParser(_chunks(BODY, 1), metrics={'Assets', 'EarningsPerShareBasic'})
+
+        chunks = list(parser)
+
+        self.assertEqual([(metric, unit) for metric, unit, _ in chunks], [('Assets', 'USD')])
+        self.assertEqual(chunks[0][2], DOCUMENT['facts']['us-gaap']['Assets']['units']['USD'])
+        self.assertEqual((parser.cik, parser.entity_name), (320193, 'Apple Inc.'))
+
+    def test_invalid_documents_raise(self):
+        for body in [b'{"cik": 1,', b'{"cik": 1} x', b'[1]', b'{"facts": {"us-gaap": {"A": {"units": {"USD": [1,]}}}}}']:
+            with self.assertRaises(ValueError):
+                list(CompanyFactsStreamParser(_chunks(body, 3)))
+
+
+class TestSECAPIClientStreaming(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.cache_dir.name, 'http_cache.sqlite')
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_stream_parse_matches_full_parse(self):
+        with SECAPIClient(use_http_cache=False) as client:
+            expected = client._parse_response(json.loads(BODY), 'company_facts')
+            for size in (1, 7, 4096):
+                pd.testing.assert_frame_equal(client._parse_company_facts_stream(_chunks(BODY, size)), expected)
+
+    @patch('app.services.functions.responses.sec_api_client.requests.Session.get')
+    def test_streamed_body_is_cached_and_revalidated(self, mock_get):
+        mock_get.side_effect = [
+            _streaming_response(200, BODY, {'ETag': '"abc"'}),
+            _streaming_response(304),
+        ]
+        with SECAPIClient(http_cache_path=self.cache_path) as client:
+            first = client.fetch_company_facts('0000320193', stream=True)
+            second = client.fetch_company_facts('0000320193', stream=True)
+            self.assertEqual(client.http_cache.get(URL)['body'], BODY)
+
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(first['Metric'].tolist(), ['Assets', 'Revenues'])
+        self.assertTrue(mock_get.call_args_list[0].kwargs['stream'])
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers'], {'If-None-Match': '"abc"'})
+
+
+if __name__ == '__main__':
+    unittest.main()
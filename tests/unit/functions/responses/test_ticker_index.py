@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from app.services.functions import SECAPIClient, TickerIndex
+
+RESPONSE = {
+    '0': {'cik_str': 320193, 'ticker': 'AAPL', 'title': 'Apple Inc.'},
+    '1': {'cik_str': 789019, 'ticker': 'MSFT', 'title': 'MICROSOFT CORP'},
+    '2': {'cik_str': 1067983, 'ticker': 'BRK-B', 'title': 'BERKSHIRE HATHAWAY INC'},
+    '3': {'cik_str': 1067983, 'ticker': 'BRK-A', 'title': 'BERKSHIRE HATHAWAY INC'},
+    '4': {'cik_str': 827054, 'ticker': 'MCHP', 'title': 'MICROCHIP TECHNOLOGY INC'},
+}
+
+
+class TestTickerIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TickerIndex.from_response(RESPONSE)
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.cache_dir.name, 'company_tickers.json')
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_lookups(self):
+        self.assertEqual(self.index.lookup_ticker('msft'), '0000789019')
+        self.assertEqual(self.index.lookup_cik('1067983'), ['BRK-B', 'BRK-A'])
+        self.assertEqual(self.index.resolve(' aapl '), '0000320193')
+        self.assertEqual(self.index.resolve('320193'), '0000320193')
+        self.assertIsNone(self.index.resolve('NOPE'))
+
+    def test_unlisted_cik_resolves(self):
+        # Filers without a ticker, such as funds or delisted companies, are not in the index
+        self.assertEqual(self.index.lookup_cik('12345'), [])
+        self.assertEqual(self.index.resolve('12345'), '0000012345')
+        self.assertEqual(self.index.resolve('0000012345'), '0000012345')
+        self.assertIsNone(self.index.resolve('12345678901'))
+
+    def test_prefix_search(self):
+        self.assertEqual([match['ticker'] for match in self.index.search('micro')], ['MCHP', 'MSFT'])
+        self.assertEqual(len(self.index.search('micro', limit=1)), 1)
+        self.assertEqual(self.index.search('zzz'), [])
+
+    def test_save_and_load_respect_ttl(self):
+        self.index.save(self.path)
+        loaded = TickerIndex.load(self.path, ttl=60)
+        self.assertEqual(len(loaded), 5)
+        self.assertEqual(loaded.lookup_ticker('BRK-A'), '0001067983')
+
+        stale = TickerIndex.from_response(RESPONSE)
+        stale.fetched_at = time.time() - 120
+        stale.save(self.path)
+        self.assertIsNone(TickerIndex.load(self.path, ttl=60))
+        self.assertIsNone(TickerIndex.load(os.path.join(self.cache_dir.name, 'missing.json')))
+
+    def test_client_downloads_once_then_reads_from_disk(self):
+        with patch.object(SECAPIClient, '_send_get_request', return_value=RESPONSE) as mock_send:
+            with SECAPIClient(use_http_cache=False) as client:
+                self.assertEqual(client.get_ticker_index(self.path).resolve('AAPL'), '0000320193')
+            with SECAPIClient(use_http_cache=False) as client:
+                self.assertEqual(client.get_ticker_index(self.path).resolve('MSFT'), '0000789019')
+                self.assertEqual(list(client._parse_response(RESPONSE, 'tickers').columns),
+                                 ['cik', 'ticker', 'title'])
+
+        mock_send.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -5,6 +7,7 @@ import pandas as pd
 
 from app.services.functions import DataStorageManager, LoggingManager
 from app.services.types import QueryFolderMapping
+from app.services.utils import apply_fact_dtypes
 
 
 class TestDataStorageManager(unittest.TestCase):
@@ -32,29 +35,36 @@ class TestDataStorageManager(unittest.TestCase):
         file_name = self.manager._generate_file_name(category_name, timestamp, extension)
         self.assertEqual(file_name, expected_file_name)
 
+    @patch('app.services.utils.DataManifest.record')
     @patch('pandas.DataFrame.to_csv')
     @patch('app.services.functions.storages.local_data_storage.DataStorageManager._create_directory_path')
     @patch('app.services.functions.storages.local_data_storage.DataStorageManager._generate_file_name')
     @patch('app.services.utils.now', return_value="20240101_120000")
-    def test_store_data(self, mock_now, mock_generate_file_name, mock_create_directory_path, mock_to_csv):
+    def test_store_data(self, mock_now, mock_generate_file_name, mock_create_directory_path, mock_to_csv,
+                        mock_record):
         mock_generate_file_name.return_value = "filename.csv"
         mock_create_directory_path.return_value = "/some/path"
         data = pd.DataFrame({'column1': [1, 2, 3]})
-        file_name = self.manager.store_data(data, "preprocessed_data")
+        manager = DataStorageManager(self.local_storage_dir, self.cik_number, storage_format='csv')
+        file_name = manager.store_data(data, "preprocessed_data")
         mock_to_csv.assert_called_once()
+        mock_record.assert_called_once_with(self.cik_number, "preprocessed_data", None, "filename.csv")
         self.assertEqual(file_name, "filename.csv")
 
+    @patch('app.services.utils.DataManifest.record')
     @patch('json.dump')
     @patch('builtins.open', new_callable=MagicMock)
     @patch('app.services.functions.storages.local_data_storage.DataStorageManager._create_directory_path')
     @patch('app.services.functions.storages.local_data_storage.DataStorageManager._generate_file_name')
     @patch('app.services.utils.now', return_value="20240101_120000")
-    def test_store_json_data(self, mock_now, mock_generate_file_name, mock_create_directory_path, mock_open, mock_json_dump):
+    def test_store_json_data(self, mock_now, mock_generate_file_name, mock_create_directory_path, mock_open, mock_json_dump,
+                             mock_record):
         mock_generate_file_name.return_value = "filename.json"
         mock_create_directory_path.return_value = "/some/path"
         json_data = {"key": "value"}
         file_name = self.manager.store_json_data(json_data, "preprocessed_data")
         mock_json_dump.assert_called_once()
+        mock_record.assert_called_once_with(self.cik_number, "preprocessed_data", None, "filename.json", None)
         self.assertEqual(file_name, "filename.json")
 
     @patch('app.services.functions.managers.logging_manager.LoggingManager.log_error')
@@ -63,8 +73,8 @@ class TestDataStorageManager(unittest.TestCase):
         query_name = "non_existing_query"
         data_type = "preprocessed_data"
         # Simulate no folder mapping found
-        QueryFolderMapping.get_folder_name = MagicMock(return_value=None)
-        dir_path = self.manager._get_directory_path(query_name, data_type)
+        with patch.object(QueryFolderMapping, 'get_folder_name', return_value=None):
+            dir_path = self.manager._get_directory_path(query_name, data_type)
         self.assertIsNone(dir_path)
         mock_log_error.assert_called_once()
 
@@ -75,8 +85,8 @@ class TestDataStorageManager(unittest.TestCase):
         data_type = "processed_data"
         expected_dir_path = f"{self.local_storage_dir}/{self.cik_number}/{data_type}/folder_name"
         # Mock folder mapping
-        QueryFolderMapping.get_folder_name = MagicMock(return_value="folder_name")
-        dir_path = self.manager._get_directory_path(query_name, data_type)
+        with patch.object(QueryFolderMapping, 'get_folder_name', return_value="folder_name"):
+            dir_path = self.manager._get_directory_path(query_name, data_type)
         self.assertEqual(dir_path, expected_dir_path)
 
     @patch('os.listdir', return_value=[])
@@ -110,5 +120,48 @@ class TestDataStorageManager(unittest.TestCase):
         mock_log_error.assert_called_once()
 
 
+class TestDataStorageManagerFormats(unittest.TestCase):
+    def setUp(self):
+        self.storage_dir = tempfile.TemporaryDirectory()
+        self.data = apply_fact_dtypes(pd.DataFrame({
+            'Metric': ['Assets', 'Assets', 'Liabilities'],
+            'CIK': [1234] * 3,
+            'end': pd.to_datetime(['2022-12-31', '2023-12-31', '2023-12-31']),
+            'year': [2022, 2023, 2023],
+            'val': [1.5, 2.5, 3.5]
+        }))
+
+    def tearDown(self):
+        self.storage_dir.cleanup()
+
+    def _store(self, storage_format):
+        manager = DataStorageManager(self.storage_dir.name, '0000001234', storage_format)
+        file_name = manager.store_data(self.data, 'preprocessed_data', 'Assets Liabilities')
+        return os.path.join(self.storage_dir.name, '0000001234', 'preprocessed_data', 'Assets_Liabilities',
+                            file_name)
+
+    def test_parquet_keeps_dtypes(self):
+        file_path = self._store('parquet')
+        self.assertTrue(file_path.endswith('.parquet'))
+        pd.testing.assert_frame_equal(DataStorageManager.load_data(file_path), self.data)
+
+    def test_projection_and_filters_match_across_formats(self):
+        filters = [('year', '>=', 2023), ('Metric', 'in', ['Assets'])]
+        from_parquet = DataStorageManager.load_data(self._store('parquet'), columns=['Metric', 'val'],
+                                                    filters=filters)
+        from_csv = DataStorageManager.load_data(self._store('csv'), columns=['Metric', 'val'], filters=filters)
+        expected = pd.DataFrame({'Metric': pd.Categorical(['Assets'], categories=['Assets', 'Liabilities']),
+                                 'val': [2.5]})
+        pd.testing.assert_frame_equal(from_parquet, expected)
+        pd.testing.assert_frame_equal(from_csv, expected)
+
+    def test_csv_is_read_back_with_fact_dtypes(self):
+        pd.testing.assert_frame_equal(DataStorageManager.load_data(self._store('csv')), self.data)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            DataStorageManager(self.storage_dir.name, '0000001234', 'xlsx')
+
+
 if __name__ == '__main__':
     unittest.main()
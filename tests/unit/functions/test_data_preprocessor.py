@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from app.services.functions.data.pre_processing import (AnnualDataProcessor,
+                                                        QuarterlyDataProcessor)
+from app.services.functions.data.processing.preprocessor import \
+    DataPreprocessor
+from app.services.functions.data.processing.processor import DataProcessor
+from app.services.queries import QueryExecutor
+
+CATEGORY_METRIC_MAP = {
+    'Assets Liabilities': ['AssetsCurrent', 'LiabilitiesCurrent'],
+    'Liquidity': ['AssetsCurrent', 'Cash'],
+    'Cash Flow': ['NetCashProvidedByOperatingActivities'],
+}
+
+
+def make_raw_data():
+    rows = []
+    for metric in ['AssetsCurrent', 'LiabilitiesCurrent', 'Cash', 'NetCashProvidedByOperatingActivities', 'Other']:
+        for year in (2022, 2021):
+            for quarter in (4, 1):
+                rows.append({'Metric': metric, 'CIK': 1234, 'EntityName': 'TEST CO', 'end': f'{year}-12-31',
+                             'val': float(year * 10 + quarter), 'accn': 'a', 'fy': year, 'fp': f'Q{quarter}',
+                             'form': '10-Q', 'filed': f'{year + 1}-02-01', 'frame': f'CY{year}Q{quarter}I'})
+            rows.append({'Metric': metric, 'CIK': 1234, 'EntityName': 'TEST CO', 'end': f'{year}-12-31',
+                         'val': float(year), 'accn': 'a', 'fy': year, 'fp': 'FY', 'form': '10-K',
+                         'filed': f'{year + 1}-02-01', 'frame': f'CY{year}'})
+    return pd.DataFrame(rows)
+
+
+class TestDataPreprocessor(unittest.TestCase):
+    def setUp(self):
+        self.stored = {}
+        storage = MagicMock()
+        storage.store_data.side_effect = self._store_data
+        self.preprocessor = DataPreprocessor(storage, MagicMock(), MagicMock())
+
+    def _store_data(self, data, storage_type, category):
+        self.stored[category] = data
+        return f'{category}.parquet'
+
+    def test_categories_match_processing_each_on_its_own(self):
+        raw_data = make_raw_data()
+        self.preprocessor.preprocess_data(raw_data, CATEGORY_METRIC_MAP, False, '0000001234')
+
+        self.assertEqual(set(self.stored), set(CATEGORY_METRIC_MAP))
+        for category, metrics in CATEGORY_METRIC_MAP.items():
+            processor_class = AnnualDataProcessor if category == 'Cash Flow' else QuarterlyDataProcessor
+            pd.testing.assert_frame_equal(self.stored[category], processor_class(raw_data).process_data(metrics))
+
+    def test_raw_data_is_filtered_once_per_processor(self):
+        with patch.object(QuarterlyDataProcessor, 'extract_quarter', autospec=True,
+                          side_effect=QuarterlyDataProcessor.extract_quarter) as mock_extract_quarter:
+            self.preprocessor.preprocess_data(make_raw_data(), CATEGORY_METRIC_MAP, False, '0000001234')
+
+        mock_extract_quarter.assert_called_once()
+        prepared_metrics = set(mock_extract_quarter.call_args.args[1]['Metric'])
+        self.assertEqual(prepared_metrics, {'AssetsCurrent', 'LiabilitiesCurrent', 'Cash'})
+
+    def test_background_writes_return_frames_first(self):
+        self.preprocessor.persist_in_background = True
+        frames = self.preprocessor.preprocess_data(make_raw_data(), CATEGORY_METRIC_MAP, False, '0000001234')
+
+        self.assertIsNone(self.preprocessor.wait_for_writes())
+        self.assertEqual(set(frames), set(CATEGORY_METRIC_MAP))
+        for category, frame in frames.items():
+            self.assertIs(self.stored[category], frame)
+
+    def test_background_write_errors_are_reported(self):
+        self.preprocessor.persist_in_background = True
+        self.preprocessor.data_storage_manager.store_data.side_effect = OSError('disk full')
+        self.preprocessor.preprocess_data(make_raw_data(), CATEGORY_METRIC_MAP, False, '0000001234')
+
+        self.assertEqual(self.preprocessor.wait_for_writes()['error'], '; '.join(['disk full'] * 3))
+
+
+class TestInMemoryHandoff(unittest.TestCase):
+    def test_local_queries_run_on_handed_off_frames(self):
+        storage = MagicMock()
+        storage.store_data.return_value = 'processed.parquet'
+        preprocessed = DataPreprocessor(MagicMock(), MagicMock(), MagicMock()).preprocess_data(
+            make_raw_data(), {'Cash Flow': ['NetCashProvidedByOperatingActivities']}, False, '0000001234')
+        processor = DataProcessor(storage, MagicMock(), QueryExecutor(None, storage), MagicMock())
+
+        processor.process_and_store_data({'Cash Flow': ['NetCashProvidedByOperatingActivities']}, False,
+                                         '0000001234', preprocessed_frames=preprocessed)
+
+        storage.get_latest_file_path.assert_not_called()
+        storage.load_data.assert_not_called()
+        stored = storage.store_data.call_args.args[0]
+        self.assertEqual(stored['Year'].tolist(), [2021, 2022])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.services.functions.data.pre_processing import (AnnualDataProcessor,
+                                                        QuarterlyDataProcessor)
+from app.services.utils import QUARTER_DTYPE
+
+
+class TestFrameParsing(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'val': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            'frame': ['CY2021Q4I', 'CY2020', np.nan, 'CY2021Q1', 'CY2019Q2I', 'CY2020'],
+        })
+
+    def test_extract_quarter(self):
+        result = QuarterlyDataProcessor(self.df).extract_quarter(self.df)
+
+        self.assertEqual(result['val'].tolist(), [1.0, 4.0, 5.0])
+        self.assertEqual(result['year'].dtype, np.int32)
+        self.assertEqual(result['year'].tolist(), [2021, 2021, 2019])
+        self.assertEqual(result['quarter'].dtype, QUARTER_DTYPE)
+        self.assertEqual(result['quarter'].tolist(), ['Q4', 'Q1', 'Q2'])
+        self.assertIn('frame', result.columns)
+
+    def test_extract_year(self):
+        df = self.df.dropna(subset=['frame'])
+        result = AnnualDataProcessor(df).extract_year(df)
+
+        self.assertEqual(result['year'].tolist(), [2021, 2020, 2021, 2019, 2020])
+        # Only an exact quarter suffix is a quarter; instants and full years are fiscal years
+        self.assertEqual(result['quarter'].tolist(), ['FY', 'FY', 'Q1', 'FY', 'FY'])
+        self.assertNotIn('frame', result.columns)
+
+    def test_sort_orders_quarters_before_full_year(self):
+        df = pd.DataFrame({'val': [1.0, 2.0, 3.0],
+                           'frame': ['CY2020', 'CY2020Q3', 'CY2019Q4']})
+        processor = AnnualDataProcessor(df)
+        result = processor.sort_dataframe(processor.extract_year(df))
+
+        self.assertEqual(result['val'].tolist(), [3.0, 2.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from app.services.functions import SECAPIClient
+
+
+class TestSECAPIClientSession(unittest.TestCase):
+    def setUp(self):
+        self.client = SECAPIClient(pool_connections=2, pool_maxsize=16, use_http_cache=False)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_session_is_pooled_and_compressed(self):
+        adapter = self.client.session.get_adapter('https://data.sec.gov')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(self.client.session.headers['Accept-Encoding'], 'gzip, deflate')
+        self.assertEqual(self.client.session.headers['Connection'], 'keep-alive')
+        self.assertIn('User-Agent', self.client.session.headers)
+
+    @patch('app.services.functions.responses.sec_api_client.requests.Session.get')
+    def test_requests_share_the_session(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {'ok': True}
+        mock_response.headers = {}
+        mock_get.return_value = mock_response
+
+        self.client._send_get_request('https://data.sec.gov/a.json')
+        self.client._send_get_request('https://data.sec.gov/b.json')
+
+        self.assertEqual(mock_get.call_count, 2)
+        mock_get.assert_called_with('https://data.sec.gov/b.json', headers={}, timeout=self.client.timeout)
+
+
+class TestSECAPIClientParseCompanyFacts(unittest.TestCase):
+    def setUp(self):
+        self.client = SECAPIClient(use_http_cache=False)
+        self.recent = f'{datetime.now().year - 1}-12-31'
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_flattens_usd_facts_within_ten_years(self):
+        response = {
+            'entityName': 'Apple Inc.',
+            'cik': 320193,
+            'facts': {
+                'us-gaap': {
+                    'Assets': {'units': {'USD': [
+                        {'end': '2000-12-31', 'val': 1, 'fy': 2000},
+                        {'end': self.recent, 'val': 2, 'fy': 2023, 'frame': 'CY2023Q4I'},
+                    ]}},
+                    'Revenues': {'units': {'USD': [
+                        {'start': '2023-01-01', 'end': self.recent, 'val': 3, 'fy': 2023},
+                    ]}},
+                    'EntityCommonStockSharesOutstanding': {'units': {'shares': [
+                        {'end': self.recent, 'val': 4, 'fy': 2023},
+                    ]}},
+                }
+            }
+        }
+
+        parsed = self.client._parse_response(response, 'company_facts')
+
+        self.assertEqual(list(parsed.columns),
+                         ['EntityName', 'CIK', 'Metric', 'end', 'val', 'fy', 'frame', 'start'])
+        self.assertEqual(parsed['Metric'].tolist(), ['Assets', 'Revenues'])
+        self.assertEqual(parsed['val'].tolist(), [2, 3])
+        self.assertTrue((parsed['CIK'] == 320193).all())
+
+    def test_metric_allow_list_skips_other_concepts(self):
+        response = {'entityName': 'Apple Inc.', 'cik': 320193, 'facts': {'us-gaap': {
+            metric: {'units': {'USD': [{'end': self.recent, 'val': 1}]}}
+            for metric in ['Assets', 'AssetsCurrent', 'Goodwill', 'NetIncomeLoss']}}}
+
+        parsed = self.client._parse_response(response, 'company_facts',
+                                             metrics=['NetIncomeLoss', 'Assets', 'Missing'])
+
+        self.assertEqual(parsed['Metric'].tolist(), ['Assets', 'NetIncomeLoss'])
+
+    def test_no_recent_facts_returns_empty_frame(self):
+        response = {'entityName': 'Old Co', 'cik': 1, 'facts': {'us-gaap': {
+            'Assets': {'units': {'USD': [{'end': '1999-12-31', 'val': 1}]}}}}}
+
+        self.assertTrue(self.client._parse_response(response, 'company_facts').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+from types import SimpleNamespace
+
+from app.services.functions import (SnowflakeConnectionPool,
+                                    SnowflakeDataManager)
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = [('ONE',)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query):
+        if self.connection.broken:
+            raise ConnectionError('connection reset')
+        self.connection.queries.append(query)
+
+    def fetchall(self):
+        return [(1,)]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries = []
+        self.closed = False
+        self.broken = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def commit(self):
+        pass
+
+
+class FakeConnector:
+    def __init__(self):
+        self.connections = []
+        self.fail = False
+
+    def connect(self, **settings):
+        if self.fail:
+            raise ConnectionError('login failed')
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+
+def make_config():
+    return SimpleNamespace(user='user', password='password', account='account', warehouse='warehouse',
+                           database='database', schema='schema', port='443', role='role')
+
+
+class TestSnowflakeConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.connector = FakeConnector()
+        self.pool = SnowflakeConnectionPool(make_config(), max_size=2, max_idle_seconds=300,
+                                            health_check_after=60, timeout=0, connector=self.connector)
+        self.pool._clock = lambda: self.now
+
+    def test_connections_are_opened_lazily_and_reused(self):
+        self.assertEqual(self.connector.connections, [])
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.connector.connections), 1)
+
+    def test_closed_and_broken_connections_are_replaced(self):
+        with self.pool.connection() as closed:
+            closed.close()
+        with self.pool.connection() as broken:
+            broken.broken = True
+        self.now = 61
+        with self.pool.connection() as healthy:
+            pass
+
+        self.assertEqual(len(self.connector.connections), 3)
+        self.assertTrue(broken.closed)
+        self.assertNotIn(healthy, (closed, broken))
+
+    def test_idle_connections_are_pinged_then_evicted(self):
+        with self.pool.connection() as connection:
+            pass
+        self.now = 61
+        with self.pool.connection() as pinged:
+            pass
+        self.assertIs(pinged, connection)
+        self.assertEqual(connection.queries, ['SELECT 1'])
+
+        self.now += 301
+        with self.pool.connection() as fresh:
+            pass
+        self.assertTrue(connection.closed)
+        self.assertIsNot(fresh, connection)
+
+    def test_max_size(self):
+        first, second = self.pool.acquire(), self.pool.acquire()
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire()
+
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(), first)
+        self.pool.release(second)
+
+    def test_failed_login_frees_its_slot(self):
+        self.connector.fail = True
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                self.pool.acquire()
+
+        self.connector.fail = False
+        self.pool.acquire()
+        self.pool.acquire()
+
+
+class TestSnowflakeDataManager(unittest.TestCase):
+    def setUp(self):
+        self.connector = FakeConnector()
+        SnowflakeConnectionPool.shared(make_config(), connector=self.connector)
+
+    def tearDown(self):
+        SnowflakeConnectionPool.close_shared()
+
+    def test_managers_share_the_process_pool(self):
+        managers = [SnowflakeDataManager(make_config()) for _ in range(3)]
+        self.assertEqual(self.connector.connections, [])
+
+        for manager in managers:
+            result = manager.get_data('SELECT 1 AS ONE')
+            self.assertEqual(result['ONE'].tolist(), [1])
+
+        self.assertIs(managers[0].pool, managers[2].pool)
+        self.assertEqual(len(self.connector.connections), 1)
+        self.assertEqual(managers[0].pool.idle_count, 1)
+
+    def test_query_errors_return_the_connection(self):
+        manager = SnowflakeDataManager(make_config())
+        manager.connect_to_snowflake()
+        self.connector.connections[0].broken = True
+
+        self.assertTrue(manager.get_data('SELECT 1').empty)
+        self.assertEqual(manager.pool.idle_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
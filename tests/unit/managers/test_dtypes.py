@@ -0,0 +1,43 @@
+import unittest
+
+import pandas as pd
+
+from app.services.functions import SECAPIClient
+from app.services.utils import FACT_DTYPES, QUARTER_DTYPE, apply_fact_dtypes
+
+
+class TestFactDtypes(unittest.TestCase):
+    def test_parsed_company_facts_follow_the_policy(self):
+        payload = {'cik': 1234, 'entityName': 'TEST CO', 'facts': {'us-gaap': {'Assets': {'units': {'USD': [
+            {'end': '2099-12-31', 'val': 5, 'accn': 'a', 'fy': 2099, 'fp': 'FY', 'form': '10-K',
+             'filed': '2100-02-01', 'frame': 'CY2099'},
+            {'start': '2099-01-01', 'end': '2099-03-31', 'val': 7, 'accn': 'b', 'fp': 'Q1', 'form': '10-Q',
+             'filed': '2099-05-01'},
+        ]}}}}}
+        frame = SECAPIClient()._parse_response(payload, 'company_facts')
+
+        for column in ('EntityName', 'Metric', 'form', 'fp', 'frame'):
+            self.assertIsInstance(frame[column].dtype, pd.CategoricalDtype)
+        self.assertEqual(frame['CIK'].dtype, 'int32')
+        self.assertEqual(frame['val'].dtype, 'float64')
+        self.assertEqual(frame['fy'].dtype, 'Int32')
+        self.assertTrue(pd.isna(frame['fy'].iloc[1]))
+        for column in ('start', 'end', 'filed'):
+            self.assertTrue(pd.api.types.is_datetime64_dtype(frame[column]))
+
+    def test_apply_is_idempotent(self):
+        df = apply_fact_dtypes(pd.DataFrame({'Metric': ['Assets'], 'year': ['2020'], 'end': ['2020-12-31']}))
+        again = apply_fact_dtypes(df.copy())
+
+        pd.testing.assert_frame_equal(again, df)
+        self.assertEqual(df['year'].dtype, FACT_DTYPES['year'])
+
+    def test_legacy_numbered_quarters(self):
+        df = apply_fact_dtypes(pd.DataFrame({'quarter': [5, 1, 4]}))
+
+        self.assertEqual(df['quarter'].dtype, QUARTER_DTYPE)
+        self.assertEqual(df['quarter'].tolist(), ['FY', 'Q1', 'Q4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
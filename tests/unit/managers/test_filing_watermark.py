@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.services import refresh_ciks
+from app.services.service_manager import DataPipelineIntegration
+from app.services.functions import SECAPIClient
+from app.services.utils import FilingWatermark
+
+SUBMISSIONS = pd.DataFrame({
+    'accessionNumber': ['0000320193-24-000010', '0000320193-24-000009', '0000320193-23-000106'],
+    'filingDate': ['2024-02-02', '2024-02-01', '2023-11-03'],
+    'form': ['8-K', '10-Q', '10-K'],
+})
+
+
+class TestFilingWatermark(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.watermark = FilingWatermark(self.data_dir.name)
+
+    def tearDown(self):
+        self.data_dir.cleanup()
+
+    def test_latest_filing_ignores_non_financial_forms(self):
+        self.assertEqual(FilingWatermark.latest_filing(SUBMISSIONS), {
+            'accessionNumber': '0000320193-24-000009',
+            'filingDate': '2024-02-01',
+            'form': '10-Q'
+        })
+        self.assertIsNone(FilingWatermark.latest_filing(SUBMISSIONS[SUBMISSIONS['form'] == '8-K']))
+
+    def test_store_and_compare(self):
+        filing = FilingWatermark.latest_filing(SUBMISSIONS)
+        self.assertIsNone(self.watermark.get('0000320193'))
+        self.assertFalse(self.watermark.is_current('0000320193', filing))
+
+        self.watermark.set('0000320193', filing)
+
+        self.assertTrue(FilingWatermark(self.data_dir.name).is_current('0000320193', filing))
+        self.assertFalse(self.watermark.is_current('0000320193', dict(filing, accessionNumber='x')))
+
+
+class TestRefreshCiks(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.data_dir.cleanup()
+
+    @patch.object(DataPipelineIntegration, 'transform_and_store_json')
+    @patch.object(DataPipelineIntegration, 'process_and_store_data')
+    @patch.object(DataPipelineIntegration, 'preprocess_data')
+    @patch.object(DataPipelineIntegration, 'fetch_data', return_value=pd.DataFrame({'val': [1]}))
+    @patch.object(SECAPIClient, 'fetch_submissions', return_value=SUBMISSIONS)
+    def test_only_companies_with_new_filings_are_refreshed(self, mock_submissions, mock_fetch,
+                                                           mock_preprocess, mock_process, mock_transform):
+        self.assertEqual(refresh_ciks(['0000320193'], local_storage_dir=self.data_dir.name),
+                         {'0000320193': 'updated'})
+        self.assertEqual(refresh_ciks(['0000320193'], local_storage_dir=self.data_dir.name),
+                         {'0000320193': 'unchanged'})
+        self.assertEqual(refresh_ciks(['0000320193'], force=True, local_storage_dir=self.data_dir.name),
+                         {'0000320193': 'updated'})
+
+        self.assertEqual(mock_submissions.call_count, 3)
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(mock_transform.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
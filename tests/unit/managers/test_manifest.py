@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.services.functions import DataStorageManager
+from app.services.types import QueryFolderMapping
+from app.services.utils import DataManifest
+
+
+class TestDataManifest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.manifest = DataManifest(self.data_dir.name)
+        self.cik = '0000001234'
+
+    def tearDown(self):
+        self.data_dir.cleanup()
+
+    def _touch(self, relative_path):
+        path = os.path.join(self.data_dir.name, self.cik, *relative_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+        return path
+
+    def test_record_and_latest(self):
+        path = self._touch('processed_json/Cash_Flow/bar_chart/b.json')
+        self.manifest.record(self.cik, 'processed_json', 'Cash Flow', 'b.json', 'bar_chart')
+
+        self.assertEqual(self.manifest.latest(self.cik, 'processed_json', 'Cash_Flow', 'bar_chart'), path)
+        self.assertIsNone(self.manifest.latest(self.cik, 'processed_json', 'Cash_Flow', 'line_chart'))
+        self.assertIsNone(self.manifest.latest('0000009999', 'processed_json', 'Cash_Flow', 'bar_chart'))
+
+    def test_newer_record_replaces_older_and_is_seen_by_other_instances(self):
+        self._touch('processed_data/Liquidity/a.parquet')
+        newer = self._touch('processed_data/Liquidity/b.parquet')
+        reader = DataManifest(self.data_dir.name)
+        self.manifest.record(self.cik, 'processed_data', 'Liquidity', 'a.parquet')
+        reader.latest(self.cik, 'processed_data', 'Liquidity')
+
+        self.manifest.record(self.cik, 'processed_data', 'Liquidity', 'b.parquet')
+        self.manifest.record(self.cik, 'processed_json', 'Liquidity', 'c.json', 'data_grid')
+
+        self.assertEqual(reader.latest(self.cik, 'processed_data', 'Liquidity'), newer)
+        self.assertEqual(set(reader.entries(self.cik)), {'processed_data/Liquidity', 'processed_json/Liquidity/data_grid'})
+
+    def test_missing_file_is_not_returned(self):
+        self.manifest.record(self.cik, 'processed_data', 'Liquidity', 'gone.parquet')
+        self.assertIsNone(self.manifest.latest(self.cik, 'processed_data', 'Liquidity'))
+
+    @patch.object(QueryFolderMapping, 'get_folder_name', return_value='Cash_Flow')
+    def test_storage_manager_resolves_latest_through_manifest(self, mock_folder_name):
+        manager = DataStorageManager(self.data_dir.name, self.cik)
+        file_name = manager.store_data(pd.DataFrame({'val': [1.0]}), 'processed_data', 'Cash Flow')
+        # An older-looking stray file must not win over the recorded one
+        stray = self._touch('processed_data/Cash_Flow/stray.parquet')
+        os.utime(stray, (4102444800, 4102444800))
+
+        self.assertEqual(os.path.basename(manager.get_latest_file_path('Cash Flow', 'processed_data')), file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from app.services.utils import SharedTokenBucket, TokenBucket, get_shared_rate_limiter
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_reservations_beyond_capacity_are_spaced_at_rate(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, places=2)
+        self.assertAlmostEqual(waits[3], 0.2, places=2)
+
+
+class TestSharedTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.state_dir.name, 'rate_limit')
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    def test_instances_share_one_budget(self):
+        first = SharedTokenBucket(rate=10, capacity=2, state_path=self.state_path)
+        second = SharedTokenBucket(rate=10, capacity=2, state_path=self.state_path)
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.0)
+        self.assertAlmostEqual(first.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(second.reserve(), 0.2, places=2)
+
+    def test_async_reservation_runs_off_the_event_loop(self):
+        bucket = SharedTokenBucket(rate=10, capacity=2, state_path=self.state_path)
+        threads = []
+        reserve = bucket.reserve
+        bucket.reserve = lambda tokens: threads.append(threading.current_thread()) or reserve(tokens)
+
+        asyncio.run(bucket.acquire_async())
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_get_shared_rate_limiter_returns_singleton(self):
+        self.assertIs(get_shared_rate_limiter(self.state_path),
+                      get_shared_rate_limiter(self.state_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
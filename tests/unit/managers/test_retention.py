@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+import unittest
+
+from app.services.utils import DataManifest
+from app.services.utils.retention import (ArtifactCompactor, RetentionPolicy,
+                                          main)
+
+
+class TestRetentionPolicy(unittest.TestCase):
+    def test_keep_last_or_max_age(self):
+        now = time.time()
+        timestamps = [now - days * 86400 for days in (0, 1, 2, 10, 20)]
+        self.assertEqual(RetentionPolicy(keep_last=2).expired(timestamps, now),
+                         [False, False, True, True, True])
+        self.assertEqual(RetentionPolicy(keep_last=2, max_age_days=5).expired(timestamps, now),
+                         [False, False, False, True, True])
+        self.assertEqual(RetentionPolicy(keep_last=None, max_age_days=0).expired(timestamps, now),
+                         [False, True, True, True, True])
+        with self.assertRaises(ValueError):
+            RetentionPolicy(keep_last=0)
+
+
+class TestArtifactCompactor(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.cik = '0000001234'
+        self.dataset_dir = os.path.join(self.data_dir.name, self.cik, 'processed_data', 'Cash_Flow')
+        os.makedirs(self.dataset_dir)
+        self.file_names = [f'{self.cik}_Cash_Flow_2024010{day}120000.parquet' for day in range(1, 6)]
+        for file_name in self.file_names:
+            with open(os.path.join(self.dataset_dir, file_name), 'wb') as file:
+                file.write(b'data')
+
+    def tearDown(self):
+        self.data_dir.cleanup()
+
+    def _remaining(self):
+        return sorted(os.listdir(self.dataset_dir))
+
+    def test_prunes_old_versions_but_keeps_current_file(self):
+        manifest = DataManifest(self.data_dir.name)
+        # The manifest points at an older version, e.g. after a newer run failed midway
+        manifest.record(self.cik, 'processed_data', 'Cash Flow', self.file_names[1])
+        manifest.record(self.cik, 'processed_json', 'Cash Flow', 'deleted.json', 'bar_chart')
+
+        summary = ArtifactCompactor(self.data_dir.name, RetentionPolicy(keep_last=2)).compact()
+
+        self.assertEqual(self._remaining(), [self.file_names[1], self.file_names[3], self.file_names[4]])
+        self.assertEqual(len(summary['removed']), 2)
+        self.assertEqual(summary['freed_bytes'], 8)
+        self.assertEqual(list(manifest.entries(self.cik)), ['processed_data/Cash_Flow'])
+
+    def test_dry_run_removes_nothing(self):
+        main(['--base-dir', self.data_dir.name, '--keep-last', '1', '--dry-run'])
+        self.assertEqual(self._remaining(), self.file_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
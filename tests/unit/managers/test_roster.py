@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.utils import Roster, TokenBucket
+
+
+class TestRoster(unittest.TestCase):
+    def setUp(self):
+        self.roster = Roster(rate_limiter=TokenBucket(rate=1000), status_ttl=60)
+
+    @patch('app.services.utils.roster.requests')
+    def test_recruit_cik_does_not_probe_endpoints(self, mock_requests):
+        self.roster.recruit_cik('0000320193')
+        self.roster.recruit_cik('0000789019')
+        mock_requests.get.assert_not_called()
+        mock_requests.head.assert_not_called()
+        self.assertTrue(self.roster.api_endpoints['company_facts'].endswith('CIK0000789019.json'))
+
+    @patch('app.services.utils.roster.requests')
+    def test_check_api_status_uses_cached_head_probes(self, mock_requests):
+        mock_requests.head.return_value = MagicMock(status_code=200)
+        self.roster.recruit_cik('0000012927', check_status=True)
+        self.assertEqual(mock_requests.head.call_count, 3)
+        self.assertEqual(set(self.roster.get_api_status().values()), {'OK'})
+
+        Roster(rate_limiter=TokenBucket(rate=1000)).recruit_cik('0000012927').check_api_status()
+        self.assertEqual(mock_requests.head.call_count, 3)
+        mock_requests.get.assert_not_called()
+
+        self.roster.check_api_status(force=True)
+        self.assertEqual(mock_requests.head.call_count, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.services.queries.base_tables import LIQUIDITY
+from app.services.queries.base_tables.query_base import FinancialQueryBase
+from app.services.types import UNITS_ATTR, Units
+from app.services.utils import apply_fact_dtypes
+
+INDEX_COLS = ['EntityName', 'CIK', 'end', 'year', 'quarter']
+
+
+def pivot_table_reference(df, index_cols, metrics):
+    pivot_df = df.pivot_table(index=index_cols, columns='Metric', values='val', fill_value=np.nan,
+                              observed=True).reset_index()
+    pivot_df.columns.name = None
+    for metric in metrics:
+        if metric not in pivot_df:
+            pivot_df[metric] = np.nan
+    return pivot_df
+
+
+def make_facts(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    years = rng.integers(2010, 2024, rows)
+    quarters = rng.integers(1, 5, rows)
+    return pd.DataFrame({
+        'EntityName': rng.choice(['B CO', 'A CO'], rows),
+        'CIK': 1234,
+        'end': pd.to_datetime([f'{year}-{3 * quarter:02d}-28' for year, quarter in zip(years, quarters)]),
+        'year': years,
+        'quarter': [f'Q{quarter}' for quarter in quarters],
+        'Metric': rng.choice(['Cash', 'AssetsCurrent', 'LiabilitiesCurrent'], rows),
+        'val': np.where(rng.random(rows) < 0.05, np.nan, rng.normal(1e9, 1e8, rows)),
+        'filed': pd.to_datetime('2024-01-01') - pd.to_timedelta(rng.integers(0, 900, rows), unit='D'),
+    })
+
+
+class TestPivotDataframe(unittest.TestCase):
+    def setUp(self):
+        self.query = FinancialQueryBase(['AssetsCurrent', 'LiabilitiesCurrent', 'Cash', 'Goodwill'])
+
+    def test_matches_pivot_table(self):
+        for df in (make_facts(), apply_fact_dtypes(make_facts(seed=1))):
+            expected = pivot_table_reference(df, INDEX_COLS, self.query.metrics)
+            pd.testing.assert_frame_equal(self.query.pivot_dataframe(df, INDEX_COLS), expected)
+
+    def test_missing_keys_and_empty_input_match_pivot_table(self):
+        df = make_facts(200)
+        df.loc[::7, 'quarter'] = None
+        pd.testing.assert_frame_equal(self.query.pivot_dataframe(df, INDEX_COLS),
+                                      pivot_table_reference(df, INDEX_COLS, self.query.metrics))
+        empty = df.iloc[:0]
+        pd.testing.assert_frame_equal(self.query.pivot_dataframe(empty, INDEX_COLS),
+                                      pivot_table_reference(empty, INDEX_COLS, self.query.metrics))
+
+    def test_dedupe_rules(self):
+        df = pd.DataFrame({
+            'year': [2020, 2020, 2020],
+            'Metric': ['Cash'] * 3,
+            'val': [1.0, 5.0, 3.0],
+            'filed': pd.to_datetime(['2021-01-01', '2020-06-01', '2022-01-01'])[[0, 2, 1]],
+        })
+        cash = {rule: self.query.pivot_dataframe(df, ['year'], dedupe=rule)['Cash'].iloc[0]
+                for rule in ('mean', 'first', 'last', 'latest_filed')}
+        self.assertEqual(cash, {'mean': 3.0, 'first': 1.0, 'last': 3.0, 'latest_filed': 5.0})
+
+    def test_latest_filed_needs_filed_column(self):
+        with self.assertRaises(ValueError):
+            self.query.pivot_dataframe(make_facts(10).drop(columns=['filed']), INDEX_COLS, dedupe='latest_filed')
+        with self.assertRaises(ValueError):
+            FinancialQueryBase([], dedupe='median')
+
+
+class TestUnits(unittest.TestCase):
+    def test_scaling_matches_per_element_division(self):
+        query = FinancialQueryBase(['AssetsCurrent', 'LiabilitiesCurrent', 'Cash', 'Goodwill'])
+        df = query.pivot_dataframe(make_facts(), INDEX_COLS)
+        expected = df.copy()
+        for metric in query.metrics:
+            expected[metric] = expected[metric].apply(lambda x: x / 1e6 if pd.notnull(x) else np.nan)
+
+        result = query.scale_financial_columns(df)
+
+        pd.testing.assert_frame_equal(result, expected, check_flags=False)
+        self.assertEqual(result.attrs[UNITS_ATTR], dict.fromkeys(query.metrics, 'USD millions'))
+
+    def test_run_query_records_units_under_final_names(self):
+        df = make_facts().query("Metric != 'Cash'")
+        result = LIQUIDITY().run_query(df, INDEX_COLS, rename_map={'CurrentRatio': 'CURRENT_RATIO',
+                                                                   'AssetsCurrent': 'ASSETS_CURRENT'})
+
+        self.assertEqual(Units.of(result, 'CURRENT_RATIO'), Units.RATIO)
+        self.assertEqual(Units.of(result, 'ASSETS_CURRENT'), Units.USD_MILLIONS)
+        self.assertEqual(Units.of(result, 'LiabilitiesCurrent'), Units.USD_MILLIONS)
+        self.assertIsNone(Units.of(result, 'CIK'))
+
+    def test_format(self):
+        self.assertEqual(Units.USD_MILLIONS.format(12.5), '12.5 mil $')
+        self.assertEqual(Units.PERCENT.format(3), '3%')
+        self.assertEqual(Units.RATIO.format(1.5), '1.5')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import glob
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from app.services import generate_data_for_universe
+from app.services.functions.data.processing.preprocessor import \
+    DataPreprocessor
+from app.services.queries import QueryExecutor
+from app.services.service_manager import (DataPipelineIntegration,
+                                          SECDataFetcher)
+from app.services.utils import apply_fact_dtypes
+
+CATEGORY_METRIC_MAP = {
+    'Liquidity': ['AssetsCurrent', 'LiabilitiesCurrent'],
+    'Cash Flow': ['NetCashProvidedByUsedInOperatingActivities'],
+}
+
+
+def make_raw_data(cik, entity_name, scale):
+    rows = []
+    for metric in ['AssetsCurrent', 'LiabilitiesCurrent', 'NetCashProvidedByUsedInOperatingActivities']:
+        for year in (2022, 2021):
+            for quarter in (1, 2):
+                rows.append({'Metric': metric, 'CIK': cik, 'EntityName': entity_name,
+                             'end': f'{year}-{3 * quarter:02d}-30', 'val': scale * (year + quarter + len(metric)),
+                             'accn': 'a', 'fy': year, 'fp': f'Q{quarter}', 'form': '10-Q',
+                             'filed': f'{year}-{3 * quarter + 1:02d}-15', 'frame': f'CY{year}Q{quarter}I'})
+            rows.append({'Metric': metric, 'CIK': cik, 'EntityName': entity_name, 'end': f'{year}-12-31',
+                         'val': scale * year, 'accn': 'a', 'fy': year, 'fp': 'FY', 'form': '10-K',
+                         'filed': f'{year + 1}-02-01', 'frame': f'CY{year}'})
+    return apply_fact_dtypes(pd.DataFrame(rows))
+
+
+class TestExecuteQueryBatch(unittest.TestCase):
+    def setUp(self):
+        preprocessor = DataPreprocessor(MagicMock(), MagicMock(), MagicMock())
+        # The second company sorts first by name, ahead of the first one in the batched result
+        self.frames_by_cik = {
+            '0000001234': preprocessor.preprocess_data(make_raw_data(1234, 'ZETA CO', 1e6),
+                                                       CATEGORY_METRIC_MAP, False, '0000001234'),
+            '0000005678': preprocessor.preprocess_data(make_raw_data(5678, 'ALPHA CO', 3e6),
+                                                       CATEGORY_METRIC_MAP, False, '0000005678'),
+        }
+        self.executor = QueryExecutor(None, None)
+
+    def test_matches_querying_each_company(self):
+        results = self.executor.execute_query_batch(list(CATEGORY_METRIC_MAP), self.frames_by_cik)
+
+        for cik_number, frames in self.frames_by_cik.items():
+            expected = self.executor.execute_query(list(CATEGORY_METRIC_MAP), False, frames=frames)
+            self.assertEqual(set(results[cik_number]), set(CATEGORY_METRIC_MAP))
+            for query_name, result in results[cik_number].items():
+                pd.testing.assert_frame_equal(result, expected[query_name])
+                self.assertEqual(result.attrs, expected[query_name].attrs)
+                self.assertEqual(result['CIK'].unique().tolist(), [int(cik_number)])
+
+    def test_companies_without_a_frame_get_no_result(self):
+        del self.frames_by_cik['0000005678']['Cash Flow']
+
+        results = self.executor.execute_query_batch('Cash Flow', self.frames_by_cik)
+
+        self.assertIn('Cash Flow', results['0000001234'])
+        self.assertEqual(results['0000005678'], {})
+
+
+class TestGenerateDataForUniverse(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.universe_data = {
+            '0000001234': make_raw_data(1234, 'ZETA CO', 1e6),
+            '0000005678': make_raw_data(5678, 'ALPHA CO', 3e6),
+        }
+        fetch_patcher = patch.object(SECDataFetcher, 'fetch_company_data_many',
+                                     side_effect=lambda cik_numbers, metrics: self.universe_data)
+        fetch_patcher.start()
+        self.addCleanup(fetch_patcher.stop)
+
+    def tearDown(self):
+        self.data_dir.cleanup()
+
+    def stored_files(self, cik_number, data_type):
+        return glob.glob(os.path.join(self.data_dir.name, cik_number, data_type, '**', '*.*'),
+                         recursive=True)
+
+    def test_fetch_errors_only_fail_their_company(self):
+        self.universe_data['0000005678'] = {'error': 'HTTP 404'}
+
+        results = generate_data_for_universe(list(self.universe_data), local_storage_dir=self.data_dir.name)
+
+        self.assertEqual(results, {'0000001234': True, '0000005678': {'error': 'HTTP 404'}})
+        for data_type in ('preprocessed_data', 'processed_data', 'processed_json'):
+            self.assertTrue(self.stored_files('0000001234', data_type))
+        self.assertFalse(os.path.exists(os.path.join(self.data_dir.name, '0000005678')))
+
+    def test_preprocessing_errors_only_fail_their_company(self):
+        preprocess_data = DataPipelineIntegration.preprocess_data
+
+        def fail_alpha(data_pipeline, raw_data):
+            if data_pipeline.cik_number == '0000005678':
+                return {'error': 'Error preprocessing data: no facts'}
+            return preprocess_data(data_pipeline, raw_data)
+
+        with patch.object(DataPipelineIntegration, 'preprocess_data', autospec=True, side_effect=fail_alpha):
+            results = generate_data_for_universe(list(self.universe_data), local_storage_dir=self.data_dir.name)
+
+        self.assertEqual(results, {'0000001234': True,
+                                   '0000005678': {'error': 'Error preprocessing data: no facts'}})
+
+    def test_batch_errors_fail_every_company_after_its_writes(self):
+        with patch.object(QueryExecutor, 'execute_query_batch', side_effect=RuntimeError('out of memory')):
+            results = generate_data_for_universe(list(self.universe_data), local_storage_dir=self.data_dir.name)
+
+        self.assertEqual(results, dict.fromkeys(self.universe_data, {'error': 'out of memory'}))
+        for cik_number in self.universe_data:
+            self.assertTrue(self.stored_files(cik_number, 'preprocessed_data'))
+            self.assertFalse(self.stored_files(cik_number, 'processed_json'))
+
+    def test_storage_errors_only_fail_their_company(self):
+        store_query_results = DataPipelineIntegration.store_query_results
+
+        def fail_alpha(data_pipeline, query_results):
+            if data_pipeline.cik_number == '0000005678':
+                return {'error': 'Error storing data: disk full'}
+            return store_query_results(data_pipeline, query_results)
+
+        with patch.object(DataPipelineIntegration, 'store_query_results', autospec=True, side_effect=fail_alpha):
+            results = generate_data_for_universe(list(self.universe_data), local_storage_dir=self.data_dir.name)
+
+        self.assertEqual(results, {'0000001234': True, '0000005678': {'error': 'Error storing data: disk full'}})
+        self.assertTrue(self.stored_files('0000001234', 'processed_json'))
+        self.assertFalse(self.stored_files('0000005678', 'processed_json'))
+
+    def test_sql_engine_stores_the_same_processed_data(self):
+        processed_data = {}
+        for local_engine in ('pandas', 'sql'):
+            with tempfile.TemporaryDirectory() as data_dir:
+                results = generate_data_for_universe(list(self.universe_data), local_storage_dir=data_dir,
+                                                     local_engine=local_engine)
+                self.assertEqual(results, dict.fromkeys(self.universe_data, True))
+                processed_data[local_engine] = {
+                    os.path.relpath(path, data_dir).rsplit('_', 1)[0]: pd.read_parquet(path)
+                    for path in glob.glob(os.path.join(data_dir, '*', 'processed_data', '*', '*.parquet'))
+                }
+
+        # Both companies, with the four categories of the pipeline
+        self.assertEqual(len(processed_data['sql']), 8)
+        self.assertEqual(set(processed_data['sql']), set(processed_data['pandas']))
+        for name, df in processed_data['sql'].items():
+            pd.testing.assert_frame_equal(df, processed_data['pandas'][name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.services.queries import QueryExecutor
+from app.services.queries.query_manager import LOCAL_QUERY_CLASSES
+from app.services.queries.sql_engine import (LocalSQLEngine,
+                                             translate_snowflake_sql)
+from app.services.utils import apply_fact_dtypes
+
+METRICS = ['AssetsCurrent', 'LiabilitiesCurrent', 'StockholdersEquity', 'NetIncomeLoss', 'OperatingIncomeLoss',
+           'RevenueFromContractWithCustomerExcludingAssessedTax']
+
+
+def make_preprocessed(metrics=METRICS, quarters=('Q1', 'Q2', 'Q3')):
+    rng = np.random.default_rng(0)
+    rows = []
+    for year in (2021, 2022):
+        for number, quarter in enumerate(quarters, start=1):
+            for metric in metrics:
+                rows.append({'EntityName': 'TEST CO', 'CIK': 1234, 'Metric': metric,
+                             'end': f'{year}-{3 * number:02d}-30', 'val': float(rng.integers(1, 9e9)),
+                             'year': year, 'quarter': quarter})
+    return apply_fact_dtypes(pd.DataFrame(rows))
+
+
+class TestSnowflakeShim(unittest.TestCase):
+    def test_translate(self):
+        query = "SELECT CAST(end AS DATE), EXTRACT(MONTH FROM End), extract(year from End) FROM t"
+
+        self.assertEqual(translate_snowflake_sql(query),
+                         "SELECT DATE(end), CAST(STRFTIME('%m', End) AS INTEGER), "
+                         "CAST(STRFTIME('%Y', End) AS INTEGER) FROM t")
+
+    def test_functions(self):
+        engine = LocalSQLEngine()
+        result = engine.get_data("SELECT CONCAT('Q1-', 2021) AS a, CONCAT('x', NULL) AS b, DIV0(1, 0) AS c, "
+                                 "IFF(1 > 0, 'yes', 'no') AS d, NVL(NULL, 5) AS e")
+        engine.close_connection()
+
+        self.assertEqual(result.iloc[0].tolist()[0], 'Q1-2021')
+        self.assertIsNone(result.iloc[0]['b'])
+        self.assertEqual(result.iloc[0].tolist()[2:], [0, 'yes', 5])
+
+
+class TestLocalSQLQueries(unittest.TestCase):
+    def setUp(self):
+        self.pandas_executor = QueryExecutor(None, None)
+        self.sql_executor = QueryExecutor(None, None, local_engine='sql')
+
+    def assert_same_result(self, query_name, df=None):
+        # Like the preprocessed data of a category, which only has the metrics of its query
+        if df is None:
+            df = make_preprocessed(LOCAL_QUERY_CLASSES[query_name]().metrics)
+        frames = {query_name: df}
+        pandas_result = self.pandas_executor.execute_query(query_name, False, frames=frames)[query_name]
+        sql_result = self.sql_executor.execute_query(query_name, False, frames=frames)[query_name]
+
+        pd.testing.assert_frame_equal(sql_result, pandas_result)
+        self.assertEqual(sql_result.attrs, pandas_result.attrs)
+
+    def test_liquidity_matches_pandas_query(self):
+        self.assert_same_result('Liquidity')
+
+    def test_assets_liabilities_matches_pandas_query(self):
+        self.assert_same_result('Assets Liabilities')
+
+    def test_profitability_reads_the_fetched_revenue_metric(self):
+        self.assert_same_result('Profitability')
+
+    def test_cash_flow_matches_pandas_query(self):
+        self.assert_same_result('Cash Flow', make_preprocessed(
+            ['NetCashProvidedByUsedInOperatingActivities', 'NetCashProvidedByUsedInFinancingActivities'],
+            quarters=('FY',)))
+
+    def test_duplicate_facts_are_averaged(self):
+        df = make_preprocessed(['AssetsCurrent', 'LiabilitiesCurrent'])
+        self.assert_same_result('Liquidity', apply_fact_dtypes(
+            pd.concat([df, df.assign(val=df['val'] * 3)], ignore_index=True)))
+
+    def test_missing_frame_is_rebuilt_for_full_years(self):
+        df = make_preprocessed(['NetCashProvidedByUsedInOperatingActivities'], quarters=('FY',))
+        engine = LocalSQLEngine()
+        engine.upload_data(df)
+        frames = engine.get_data('SELECT DISTINCT frame FROM TEST_TABLE ORDER BY frame')['frame'].tolist()
+        engine.close_connection()
+
+        self.assertEqual(frames, ['CY2021', 'CY2022'])
+
+
+if __name__ == '__main__':
+    unittest.main()